@@ -0,0 +1,140 @@
+"""
+比較語音辨識引擎：openai-whisper（fp32）與 faster-whisper（CTranslate2 int8）在 CPU 上的
+real-time factor（辨識時間 / 音訊長度）、記憶體與 dataset/train_split_audio 的辨識正確率。
+
+    PYTHONPATH=src python benchmarks/asr_backends.py
+    PYTHONPATH=src python benchmarks/asr_backends.py --compute-type int8_float32 --verbose
+
+每個引擎在獨立的子行程中執行，記憶體為載入模型與辨識期間常駐記憶體（RSS）高峰的增加量。
+每個片段與串流辨識一樣經過降噪後以 `_transcribe_text()` 辨識（先辨識一次預熱，不計時）。
+正確率以 transcripts.csv 中對應的句子（去掉說話者）計算：
+MER 將中文、日文以字、其他語言以詞為單位計算錯誤率，CER 以去掉空白與標點的字元計算。
+目前還沒有在本專案的錄音上執行過的結果，ASR_BACKEND="faster_whisper" 因此仍標示為實驗性。
+"""
+
+import argparse
+import csv
+import json
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+
+import Levenshtein
+
+from whisper_batching import DATASET_DIR, clip_index, load_clips
+
+TRANSCRIPTS = DATASET_DIR.parent / "transcripts.csv"
+CJK = r"\u3040-\u30ff\u3400-\u9fff"  # 平假名、片假名與漢字
+
+
+def load_references() -> dict:
+    """:return: {片段編號: 句子}，transcripts.csv 的第 n 句對應 `n_說話者_開始_結束.wav`"""
+    with open(TRANSCRIPTS, encoding="utf-8") as f:
+        rows = [row["Transcript"] for row in csv.DictReader(f)]
+    return {index: row.split(":", 1)[-1].strip() for index, row in enumerate(rows, start=1)}
+
+
+def tokens(text: str) -> list:
+    """中文、日文每個字一個 token，其他語言每個詞一個 token，忽略大小寫與標點"""
+    return re.findall(rf"[{CJK}]|[^\W_{CJK}]+", text.casefold())
+
+
+def error_rate(references: list, hypotheses: list, split) -> float:
+    errors = sum(Levenshtein.distance(split(ref), split(hyp)) for ref, hyp in zip(references, hypotheses))
+    return errors / max(sum(len(split(ref)) for ref in references), 1)
+
+
+def characters(text: str) -> str:
+    return "".join(tokens(text))
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux 以 KB 表示
+
+
+def create_recognizer(args):
+    if args.backend == "whisper":
+        from realtime_translate_system.services.speech.whisper import WhisperSpeechRecognizer
+
+        return WhisperSpeechRecognizer(model_size=args.whisper_model)
+    from realtime_translate_system.services.speech.faster_whisper import FasterWhisperSpeechRecognizer
+
+    return FasterWhisperSpeechRecognizer(
+        model_size=args.faster_model,
+        compute_type=args.compute_type,
+        cpu_threads=args.cpu_threads,
+    )
+
+
+def run_backend(args) -> dict:
+    """子行程：載入一個引擎並辨識所有片段"""
+    clips = load_clips()
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    recognizer = create_recognizer(args)
+    load_seconds = time.perf_counter() - start
+
+    recognizer._transcribe_text(clips[0][1])  # 預熱
+    hypotheses, elapsed, audio_seconds = {}, 0.0, 0.0
+    for path, audio in clips:
+        start = time.perf_counter()
+        hypotheses[clip_index(path)] = recognizer._transcribe_text(audio)
+        elapsed += time.perf_counter() - start
+        audio_seconds += len(audio) / recognizer.frame_rate
+    return {
+        "load_s": load_seconds,
+        "rtf": elapsed / audio_seconds,
+        "memory_mb": peak_rss_mb() - baseline,
+        "hypotheses": hypotheses,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=["whisper", "faster_whisper"], help="只執行一個引擎（子行程使用）")
+    parser.add_argument("--whisper-model", default="turbo")
+    parser.add_argument("--faster-model", default="large-v3-turbo")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--cpu-threads", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="列出每個片段的辨識結果")
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args), ensure_ascii=False))
+        return
+
+    references = load_references()
+    results = {}
+    for backend in ("whisper", "faster_whisper"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--backend", backend, *sys.argv[1:]],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results[backend] = json.loads(output.strip().splitlines()[-1])
+
+    print(f"CPU {os.cpu_count()} 核，{len(results['whisper']['hypotheses'])} 個片段")
+    print(f"\n{'':<16}{'載入 s':>8}{'RTF':>8}{'記憶體 MB':>11}{'MER':>8}{'CER':>8}")
+    for backend, result in results.items():
+        indexes = sorted(result["hypotheses"], key=int)
+        refs = [references[int(index)] for index in indexes]
+        hyps = [result["hypotheses"][index] for index in indexes]
+        name = backend if backend == "whisper" else f"{backend} {args.compute_type}"
+        print(
+            f"{name:<16}{result['load_s']:>8.1f}{result['rtf']:>8.3f}{result['memory_mb']:>11.0f}"
+            f"{error_rate(refs, hyps, tokens):>8.3f}{error_rate(refs, hyps, characters):>8.3f}"
+        )
+
+    if args.verbose:
+        for index in sorted(results["whisper"]["hypotheses"], key=int):
+            print(f"\n[{index}] {references[int(index)]}")
+            for backend, result in results.items():
+                print(f"  {backend:<15}{result['hypotheses'][index]}")
+
+
+if __name__ == "__main__":
+    main()
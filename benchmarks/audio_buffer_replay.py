@@ -0,0 +1,213 @@
+"""
+重播語音串流，比較 `transcribe_streaming` 原本以 `bytes +=` 累積音訊的寫法與 AudioRingBuffer：
+每段音訊的處理延遲、每段的暫時記憶體配置，以及多個連線同時重播時的總耗時。
+Whisper 與降噪以只讀取輸入的替代函式代替，只量測緩衝區本身；兩種寫法交給 Whisper 的音訊必須完全相同。
+
+    PYTHONPATH=src python benchmarks/audio_buffer_replay.py
+    PYTHONPATH=src python benchmarks/audio_buffer_replay.py --wav meeting.wav --sessions 16
+
+音訊以瀏覽器 AudioWorklet 的大小（1536 個樣本，96 ms）分段送入；沒有指定 --wav 時使用合成的語音與靜音交替的音訊。
+有安裝 webrtcvad 時使用與服務相同的 VAD，否則以音量判斷。
+"""
+
+import argparse
+import hashlib
+import statistics
+import threading
+import time
+import tracemalloc
+import wave
+
+import numpy as np
+
+from realtime_translate_system.services.speech.audio_buffer import AudioRingBuffer
+
+FRAME_RATE = 16000
+SAMPLE_WIDTH = 2
+FRAME_DURATION = 30  # ms
+CHUNK_SIZE = 5  # 秒
+WORKLET_SAMPLES = 128 * 12
+
+
+def make_vad():
+    try:
+        import webrtcvad
+    except ImportError:
+        return lambda frame: np.abs(np.frombuffer(frame, dtype=np.int16)).mean() > 500
+    vad = webrtcvad.Vad(3)
+    return lambda frame: vad.is_speech(frame, FRAME_RATE)
+
+
+def synthetic_audio(seconds: float, seed: int) -> bytes:
+    """1 秒低音量雜訊與 6 秒調變音交替，模擬有停頓的說話"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * FRAME_RATE)) / FRAME_RATE
+    voiced = (t % 7) >= 1
+    signal = np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+    audio = np.where(voiced, signal * 8000, 0) + rng.normal(0, 60, len(t))
+    return np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+
+
+def read_wav(path: str) -> bytes:
+    with wave.open(path, "rb") as f:
+        if (f.getframerate(), f.getsampwidth(), f.getnchannels()) != (FRAME_RATE, SAMPLE_WIDTH, 1):
+            raise ValueError("需要 16 kHz、16-bit、單聲道的 WAV")
+        return f.readframes(f.getnframes())
+
+
+def split_chunks(audio: bytes) -> list:
+    size = WORKLET_SAMPLES * SAMPLE_WIDTH
+    return [audio[i : i + size] for i in range(0, len(audio), size)]
+
+
+def legacy_stream(chunks, is_speech, recognize, on_chunk=None):
+    """原本 `transcribe_streaming` 的音訊累積方式（佇列結束時的處理與原程式相同）"""
+    tmp_audio = b""
+    for chunk in [*chunks, None]:
+        exit_flag = chunk is None
+        if chunk is not None:
+            tmp_audio += chunk
+        elif not tmp_audio:
+            break
+
+        frame_size = FRAME_RATE * SAMPLE_WIDTH * FRAME_DURATION // 1000
+        while len(tmp_audio) >= frame_size:
+            frame = tmp_audio[:frame_size]
+            tmp_audio = tmp_audio[frame_size:]
+            if is_speech(frame):
+                break
+
+        if len(tmp_audio) >= CHUNK_SIZE * FRAME_RATE * SAMPLE_WIDTH:
+            audio = np.frombuffer(tmp_audio, dtype=np.int16).astype(np.float32) / 32768.0
+            recognize(audio)
+            tmp_audio = b""
+        if on_chunk:
+            on_chunk()
+        if exit_flag:
+            break
+
+
+def ring_stream(chunks, is_speech, recognize, on_chunk=None):
+    """AudioRingBuffer 版本（固定 5 秒分段，VADEndpointer 之前的 `transcribe_streaming`）"""
+    chunk_samples = CHUNK_SIZE * FRAME_RATE
+    frame_samples = FRAME_RATE * FRAME_DURATION // 1000
+    tmp_audio = AudioRingBuffer(capacity=chunk_samples * 2)
+    for chunk in [*chunks, None]:
+        exit_flag = chunk is None
+        if chunk is not None:
+            tmp_audio.write(chunk)
+        elif not len(tmp_audio):
+            break
+
+        while len(tmp_audio) >= frame_samples:
+            frame = tmp_audio.peek(frame_samples)
+            tmp_audio.consume(frame_samples)
+            if is_speech(frame):
+                break
+
+        if len(tmp_audio) >= chunk_samples:
+            recognize(tmp_audio.to_float32())
+            tmp_audio.clear()
+        if on_chunk:
+            on_chunk()
+        if exit_flag:
+            break
+
+
+def fingerprints(stream, chunks, is_speech) -> list:
+    """交給 Whisper 的每段音訊的雜湊值"""
+    digests = []
+    stream(chunks, is_speech, lambda audio: digests.append(hashlib.blake2b(audio.tobytes()).hexdigest()))
+    return digests
+
+
+def measure_latency(stream, chunks, is_speech) -> list:
+    """每段音訊送入後到處理完成的時間（毫秒）"""
+    latencies = []
+    start = [time.perf_counter()]
+
+    def on_chunk():
+        now = time.perf_counter()
+        latencies.append((now - start[0]) * 1000)
+        start[0] = now
+
+    stream(chunks, is_speech, lambda audio: float(audio[-1]), on_chunk)
+    return latencies[:-1]  # 最後一次是佇列結束
+
+
+def measure_allocations(stream, chunks, is_speech) -> tuple:
+    """:return: (每段音訊暫時配置的記憶體位元組數, 整段重播的記憶體高峰)"""
+    transient = []
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+
+    def on_chunk():
+        current, peak = tracemalloc.get_traced_memory()
+        transient.append(peak - current)
+        tracemalloc.reset_peak()
+
+    stream(chunks, is_speech, lambda audio: float(audio[-1]), on_chunk)
+    overall_peak = max(transient) + tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return transient, overall_peak
+
+
+def measure_concurrent(stream, chunks, is_speech, sessions: int) -> float:
+    """多個連線同時重播（各自一個執行緒）的總耗時（秒）"""
+    threads = [
+        threading.Thread(target=stream, args=(chunks, is_speech, lambda audio: float(audio[-1])))
+        for _ in range(sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def percentile(values: list, quantile: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * quantile), len(values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--wav", help="16 kHz、16-bit、單聲道的錄音，預設使用合成音訊")
+    parser.add_argument("--seconds", type=float, default=120, help="合成音訊的長度（秒）")
+    parser.add_argument("--sessions", type=int, default=8, help="同時重播的連線數")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    audio = read_wav(args.wav) if args.wav else synthetic_audio(args.seconds, args.seed)
+    chunks = split_chunks(audio)
+    is_speech = make_vad()
+    print(f"{len(audio) / SAMPLE_WIDTH / FRAME_RATE:.1f} 秒音訊，{len(chunks)} 段")
+
+    legacy_digests = fingerprints(legacy_stream, chunks, is_speech)
+    ring_digests = fingerprints(ring_stream, chunks, is_speech)
+    identical = legacy_digests == ring_digests
+    print(f"交給 Whisper 的 {len(ring_digests)} 段音訊 {'完全相同' if identical else '不一致'}")
+
+    print(
+        f"\n{'':<10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+        f"{'alloc/段 KB':>14}{'alloc 總計 MB':>15}{'高峰 KB':>10}{f'{args.sessions} 連線 s':>12}"
+    )
+    for name, stream in (("bytes", legacy_stream), ("ring", ring_stream)):
+        measure_latency(stream, chunks, is_speech)  # 預熱
+        latencies = measure_latency(stream, chunks, is_speech)
+        transient, peak = measure_allocations(stream, chunks, is_speech)
+        elapsed = measure_concurrent(stream, chunks, is_speech, args.sessions)
+        print(
+            f"{name:<10}{statistics.median(latencies):>9.3f}{percentile(latencies, 0.99):>9.3f}"
+            f"{max(latencies):>9.3f}{statistics.mean(transient) / 1024:>14.1f}"
+            f"{sum(transient) / 1024 ** 2:>15.1f}{peak / 1024:>10.0f}{elapsed:>12.2f}"
+        )
+
+    if not identical:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+重播語音串流，比較固定 5 秒分段與 VADEndpointer 的語句切分：
+每句話說完到交給 Whisper 的延遲（以音訊時間計算，與辨識速度無關）、切在單字中間的次數，
+以及 Whisper 的呼叫次數與需要辨識的音訊長度。
+
+    PYTHONPATH=src python benchmarks/endpointer_replay.py
+    PYTHONPATH=src python benchmarks/endpointer_replay.py --hangover-ms 400 --sentences 200
+
+合成音訊由已知起訖的句子組成：句中的單字之間有 0.1~0.3 秒的短停頓，句子之間停頓 0.8~2.5 秒，
+少數句子超過 max_utterance_ms，用來檢查強制切開的位置。
+"""
+
+import argparse
+import statistics
+
+import numpy as np
+
+from audio_buffer_replay import FRAME_RATE, make_vad, ring_stream, split_chunks
+from realtime_translate_system.services.speech.endpointer import VADEndpointer
+
+
+def synthetic_meeting(sentences: int, seed: int) -> tuple:
+    """:return: (音訊, [(句子開始, 句子結束)], [(單字開始, 單字結束)])，時間以樣本數表示"""
+    rng = np.random.default_rng(seed)
+    parts, sentence_spans, word_spans = [], [], []
+    position = 0
+
+    def append(samples: np.ndarray):
+        nonlocal position
+        parts.append(samples)
+        position += len(samples)
+
+    def silence(seconds: float):
+        append(rng.normal(0, 60, int(seconds * FRAME_RATE)))
+
+    silence(1.0)
+    for _ in range(sentences):
+        length = rng.uniform(16, 22) if rng.random() < 0.05 else rng.uniform(0.6, 12)
+        start = position
+        while position - start < length * FRAME_RATE:
+            word = rng.uniform(0.2, 0.6)
+            t = np.arange(int(word * FRAME_RATE)) / FRAME_RATE
+            pitch = rng.uniform(120, 260)
+            envelope = np.sin(np.pi * t / word) ** 0.3
+            word_spans.append((position, position + len(t)))
+            append(np.sin(2 * np.pi * pitch * t) * envelope * 8000 + rng.normal(0, 60, len(t)))
+            silence(rng.uniform(0.1, 0.3))
+        sentence_spans.append((start, word_spans[-1][1]))
+        silence(rng.uniform(0.8, 2.5))
+
+    audio = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    return audio.tobytes(), sentence_spans, word_spans
+
+
+def replay_fixed(chunks: list, is_speech) -> list:
+    """:return: [(交給 Whisper 時已收到的樣本數, 切點, 音訊長度)]"""
+    received = np.cumsum([len(chunk) // 2 for chunk in chunks])
+    index = [0]  # 正在處理的段落
+    calls = []
+
+    def on_chunk():
+        index[0] = min(index[0] + 1, len(chunks) - 1)
+
+    def recognize(audio):
+        # 固定分段每次都辨識緩衝區中全部的音訊，切點就是目前收到的位置
+        now = int(received[index[0]])
+        calls.append((now, now, len(audio)))
+
+    ring_stream(chunks, is_speech, recognize, on_chunk)
+    return calls
+
+
+def replay_endpointer(chunks: list, is_speech, options: dict) -> list:
+    """:return: [(交給 Whisper 時已收到的樣本數, 切點, 音訊長度)]"""
+    endpointer = VADEndpointer(is_speech, sample_rate=FRAME_RATE, **options)
+    received = 0
+    calls = []
+    for chunk in chunks:
+        endpointer.write(chunk)
+        received += len(chunk) // 2
+        for utterance in endpointer.utterances():
+            cut = received - len(endpointer.buffer) + len(utterance)
+            calls.append((received, cut, len(utterance)))
+    utterance = endpointer.flush()
+    if utterance is not None:
+        calls.append((received, received, len(utterance)))
+    return calls
+
+
+def evaluate(calls: list, sentence_spans: list, word_spans: list) -> dict:
+    latencies = []
+    call_index = 0
+    for _, end in sentence_spans:
+        while call_index < len(calls) and calls[call_index][0] < end:
+            call_index += 1
+        if call_index == len(calls):
+            break
+        latencies.append((calls[call_index][0] - end) / FRAME_RATE)
+
+    word_starts = np.array([start for start, _ in word_spans])
+    word_ends = np.array([end for _, end in word_spans])
+    mid_word = 0
+    for _, cut, _ in calls:
+        i = np.searchsorted(word_starts, cut, side="right") - 1
+        mid_word += i >= 0 and cut < word_ends[i]
+
+    return {
+        "delivered": len(latencies),
+        "p50": statistics.median(latencies),
+        "p90": sorted(latencies)[int(len(latencies) * 0.9)],
+        "max": max(latencies),
+        "mid_word": mid_word,
+        "calls": len(calls),
+        "audio": sum(length for _, _, length in calls) / FRAME_RATE,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--onset-ms", type=int, default=150)
+    parser.add_argument("--hangover-ms", type=int, default=600)
+    parser.add_argument("--padding-ms", type=int, default=150)
+    parser.add_argument("--min-utterance-ms", type=int, default=300)
+    parser.add_argument("--max-utterance-ms", type=int, default=15000)
+    args = parser.parse_args()
+
+    audio, sentence_spans, word_spans = synthetic_meeting(args.sentences, args.seed)
+    chunks = split_chunks(audio)
+    is_speech = make_vad()
+    options = {
+        "onset_ms": args.onset_ms,
+        "hangover_ms": args.hangover_ms,
+        "padding_ms": args.padding_ms,
+        "min_utterance_ms": args.min_utterance_ms,
+        "max_utterance_ms": args.max_utterance_ms,
+    }
+    print(
+        f"{len(audio) / 2 / FRAME_RATE:.0f} 秒音訊，{len(sentence_spans)} 句，"
+        f"語音 {sum(end - start for start, end in word_spans) / FRAME_RATE:.0f} 秒"
+    )
+
+    print(
+        f"\n{'':<12}{'送達句數':>8}{'延遲 p50 s':>12}{'p90 s':>8}{'max s':>8}"
+        f"{'切在單字中':>10}{'Whisper 次數':>13}{'辨識音訊 s':>12}"
+    )
+    for name, calls in (
+        ("fixed 5 s", replay_fixed(chunks, is_speech)),
+        ("endpointer", replay_endpointer(chunks, is_speech, options)),
+    ):
+        result = evaluate(calls, sentence_spans, word_spans)
+        print(
+            f"{name:<12}{result['delivered']:>8}{result['p50']:>12.2f}{result['p90']:>8.2f}"
+            f"{result['max']:>8.2f}{result['mid_word']:>10}{result['calls']:>13}{result['audio']:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
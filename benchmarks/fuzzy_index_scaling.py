@@ -0,0 +1,80 @@
+"""
+比較 FuzzyTermIndex 與逐一 `fuzz.ratio` 掃描在不同術語表大小下的查詢時間。
+
+    PYTHONPATH=src python benchmarks/fuzzy_index_scaling.py --sizes 30 300 3000 30000 50000
+"""
+
+import argparse
+import random
+import time
+
+from fuzzywuzzy import fuzz
+
+from realtime_translate_system.services.fuzzy_index import FuzzyTermIndex
+from synthetic_glossary import perturb, synthetic_terms
+
+
+def brute_force_best(token: str, terms: list, threshold: int):
+    best_match, best_score = None, 0
+    for term in terms:
+        score = fuzz.ratio(token, term)
+        if score >= threshold and score > best_score:
+            best_match, best_score = term, score
+    return best_match, best_score
+
+
+def indexed_best(token: str, index: FuzzyTermIndex, threshold: int):
+    best_match, best_score = None, 0
+    for term in index.candidates(token):
+        score = fuzz.ratio(token, term)
+        if score >= threshold and score > best_score:
+            best_match, best_score = term, score
+    return best_match, best_score
+
+
+def make_queries(terms: list, count: int, seed: int) -> list:
+    """一半是帶錯字的術語，一半是不相關的詞"""
+    rng = random.Random(seed)
+    noise = synthetic_terms(count, seed=seed + 1)
+    return [
+        perturb(rng.choice(terms), rng) if i % 2 == 0 else noise[i]
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[30, 300, 3000, 30000, 50000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--threshold", type=int, default=60)
+    args = parser.parse_args()
+
+    print(f"{'terms':>8} {'build (s)':>10} {'scan (ms/q)':>12} {'index (ms/q)':>13} {'cands/q':>8} {'speedup':>8}")
+    for size in args.sizes:
+        terms = synthetic_terms(size)
+        queries = make_queries(terms, args.queries, seed=size)
+
+        start = time.perf_counter()
+        index = FuzzyTermIndex(terms, args.threshold)
+        build_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        expected = [brute_force_best(q, terms, args.threshold) for q in queries]
+        scan_time = (time.perf_counter() - start) / len(queries)
+
+        start = time.perf_counter()
+        actual = [indexed_best(q, index, args.threshold) for q in queries]
+        index_time = (time.perf_counter() - start) / len(queries)
+
+        if actual != expected:
+            raise AssertionError(f"FuzzyTermIndex result differs from full scan at {size} terms")
+
+        candidates = sum(len(index.candidates(q)) for q in queries) / len(queries)
+        print(
+            f"{size:>8} {build_time:>10.2f} {scan_time * 1000:>12.3f} "
+            f"{index_time * 1000:>13.3f} {candidates:>8.1f} {scan_time / index_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
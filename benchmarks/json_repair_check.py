@@ -0,0 +1,80 @@
+"""
+以格式錯誤的 LLM 回應樣本（json_repair_corpus.jsonl）檢查本地 JSON 修復：
+每筆回應的解析結果與用到的修復類別都必須與記錄相同，
+"expected" 為 null 的回應必須判定為無法修復（交給 LLM 修正）。全程離線執行。
+目前的樣本是依常見錯誤類型重建的，並非從正式環境記錄下來的回應。
+
+    PYTHONPATH=src python benchmarks/json_repair_check.py
+    PYTHONPATH=src python benchmarks/json_repair_check.py --corpus other.jsonl
+
+新增樣本時，把實際收到的回應原樣加入 corpus，"repairs" 填入預期的修復類別。
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from realtime_translate_system.services.json_repair import REPAIR_CLASSES, repair_json
+
+CORPUS = Path(__file__).resolve().parent / "json_repair_corpus.jsonl"
+
+
+def check(entry: dict) -> tuple:
+    """:return: (是否符合記錄, 實際用到的修復類別或 None, 錯誤說明)"""
+    try:
+        parsed, repairs = repair_json(entry["response"])
+    except ValueError:
+        if entry["expected"] is None:
+            return True, None, ""
+        return False, None, "unrepairable"
+
+    if entry["expected"] is None:
+        return False, repairs, "should be unrepairable"
+    if parsed != entry["expected"]:
+        return False, repairs, f"parsed {json.dumps(parsed, ensure_ascii=False)[:120]}"
+    if repairs != entry["repairs"]:
+        return False, repairs, f"repairs {repairs}, expected {entry['repairs']}"
+    return True, repairs, ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=str(CORPUS))
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    failures = 0
+    per_class = Counter()
+    used = Counter()
+    start = time.perf_counter()
+    for line_number, entry in enumerate(entries, 1):
+        ok, repairs, error = check(entry)
+        per_class[entry["class"], ok] += 1
+        used.update(repairs or ["ok" if repairs is not None else "unrepairable"])
+        if not ok:
+            failures += 1
+            print(f"✗ line {line_number} ({entry['class']}): {error}")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n{'class':<32}{'pass':>6}{'fail':>6}")
+    for name in dict.fromkeys(entry["class"] for entry in entries):
+        print(f"{name:<32}{per_class[name, True]:>6}{per_class[name, False]:>6}")
+    print(f"\n{'repair':<32}{'count':>6}")
+    for name in ("ok", *REPAIR_CLASSES, "unrepairable"):
+        print(f"{name:<32}{used[name]:>6}")
+    print(
+        f"\n{len(entries) - failures}/{len(entries)} passed, "
+        f"{elapsed_ms / len(entries):.3f} ms per response"
+    )
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""產生合成企業術語表，用於 TermMatcher 相關的效能測試"""
+
+import random
+from typing import List
+
+_LATIN_SYLLABLES = [
+    "al", "an", "ar", "ba", "be", "cl", "co", "da", "de", "ex", "fa", "ge",
+    "in", "io", "ka", "la", "li", "ma", "mo", "ne", "or", "pa", "pro", "qu",
+    "ra", "re", "sa", "sc", "st", "ta", "te", "tr", "un", "ve", "wa", "xi",
+]
+_GERMAN_PARTS = [
+    "Anlage", "Prozess", "Schicht", "Wafer", "Leitung", "Steuerung", "Fehler",
+    "Daten", "Speicher", "Prüfung", "Maschine", "Werk", "Ausbeute", "Plan",
+]
+# 常用中文字與片假名的 Unicode 範圍
+_CJK_RANGE = (0x4E00, 0x4FFF)
+_KATAKANA_RANGE = (0x30A2, 0x30F3)
+
+
+def _latin_word(rng: random.Random) -> str:
+    word = "".join(rng.choice(_LATIN_SYLLABLES) for _ in range(rng.randint(1, 4)))
+    return word.upper() if rng.random() < 0.3 else word.capitalize()
+
+
+def _english_term(rng: random.Random) -> str:
+    return " ".join(_latin_word(rng) for _ in range(rng.randint(1, 3)))
+
+
+def _german_term(rng: random.Random) -> str:
+    parts = [rng.choice(_GERMAN_PARTS) for _ in range(rng.randint(1, 2))]
+    return parts[0] + "".join(part.lower() for part in parts[1:]) + _latin_word(rng).lower()
+
+
+def _chinese_term(rng: random.Random) -> str:
+    return "".join(chr(rng.randint(*_CJK_RANGE)) for _ in range(rng.randint(2, 5)))
+
+
+def _japanese_term(rng: random.Random) -> str:
+    return "".join(chr(rng.randint(*_KATAKANA_RANGE)) for _ in range(rng.randint(3, 7)))
+
+
+_GENERATORS = {
+    "mixed": (_english_term, _german_term, _chinese_term, _japanese_term),
+    "Traditional Chinese": (_chinese_term, _english_term),
+    "Japanese": (_japanese_term, _english_term),
+    "English": (_english_term,),
+    "German": (_german_term, _english_term),
+}
+
+
+def synthetic_terms(count: int, lang: str = "mixed", seed: int = 0) -> List[str]:
+    """
+    產生 count 個不重複的術語。
+    :param lang: 語言組合，見 `_GENERATORS`
+    :param seed: 亂數種子，相同參數會得到相同術語表
+    """
+    rng = random.Random(seed)
+    generators = _GENERATORS[lang]
+    terms = {}
+    while len(terms) < count:
+        terms.setdefault(rng.choice(generators)(rng), None)
+    return list(terms)
+
+
+def perturb(term: str, rng: random.Random, edits: int = 1) -> str:
+    """對術語做少量隨機編輯，模擬語音辨識的錯字"""
+    chars = list(term)
+    for _ in range(edits):
+        position = rng.randrange(len(chars) + 1)
+        operation = rng.random()
+        if operation < 0.33 and len(chars) > 1:
+            chars.pop(min(position, len(chars) - 1))
+        elif operation < 0.66:
+            chars.insert(position, rng.choice(term))
+        else:
+            chars[min(position, len(chars) - 1)] = rng.choice(term)
+    return "".join(chars)
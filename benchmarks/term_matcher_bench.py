@@ -0,0 +1,371 @@
+"""
+TermMatcher 效能測試：以合成術語表（100 ~ 100k 個術語）重播 dataset/meeting_transcripts/*.txt，
+量測 `process_text` 各階段與 `process_multilingual_text` 的每句延遲 (p50/p99)、吞吐量與記憶體峰值，
+結果存成 JSON，方便跨 commit 比較。全程離線執行。
+
+    PYTHONPATH=src python benchmarks/term_matcher_bench.py --sizes 100 1000 10000 100000
+    PYTHONPATH=src python benchmarks/term_matcher_bench.py --compare old.json
+
+各階段對應 `TermMatcher._match_text`：
+    exact     以自動機找出精確命中的術語
+    tokenize  剩餘片段分詞並定位
+    match     滑動視窗模糊比對（多詞術語的合併也在這一步完成）
+    annotate  排序結果並加上 `==` 註釋
+"""
+
+import argparse
+import csv
+import datetime
+import glob
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from realtime_translate_system.config import Config
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry
+from realtime_translate_system.services.term_matcher import TermMatcher
+from synthetic_glossary import synthetic_terms
+
+ROOT = Path(__file__).resolve().parent.parent
+STAGES = ("exact", "tokenize", "match", "annotate")
+
+
+def write_glossaries(size: int, folder: Path, seed: int = 0) -> dict:
+    """
+    產生各語言的合成術語表 CSV：保留原本的術語（讓逐字稿有命中），其餘以合成術語補足到 size 個。
+    :return: 與 `Config.FILE_PATHS` 相同格式的路徑字典
+    """
+    file_paths = {}
+    for offset, (lang, path) in enumerate(Config.FILE_PATHS.items()):
+        with open(path, encoding="utf-8") as f:
+            rows = [
+                (row["Type"], row["Proper Noun "].strip(), row["Description"])
+                for row in csv.DictReader(f)
+            ]
+        existing = {term for _, term, _ in rows}
+        extra = max(size - len(rows), 0)
+        for term in synthetic_terms(extra + len(rows), lang, seed=seed + offset):
+            if len(rows) >= size:
+                break
+            if term not in existing:
+                rows.append(("Synthetic", term, f"synthetic term {len(rows)}"))
+
+        file_paths[lang] = folder / Path(path).name
+        with open(file_paths[lang], "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Type", "Proper Noun ", "Description"])
+            writer.writerows(rows)
+    return file_paths
+
+
+def load_sentences() -> list:
+    sentences = []
+    for path in sorted(glob.glob(str(ROOT / "dataset" / "meeting_transcripts" / "*.txt"))):
+        with open(path, encoding="utf-8") as f:
+            sentences.extend(line.strip() for line in f if line.strip())
+    return sentences
+
+
+def percentile(values: list, q: float) -> float:
+    """最近秩百分位數"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(int(round(q / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(samples: list) -> dict:
+    """每句延遲（毫秒）的統計"""
+    total = sum(samples)
+    return {
+        "p50_ms": round(percentile(samples, 50), 4),
+        "p99_ms": round(percentile(samples, 99), 4),
+        "mean_ms": round(total / len(samples), 4) if samples else 0.0,
+        "sentences_per_s": round(len(samples) / total * 1000, 1) if total else 0.0,
+    }
+
+
+def staged_process_text(matcher: TermMatcher, text: str, lang: str, measure) -> tuple:
+    """
+    與 `TermMatcher.process_text` 相同的流程，但把每個階段包在 measure(stage, fn) 中。
+    :return: (術語說明列表, 各詞的相似度分數, 帶註釋的文本)
+    """
+    index = matcher._get_index(lang)
+    term_dict = index.term_dict
+
+    def exact():
+        hits = index.automaton.find(text)
+        matched = [(term, term, 100, term_dict[term], start, end) for start, end, term in hits]
+        return hits, matched, {term: 100 for _, _, term in hits}
+
+    exact_hits, final_matched, similarity_scores = measure("exact", exact)
+
+    def tokenize():
+        return [
+            matcher._locate_tokens(segment, matcher._tokenize_text(segment, lang), offset)
+            for offset, segment in matcher._leftover_segments(text, exact_hits)
+        ]
+
+    segments = measure("tokenize", tokenize)
+
+    def match():
+        for token_spans in segments:
+            matched, scores = matcher._match_ngrams(text, token_spans, index)
+            final_matched.extend(matched)
+            similarity_scores.update(scores)
+
+    measure("match", match)
+
+    def annotate():
+        final_matched.sort(key=lambda x: x[4])
+        return matcher.annotate_text(text, final_matched)
+
+    annotated_text = measure("annotate", annotate)
+    return [term[3] for term in final_matched], similarity_scores, annotated_text
+
+
+def replay_stages(matcher: TermMatcher, sentences: list, lang: str) -> dict:
+    """重播一次逐字稿，返回 {stage: [每句耗時 ms]}，total 為各階段總和"""
+    timings = {stage: [] for stage in STAGES}
+
+    def measure(stage, fn):
+        start = time.perf_counter()
+        result = fn()
+        timings[stage].append((time.perf_counter() - start) * 1000)
+        return result
+
+    for text in sentences:
+        staged_process_text(matcher, text, lang, measure)
+    timings["total"] = [sum(values) for values in zip(*(timings[s] for s in STAGES))]
+    return timings
+
+
+def stage_memory(matcher: TermMatcher, sentences: list, lang: str) -> dict:
+    """以 tracemalloc 量測每個階段單句的記憶體峰值（KB，取所有句子中的最大值）"""
+    peaks = {stage: 0 for stage in STAGES}
+
+    def measure(stage, fn):
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        result = fn()
+        peaks[stage] = max(peaks[stage], tracemalloc.get_traced_memory()[1] - before)
+        return result
+
+    tracemalloc.start()
+    try:
+        for text in sentences:
+            staged_process_text(matcher, text, lang, measure)
+    finally:
+        tracemalloc.stop()
+    return {stage: round(peak / 1024, 1) for stage, peak in peaks.items()}
+
+
+def check_equivalence(matcher: TermMatcher, sentences: list, lang: str) -> None:
+    """分階段的流程必須和 `process_text` 結果完全相同，否則量到的不是同一件事"""
+    for text in sentences:
+        expected = matcher.process_text(text, lang)
+        actual = staged_process_text(matcher, text, lang, lambda _, fn: fn())
+        if actual != expected:
+            raise AssertionError(f"staged_process_text differs from process_text ({lang}): {text}")
+
+
+def max_rss_mb() -> float:
+    # Linux 的 ru_maxrss 單位為 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def bench_size(size: int, sentences: list, args) -> dict:
+    with tempfile.TemporaryDirectory() as folder:
+        file_paths = write_glossaries(size, Path(folder), seed=args.seed)
+
+        rss_before = max_rss_mb()
+        start = time.perf_counter()
+        matcher = TermMatcher(GlossaryRegistry(file_paths), args.threshold, args.cache_size)
+        matcher.wait_until_ready()
+        build_s = time.perf_counter() - start
+
+        result = {
+            "terms": size,
+            "build_s": round(build_s, 3),
+            # 行程最大 RSS 的增加量，較小的術語表可能為 0（前一輪已佔用過）
+            "build_rss_mb": round(max_rss_mb() - rss_before, 1),
+            "process_text": {},
+            "process_multilingual_text": {},
+        }
+
+        try:
+            for lang in matcher.term_dicts:
+                check_equivalence(matcher, sentences[: args.check], lang)
+                matcher._get_index(lang).match_cache.cache_clear()  # 第一次重播為冷快取
+
+                cold = replay_stages(matcher, sentences, lang)
+                warm = {stage: [] for stage in cold}
+                for _ in range(args.repeat):
+                    for stage, values in replay_stages(matcher, sentences, lang).items():
+                        warm[stage].extend(values)
+
+                result["process_text"][lang] = {
+                    "cold": {stage: summarize(values) for stage, values in cold.items()},
+                    "warm": {stage: summarize(values) for stage, values in warm.items()},
+                    "peak_kb": stage_memory(matcher, sentences, lang),
+                }
+
+            for executor in args.executors:
+                result["process_multilingual_text"][executor] = bench_multilingual(
+                    matcher, file_paths, sentences, executor, args
+                )
+        finally:
+            matcher.close()
+
+    return result
+
+
+def bench_multilingual(matcher, file_paths, sentences, executor, args) -> dict:
+    """四個語言同時處理同一句（逐字稿本身中英混雜），量測整句的延遲"""
+    if executor != "none":
+        matcher = TermMatcher(
+            GlossaryRegistry(file_paths),
+            args.threshold,
+            args.cache_size,
+            executor=executor,
+            max_workers=len(file_paths),
+        )
+        matcher.wait_until_ready()
+    try:
+        samples = []
+        for _ in range(args.repeat + 1):
+            for text in sentences:
+                text_dict = {lang: text for lang in file_paths}
+                start = time.perf_counter()
+                matcher.process_multilingual_text(text_dict)
+                samples.append((time.perf_counter() - start) * 1000)
+        return summarize(samples)
+    finally:
+        if executor != "none":
+            matcher.close()
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report: dict) -> None:
+    print(f"commit {report['meta']['commit']}, {report['meta']['sentences']} sentences")
+    print(f"{'terms':>7} {'language':<20} {'stage':<9} {'cold p50':>9} {'cold p99':>9} "
+          f"{'warm p50':>9} {'warm p99':>9} {'peak KB':>8}")
+    for result in report["results"]:
+        print(f"{result['terms']:>7} build {result['build_s']:.2f}s, +{result['build_rss_mb']} MB RSS")
+        for lang, stats in result["process_text"].items():
+            for stage in STAGES + ("total",):
+                cold, warm = stats["cold"][stage], stats["warm"][stage]
+                print(
+                    f"{result['terms']:>7} {lang:<20} {stage:<9} {cold['p50_ms']:>9.3f} "
+                    f"{cold['p99_ms']:>9.3f} {warm['p50_ms']:>9.3f} {warm['p99_ms']:>9.3f} "
+                    f"{stats['peak_kb'].get(stage, ''):>8}"
+                )
+        for executor, stats in result["process_multilingual_text"].items():
+            print(
+                f"{result['terms']:>7} multilingual ({executor}): p50 {stats['p50_ms']:.3f} ms, "
+                f"p99 {stats['p99_ms']:.3f} ms, {stats['sentences_per_s']} sentences/s"
+            )
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> int:
+    """列出 p50/p99 比基準慢超過 tolerance 的項目，返回數量"""
+    old_results = {result["terms"]: result for result in baseline["results"]}
+    regressions = 0
+    print(f"\ncompare with {baseline['meta']['commit']} (tolerance {tolerance:.0%})")
+    for result in report["results"]:
+        old = old_results.get(result["terms"])
+        if old is None:
+            continue
+        pairs = [
+            (f"{lang}/{phase}/{stage}", stats[phase][stage], old["process_text"][lang][phase][stage])
+            for lang, stats in result["process_text"].items()
+            if lang in old["process_text"]
+            for phase in ("cold", "warm")
+            for stage in STAGES + ("total",)
+        ] + [
+            (f"multilingual/{executor}", stats, old["process_multilingual_text"][executor])
+            for executor, stats in result["process_multilingual_text"].items()
+            if executor in old["process_multilingual_text"]
+        ]
+        for name, new_stats, old_stats in pairs:
+            for key in ("p50_ms", "p99_ms"):
+                if old_stats[key] and new_stats[key] > old_stats[key] * (1 + tolerance):
+                    regressions += 1
+                    print(
+                        f"  {result['terms']:>7} {name} {key}: "
+                        f"{old_stats[key]:.3f} -> {new_stats[key]:.3f} ms"
+                    )
+    print(f"{regressions} regression(s)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    parser.add_argument("--threshold", type=int, default=Config.TERM_MATCHER_THRESHOLD)
+    parser.add_argument("--cache-size", type=int, default=Config.TERM_MATCHER_CACHE_SIZE)
+    parser.add_argument("--repeat", type=int, default=3, help="冷快取之後再重播幾次（暖快取）")
+    parser.add_argument("--executors", nargs="+", default=["none", "thread"],
+                        choices=["none", "thread", "process"])
+    parser.add_argument("--check", type=int, default=50, help="驗證分階段流程與 process_text 一致的句數")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="term_matcher_bench.json")
+    parser.add_argument("--compare", help="作為基準的舊結果 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    sentences = load_sentences()
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "threshold": args.threshold,
+            "cache_size": args.cache_size,
+            "repeat": args.repeat,
+            "sentences": len(sentences),
+        },
+        "results": [],
+    }
+
+    for size in args.sizes:
+        print(f"benchmarking {size} terms ...", file=sys.stderr)
+        report["results"].append(bench_size(size, sentences, args))
+
+    report["meta"]["max_rss_mb"] = round(max_rss_mb(), 1)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print_report(report)
+    print(f"\nresults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
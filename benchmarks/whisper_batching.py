@@ -0,0 +1,145 @@
+"""
+同時重播多個會議室的語音串流，比較各連線直接呼叫 Whisper 與 WhisperBatchScheduler 的批次推論：
+音訊送完後還要等多久才辨識完（落後即時的秒數）、整體 real-time factor，以及批次大小與排隊等待。
+落後時間持續增加表示這台機器撐不住這麼多個會議室。
+
+    PYTHONPATH=src python benchmarks/whisper_batching.py --sessions 4
+    PYTHONPATH=src python benchmarks/whisper_batching.py --sessions 8 --model base --speed 0
+
+每個會議室重播 dataset/train_split_audio 的全部錄音（片段之間插入 1 秒靜音），
+以瀏覽器 AudioWorklet 的大小分段、依 --speed 的速度送入（1 為即時，0 為不等待）。
+需要安裝 openai-whisper、webrtcvad、noisereduce 與 ffmpeg。
+尚未在真實的 Whisper 模型上執行過，因此 Config.WHISPER_BATCHING 預設關閉。
+"""
+
+import argparse
+import queue
+import statistics
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import whisper
+
+from audio_buffer_replay import FRAME_RATE, SAMPLE_WIDTH, split_chunks
+from realtime_translate_system.services.speech.batch_scheduler import WhisperBatchScheduler
+from realtime_translate_system.services.speech.whisper import WhisperSpeechRecognizer
+
+DATASET_DIR = Path(__file__).resolve().parent.parent / "dataset" / "train_split_audio"
+
+
+def clip_index(path: Path) -> int:
+    """`3_Lisa_23369_37814.wav` → 3（對應 transcripts.csv 的第幾句）"""
+    return int(path.name.split("_", 1)[0])
+
+
+def load_clips(directory: Path = DATASET_DIR) -> list:
+    """:return: [(檔案, 16 kHz float32 音訊)]，依句子順序排列"""
+    paths = sorted(directory.glob("*.wav"), key=clip_index)
+    return [(path, whisper.load_audio(str(path))) for path in paths]
+
+
+def meeting_audio(clips: list, gap: float = 1.0) -> bytes:
+    """把所有片段接成一段會議錄音（16-bit PCM）"""
+    silence = np.zeros(int(gap * FRAME_RATE), dtype=np.float32)
+    audio = np.concatenate([part for _, clip in clips for part in (clip, silence)])
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16).tobytes()
+
+
+def replay(recognizer: WhisperSpeechRecognizer, chunks: list, speed: float, results: list) -> None:
+    audio_queue = queue.Queue()
+    finished = threading.Event()
+    finals = []
+    worker = threading.Thread(
+        target=recognizer.transcribe_streaming,
+        args=(audio_queue, finals.append, finished.set),
+        daemon=True,
+    )
+    worker.start()
+    for chunk in chunks:
+        audio_queue.put(chunk)
+        if speed:
+            time.sleep(len(chunk) / SAMPLE_WIDTH / FRAME_RATE / speed)
+    fed = time.perf_counter()
+    audio_queue.put(b"")
+    finished.wait()
+    results.append({"lag": time.perf_counter() - fed, "finals": len(finals)})
+
+
+def time_transcribe(model, totals: list) -> None:
+    """直接呼叫時累計 `model.transcribe()` 的耗時與音訊長度：totals = [推論秒數, 音訊秒數]"""
+    transcribe = type(model).transcribe
+
+    def timed(audio, **kwargs):
+        start = time.perf_counter()
+        result = transcribe(model, audio, **kwargs)
+        totals[0] += time.perf_counter() - start
+        totals[1] += len(audio) / FRAME_RATE
+        return result
+
+    model.transcribe = timed
+
+
+def run(recognizer: WhisperSpeechRecognizer, chunks: list, sessions: int, speed: float) -> dict:
+    results = []
+    threads = [
+        threading.Thread(target=replay, args=(recognizer, chunks, speed, results))
+        for _ in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {
+        "lag_avg": statistics.mean(result["lag"] for result in results),
+        "lag_max": max(result["lag"] for result in results),
+        "finals": sum(result["finals"] for result in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=4, help="同時進行的會議室數")
+    parser.add_argument("--model", default="turbo")
+    parser.add_argument("--speed", type=float, default=1.0, help="送入音訊的速度，1 為即時，0 為不等待")
+    parser.add_argument("--max-batch-size", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=int, default=50)
+    parser.add_argument("--partials", action="store_true", help="同時輸出 partial（每秒重新辨識）")
+    args = parser.parse_args()
+
+    clips = load_clips()
+    chunks = split_chunks(meeting_audio(clips))
+    recognizer = WhisperSpeechRecognizer(
+        model_size=args.model, partial_interval_ms=1000 if args.partials else 0
+    )
+    print(f"{len(clips)} 個片段，每個會議室 {len(chunks)} 段音訊，{args.sessions} 個會議室")
+
+    print(
+        f"\n{'':<10}{'落後 avg s':>11}{'落後 max s':>11}{'RTF':>7}"
+        f"{'批次 avg':>9}{'批次 max':>9}{'等待 p50 ms':>12}{'等待 p95 ms':>12}{'finals':>8}"
+    )
+    for name, scheduler in (
+        ("direct", None),
+        ("batched", WhisperBatchScheduler(recognizer.model, args.max_batch_size, args.max_wait_ms)),
+    ):
+        recognizer.scheduler = scheduler
+        totals = [0.0, 0.0]
+        if scheduler is None:
+            time_transcribe(recognizer.model, totals)
+        result = run(recognizer, chunks, args.sessions, args.speed)
+        if scheduler is None:
+            del recognizer.model.transcribe
+        stats = recognizer.stats()
+        # 直接呼叫時沒有批次統計，RTF 以各次 `model.transcribe()` 的耗時計算
+        rtf = stats.get("rtf") or (totals[0] / totals[1] if totals[1] else 0.0)
+        print(
+            f"{name:<10}{result['lag_avg']:>11.2f}{result['lag_max']:>11.2f}{rtf:>7.3f}"
+            f"{stats.get('batch_size_avg') or 1:>9}{stats.get('batch_size_max') or 1:>9}"
+            f"{stats.get('queue_wait_p50_ms') or '-':>12}{stats.get('queue_wait_p95_ms') or '-':>12}"
+            f"{result['finals']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 """Flask application entry point with Socket.IO support."""
 
 import os
+import threading
 from flask import Flask
 from flask_cors import CORS
 import vertexai
@@ -29,13 +30,27 @@ def create_app() -> Flask:
     container.config.from_dict(app.config)
     app.container = container
 
-    vertexai.init(
-        project=container.config.PROJECT_ID(), location=container.config.LOCATION()
-    )
+    # 在背景預熱術語比對器（術語索引、jieba、MeCab），第一句話不必等待載入
+    container.term_matcher().warm_up()
+
+    if container.config.AI_BACKEND() == "vertex":
+        vertexai.init(
+            project=container.config.PROJECT_ID(), location=container.config.LOCATION()
+        )
 
     db.init_app(app)
     with app.app_context():
         db.create_all()
+
+    # 在背景以已存的會議紀錄建立翻譯記憶（由舊到新加入，超過上限時先淘汰舊的）
+    def load_translation_memory():
+        with app.app_context():
+            meetings = container.database_service().get_meetings() or []
+            container.translation_memory().load_documents(reversed(meetings))
+
+    threading.Thread(
+        target=load_translation_memory, name="translation-memory-load", daemon=True
+    ).start()
     init_blueprints(app)
     register_audio_sockets(
         app,
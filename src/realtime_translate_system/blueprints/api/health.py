@@ -0,0 +1,29 @@
+from flask import Blueprint, jsonify, current_app as app
+from realtime_translate_system.services import json_repair
+
+health_bp = Blueprint("health", __name__)
+
+
+@health_bp.route("/", methods=["GET"])
+def readiness():
+    """預熱完成前返回 503，供 k8s readinessProbe 使用"""
+    term_matcher = app.container.term_matcher()
+    ready = term_matcher.ready
+    return jsonify({"ready": ready}), 200 if ready else 503
+
+
+@health_bp.route("/metrics", methods=["GET"])
+def metrics():
+    """翻譯快取命中率、不必呼叫 LLM 的句子比例、LLM 呼叫、JSON 修復次數與語音辨識批次等統計資料"""
+    translation_cache = app.container.translation_cache()
+    llm_client = app.container.llm_client_flash()
+    return jsonify(
+        {
+            "translation_cache": translation_cache.stats(),
+            "translation": app.container.translation_service().stats(),
+            "llm": llm_client.stats(),
+            "llm_router": app.container.llm_router().stats(),
+            "json_repair": json_repair.repair_stats.as_dict(),
+            "asr": app.container.recognizer().stats(),
+        }
+    )
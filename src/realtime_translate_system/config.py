@@ -24,13 +24,100 @@ class Config:
         Language.DE: GLOSSARY_FOLDER / "de-DE.csv",
         Language.JP: GLOSSARY_FOLDER / "ja-JP.csv",
     }
+    GLOSSARY_WATCH_INTERVAL = 30  # 檢查術語表 CSV 是否更新的間隔（秒）
+    # 預先編譯的術語表（`python -m realtime_translate_system.services.glossary_cache` 產生）
+    GLOSSARY_CACHE_DIR = GLOSSARY_FOLDER / "compiled"
 
     # Google Cloud environment variables
     PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT")
     LOCATION = "us-central1"
 
     ALLOWED_EXTENSIONS = {"wav"}
+    # "vertex" 使用 Vertex AI；"fake" 使用離線的 FakeLLMService / FakeEmbeddingService
+    AI_BACKEND = os.getenv("AI_BACKEND", "vertex")
+    FAKE_LLM_LATENCY_MEDIAN = float(os.getenv("FAKE_LLM_LATENCY_MEDIAN", 0.8))  # 秒
+    FAKE_LLM_LATENCY_SIGMA = float(os.getenv("FAKE_LLM_LATENCY_SIGMA", 0.4))
+    FAKE_LLM_PER_CHAR_LATENCY = float(os.getenv("FAKE_LLM_PER_CHAR_LATENCY", 0.002))
+    FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", 0.0))
+    FAKE_LLM_MALFORMED_RATE = float(os.getenv("FAKE_LLM_MALFORMED_RATE", 0.0))
+    FAKE_SEED = int(os.getenv("FAKE_SEED", 0))
+
+    # 會議相關工作使用 pro 的最短提示字元數（含提示模板約 1500 字），None 表示一律使用 flash
+    LLM_TASK_BUDGETS = {
+        "default": 0,
+        "query": None,  # 查詢解析：輸出很短
+        "title": 12000,  # 標題與關鍵字：只有很長的逐字稿才需要 pro
+        "summary": 4000,  # 會議摘要
+        "context_summary": None,  # 翻譯上下文的滾動摘要：在背景執行，短而頻繁
+    }
+    LLM_PRO_LATENCY_SLO = 10  # pro 近期 p95 延遲超過此值（秒）時降級為 flash
+    LLM_LATENCY_WINDOW = 300  # 計算 p95 的觀察時間（秒）
+
+    # 翻譯用 LLM 的呼叫限制
+    LLM_MAX_CONCURRENCY = 8  # 全域同時進行的請求數
+    LLM_SESSION_CONCURRENCY = 2  # 單一連線同時進行的呼叫數
+    LLM_DEADLINE = 15  # 每次呼叫的期限（秒），包含重試與對沖
+    LLM_MAX_RETRIES = 2
+    LLM_HEDGE = True  # 超過近期 p95 延遲時再送一次，取先回來的結果
+    # 語音辨識引擎："whisper" 使用 openai-whisper；"faster_whisper"（實驗性）使用 CTranslate2 的 int8 量化模型（CPU 節點）。
+    # faster_whisper 的 RTF、記憶體與正確率尚未在本專案的錄音上量測，正式環境請維持 "whisper"，
+    # 切換前先執行 benchmarks/asr_backends.py 比較
+    ASR_BACKEND = os.getenv("ASR_BACKEND", "whisper")
+    FASTER_WHISPER_MODEL = "large-v3-turbo"
+    FASTER_WHISPER_COMPUTE_TYPE = "int8"
+    FASTER_WHISPER_CPU_THREADS = 0  # 每個 worker 的執行緒數，0 表示由 CTranslate2 決定
+    FASTER_WHISPER_WORKERS = 2  # 可以同時推論的連線數
+    # 串流語音辨識的語句切分（毫秒）：語句一結束就交給 Whisper，見 VADEndpointer
+    WHISPER_ENDPOINTING = {
+        "onset_ms": 150,  # 這段時間內八成的 frame 是語音才視為開始說話
+        "hangover_ms": 600,  # 連續這麼久沒有語音才視為說完
+        "padding_ms": 150,  # 語句前後保留的音訊
+        "min_utterance_ms": 300,  # 更短的（咳嗽、雜音）不辨識
+        "max_utterance_ms": 15000,  # 更長的在停頓處強制切開
+    }
+    # 說話中每收到這麼長的新音訊就重新辨識一次，送出即時字幕（partial）；0 表示語句結束才辨識
+    WHISPER_PARTIAL_INTERVAL_MS = 1000
+    # 各連線的語句合併成一批推論（共用一個模型），None 表示各連線直接呼叫模型。
+    # 批次推論只在替代 Whisper 的測試模型上驗證過，真實模型的延遲與吞吐量尚未量測，
+    # 因此預設關閉；設定 WHISPER_BATCHING=1 啟用前，先在 GPU 節點上執行 benchmarks/whisper_batching.py 比較
+    WHISPER_BATCHING = (
+        {
+            "max_batch_size": 8,  # 一批最多的語句數
+            "max_wait_ms": 50,  # 第一段語句最多等待更多語句的時間
+        }
+        if os.getenv("WHISPER_BATCHING") == "1"
+        else None
+    )
     TERM_MATCHER_THRESHOLD = 60
+    TERM_MATCHER_CACHE_SIZE = 4096  # 每個語言快取的 token 比對結果數量
+    # 多語言平行處理："thread"、"process" 或 None（依序處理）。比對是受 GIL 限制的純 Python，
+    # benchmarks/term_matcher_bench.py 中兩種 executor 的 p50/p99 都比依序處理慢，預設不使用
+    TERM_MATCHER_EXECUTOR = None
+    TERM_MATCHER_WORKERS = 4  # "thread" 模式的執行緒數量
+    # 翻譯提示中的術語："relevant" 只放原句中命中的術語，"full" 放整份術語表
+    TRANSLATION_TERM_INJECTION = "relevant"
+    # 翻譯快取：記憶體 LRU + SQLite，重複的語句（"謝謝"、"下一頁"）不必再呼叫 LLM
+    TRANSLATION_CACHE_PATH = BASE_DIR / "cache" / "translations.sqlite3"
+    TRANSLATION_CACHE_MEMORY_SIZE = 1024
+    TRANSLATION_CACHE_TTL = 7 * 24 * 3600  # 秒
+    TRANSLATION_CACHE_MAX_ENTRIES = 100_000
+    TRANSLATION_CACHE_CONTEXT_FREE_LENGTH = 12  # 不超過此長度的短句不考慮上一句的上下文
+    # 翻譯記憶：已存的會議紀錄與即時翻譯結果，相同或幾乎相同的句子直接沿用，相近的句子作為提示中的參考
+    TRANSLATION_MEMORY_MAX_ENTRIES = 50_000
+    # 相似度 (0-100) 達到此值、且不同的部分沒有數字、人名或否定詞時直接沿用
+    TRANSLATION_MEMORY_REUSE_THRESHOLD = 95
+    TRANSLATION_MEMORY_HINT_THRESHOLD = 75  # 相似度達到此值時放進提示作為參考
+    # 翻譯上下文：每個連線各自保留最近幾句的翻譯，提示中的上下文不超過 token 上限
+    TRANSLATION_CONTEXT_SENTENCES = 3
+    TRANSLATION_CONTEXT_MAX_TOKENS = 600
+    TRANSLATION_CONTEXT_MAX_SESSIONS = 256
+    TRANSLATION_CONTEXT_IDLE_TTL = 3600  # 秒，沒有收到斷線通知的連線也會被清除
+    TRANSLATION_CONTEXT_SUMMARY = False  # 是否以 LLM 把較早的句子整理成滾動摘要
+    TRANSLATION_CONTEXT_SUMMARY_TOKENS = 150
+    # 批次翻譯：第一句進來後最多等待 WINDOW 秒或湊滿 SIZE 句，合併成一次 LLM 呼叫
+    TRANSLATION_BATCH_WINDOW = 0.15
+    TRANSLATION_BATCH_SIZE = 8
+    TRANSLATION_BATCH_CONCURRENCY = 4  # 同時進行的批次 LLM 呼叫數量
 
 
 class DevelopmentConfig(Config):
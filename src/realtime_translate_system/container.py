@@ -1,56 +1,197 @@
 from dependency_injector import containers, providers
 from realtime_translate_system.extensions import socketio
 from realtime_translate_system.services import (
+    GlossaryRegistry,
     AudioService,
     GoogleSpeechRecognizer,
     WhisperSpeechRecognizer,
     TranslationService,
     TermMatcher,
+    TranslationCache,
+    TranslationMemory,
+    TranslationContextStore,
+    ContextSummarizer,
+    TranslationBatcher,
     TranscriptService,
     LLMService,
+    LLMClient,
+    LLMRouter,
     EmbeddingService,
+    FakeLLMService,
+    FakeEmbeddingService,
     MeetingProcessor,
     DatabaseService,
     TranslationService,
 )
 
 
+def faster_whisper_recognizer(**kwargs):
+    """選用 faster-whisper 時才匯入，使用 openai-whisper 時不必安裝或載入 CTranslate2"""
+    from realtime_translate_system.services.speech.faster_whisper import (
+        FasterWhisperSpeechRecognizer,
+    )
+
+    return FasterWhisperSpeechRecognizer(**kwargs)
+
+
 class Container(containers.DeclarativeContainer):
     config = providers.Configuration()
     socketio = providers.Object(socketio)
 
-    # LLM 服務
-    llm_service_pro = providers.Factory(LLMService, model_name="gemini-1.5-pro-002")
-    llm_service_flash = providers.Factory(LLMService, model_name="gemini-1.5-flash-002")
+    # LLM 服務（AI_BACKEND 為 "fake" 時改用離線的替代品，供效能測試使用）
+    fake_llm_service = providers.Factory(
+        FakeLLMService,
+        latency_median=config.FAKE_LLM_LATENCY_MEDIAN,
+        latency_sigma=config.FAKE_LLM_LATENCY_SIGMA,
+        per_char_latency=config.FAKE_LLM_PER_CHAR_LATENCY,
+        error_rate=config.FAKE_LLM_ERROR_RATE,
+        malformed_rate=config.FAKE_LLM_MALFORMED_RATE,
+        seed=config.FAKE_SEED,
+    )
+    llm_service_pro = providers.Selector(
+        config.AI_BACKEND,
+        vertex=providers.Factory(LLMService, model_name="gemini-1.5-pro-002"),
+        fake=fake_llm_service,
+    )
+    llm_service_flash = providers.Selector(
+        config.AI_BACKEND,
+        vertex=providers.Factory(LLMService, model_name="gemini-1.5-flash-002"),
+        fake=fake_llm_service,
+    )
+
+    # 會議標題、查詢解析與摘要：依工作與提示長度選擇 flash 或 pro，pro 太慢時降級
+    llm_router = providers.Singleton(
+        LLMRouter,
+        flash=llm_service_flash,
+        pro=llm_service_pro,
+        task_budgets=config.LLM_TASK_BUDGETS,
+        latency_slo=config.LLM_PRO_LATENCY_SLO,
+        latency_window=config.LLM_LATENCY_WINDOW,
+    )
+
+    # 即時翻譯用：並行數上限、期限、重試與對沖請求
+    llm_client_flash = providers.Singleton(
+        LLMClient,
+        llm_service=llm_service_flash,
+        max_concurrency=config.LLM_MAX_CONCURRENCY,
+        session_concurrency=config.LLM_SESSION_CONCURRENCY,
+        deadline=config.LLM_DEADLINE,
+        max_retries=config.LLM_MAX_RETRIES,
+        hedge=config.LLM_HEDGE,
+    )
 
     # 基本服務
-    recognizer = providers.Singleton(
-        WhisperSpeechRecognizer, model_size="turbo"
+    glossary_registry = providers.Singleton(
+        GlossaryRegistry,
+        file_paths=config.FILE_PATHS,
+        watch_interval=config.GLOSSARY_WATCH_INTERVAL,
+        cache_dir=config.GLOSSARY_CACHE_DIR,
+    )
+
+    # 語音辨識：ASR_BACKEND 為 "faster_whisper" 時在 CPU 上以 int8 量化模型推論（實驗性）
+    recognizer = providers.Selector(
+        config.ASR_BACKEND,
+        whisper=providers.Singleton(
+            WhisperSpeechRecognizer,
+            model_size="turbo",
+            endpointing=config.WHISPER_ENDPOINTING,
+            partial_interval_ms=config.WHISPER_PARTIAL_INTERVAL_MS,
+            batching=config.WHISPER_BATCHING,
+        ),
+        faster_whisper=providers.Singleton(
+            faster_whisper_recognizer,
+            model_size=config.FASTER_WHISPER_MODEL,
+            compute_type=config.FASTER_WHISPER_COMPUTE_TYPE,
+            cpu_threads=config.FASTER_WHISPER_CPU_THREADS,
+            num_workers=config.FASTER_WHISPER_WORKERS,
+            endpointing=config.WHISPER_ENDPOINTING,
+            partial_interval_ms=config.WHISPER_PARTIAL_INTERVAL_MS,
+        ),
     )
 
     # recognizer = providers.Singleton(
-    #     GoogleSpeechRecognizer, location=config.LOCATION, project_id=config.PROJECT_ID
+    #     GoogleSpeechRecognizer,
+    #     location=config.LOCATION,
+    #     project_id=config.PROJECT_ID,
+    #     glossary_registry=glossary_registry,
     # )
 
     term_matcher = providers.Singleton(
         TermMatcher,
-        file_paths=config.FILE_PATHS,
+        glossary_registry=glossary_registry,
         threshold=config.TERM_MATCHER_THRESHOLD,
+        cache_size=config.TERM_MATCHER_CACHE_SIZE,
+        executor=config.TERM_MATCHER_EXECUTOR,
+        max_workers=config.TERM_MATCHER_WORKERS,
+    )
+
+    translation_cache = providers.Singleton(
+        TranslationCache,
+        db_path=config.TRANSLATION_CACHE_PATH,
+        memory_size=config.TRANSLATION_CACHE_MEMORY_SIZE,
+        ttl=config.TRANSLATION_CACHE_TTL,
+        max_entries=config.TRANSLATION_CACHE_MAX_ENTRIES,
+        context_free_length=config.TRANSLATION_CACHE_CONTEXT_FREE_LENGTH,
+    )
+
+    translation_memory = providers.Singleton(
+        TranslationMemory, max_entries=config.TRANSLATION_MEMORY_MAX_ENTRIES
     )
 
     translation_service = providers.Singleton(
-        TranslationService, llm_service=llm_service_flash
+        TranslationService,
+        llm_service=llm_client_flash,
+        glossary_registry=glossary_registry,
+        term_matcher=term_matcher,
+        term_injection=config.TRANSLATION_TERM_INJECTION,
+        translation_cache=translation_cache,
+        translation_memory=translation_memory,
+        memory_reuse_threshold=config.TRANSLATION_MEMORY_REUSE_THRESHOLD,
+        memory_hint_threshold=config.TRANSLATION_MEMORY_HINT_THRESHOLD,
+    )
+
+    translation_batcher = providers.Singleton(
+        TranslationBatcher,
+        translation_service=translation_service,
+        window=config.TRANSLATION_BATCH_WINDOW,
+        max_batch_size=config.TRANSLATION_BATCH_SIZE,
+        max_concurrency=config.TRANSLATION_BATCH_CONCURRENCY,
+    )
+
+    # 各連線的翻譯上下文；TRANSLATION_CONTEXT_SUMMARY 為 True 時以 LLM 維護滾動摘要
+    context_summarizer = providers.Selector(
+        config.TRANSLATION_CONTEXT_SUMMARY.as_(lambda enabled: "on" if enabled else "off"),
+        on=providers.Singleton(
+            ContextSummarizer,
+            llm_service=llm_router,
+            max_tokens=config.TRANSLATION_CONTEXT_SUMMARY_TOKENS,
+        ),
+        off=providers.Object(None),
+    )
+
+    translation_context_store = providers.Singleton(
+        TranslationContextStore,
+        max_sentences=config.TRANSLATION_CONTEXT_SENTENCES,
+        max_tokens=config.TRANSLATION_CONTEXT_MAX_TOKENS,
+        max_sessions=config.TRANSLATION_CONTEXT_MAX_SESSIONS,
+        idle_ttl=config.TRANSLATION_CONTEXT_IDLE_TTL,
+        summarizer=context_summarizer,
     )
 
     transcript_service = providers.Singleton(
         TranscriptService,
-        glossary_folder=config.FILE_PATHS,
         translation_service=translation_service,
         term_matcher=term_matcher,
+        translation_batcher=translation_batcher,
+        context_store=translation_context_store,
     )
 
-    embedding_service = providers.Singleton(
-        EmbeddingService, model_name="text-multilingual-embedding-002"
+    embedding_service = providers.Selector(
+        config.AI_BACKEND,
+        vertex=providers.Singleton(
+            EmbeddingService, model_name="text-multilingual-embedding-002"
+        ),
+        fake=providers.Singleton(FakeEmbeddingService, seed=config.FAKE_SEED),
     )
 
     database_service = providers.Singleton(
@@ -59,7 +200,7 @@ class Container(containers.DeclarativeContainer):
 
     meeting_processor = providers.Singleton(
         MeetingProcessor,
-        llm_service=llm_service_pro,
+        llm_service=llm_router,
         db_service=database_service,
         embedding_service=embedding_service,
     )
@@ -1,10 +1,21 @@
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry
 from realtime_translate_system.services.audio_service import AudioService
 from realtime_translate_system.services.speech_recongizer import SpeechRecognizer
 from realtime_translate_system.services.speech.google import GoogleSpeechRecognizer
 from realtime_translate_system.services.speech.whisper import WhisperSpeechRecognizer
+from realtime_translate_system.services.translation_cache import TranslationCache
+from realtime_translate_system.services.translation_memory import TranslationMemory
+from realtime_translate_system.services.translation_context import (
+    ContextSummarizer,
+    TranslationContextStore,
+)
 from realtime_translate_system.services.translation_service import TranslationService
-from realtime_translate_system.services.term_matcher import TermMatcher
+from realtime_translate_system.services.translation_batcher import TranslationBatcher
+from realtime_translate_system.services.term_matcher import TermMatcher, StreamingTermMatcher
 from realtime_translate_system.services.ai_service import LLMService, EmbeddingService
+from realtime_translate_system.services.fake_ai_service import FakeLLMService, FakeEmbeddingService
+from realtime_translate_system.services.llm_client import LLMClient, llm_deadline, llm_session
+from realtime_translate_system.services.llm_router import LLMRouter, llm_task
 from realtime_translate_system.services.meeting_service import MeetingProcessor
 from realtime_translate_system.services.database_service import DatabaseService
 from realtime_translate_system.services.translation_service import TranslationService
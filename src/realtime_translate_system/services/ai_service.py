@@ -2,6 +2,9 @@ from vertexai.generative_models import GenerativeModel
 from vertexai.language_models import TextEmbeddingModel 
 import json
 import re
+from typing import Iterator
+
+from realtime_translate_system.services import json_repair
 
 class LLMService:
     """負責 LLM 相關操作"""
@@ -13,17 +16,30 @@ class LLMService:
         response = self.llm_model.generate_content(prompt, generation_config=generation_config)
         return response.text.strip()
 
-    def parse_json_response(self, response_text):
-        """嘗試解析 JSON，若解析失敗則請 LLM 修正"""
+    def query_stream(self, prompt: str, generation_config=None) -> Iterator[str]:
+        """以串流方式呼叫 LLM，逐段返回產生的文字"""
+        responses = self.llm_model.generate_content(
+            prompt, generation_config=generation_config, stream=True
+        )
+        for response in responses:
+            try:
+                yield response.text
+            except ValueError:
+                continue  # 沒有文字的片段（例如只帶結束原因的最後一段）
+
+    def parse_json_response(self, response_text, query=None):
+        """
+        嘗試解析 JSON，先在本地修復常見的格式錯誤，仍失敗才請 LLM 修正
+        :param query: 請 LLM 修正時使用的呼叫，預設為 `self.query`（`LLMClient` 以此套用並行數上限與期限）
+        """
         def clean_json_output(text):
             """移除 LLM 產生的 ```json 標記，返回純 JSON 字串。"""
             return re.sub(r"^```json\s*|\s*```$", "", text.strip())
     
         try:
-            cleaned_output = clean_json_output(response_text)
-            return json.loads(cleaned_output.strip())
+            return json_repair.loads(response_text)
 
-        except json.JSONDecodeError:
+        except ValueError:
 
             fix_prompt = f"""
             Your previous response contained formatting errors. Your task is to **fix the JSON formatting** 
@@ -42,13 +58,16 @@ class LLMService:
             ```json
             """
 
-            fixed_response_text = self.query(fix_prompt)
+            fixed_response_text = (query or self.query)(fix_prompt)
 
             try:
                 cleaned_output = clean_json_output(fixed_response_text)
-                return json.loads(cleaned_output.strip())
+                parsed = json.loads(cleaned_output.strip())
+                json_repair.repair_stats.record("llm_fixed")
+                return parsed
             
             except json.JSONDecodeError:
+                json_repair.repair_stats.record("llm_failed")
                 print("LLM 修正 JSON 仍然失敗，回傳預設值")
                 return {}
 
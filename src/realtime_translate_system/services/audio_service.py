@@ -1,4 +1,6 @@
 import os
+import queue
+import threading
 from realtime_translate_system.extensions import socketio
 from realtime_translate_system.config import Language
 from .speech_recongizer import SpeechRecognizer
@@ -27,13 +29,33 @@ class AudioService:
     def process_audio(self, filename):
         filepath = os.path.join(self.upload_folder, filename)
 
+        # ASR 每切出一段就送出翻譯（同時送出的段落會合併成一次 LLM 呼叫），
+        # 另一個執行緒依原順序等待翻譯結果並送出，不必等整個檔案辨識完
+        pending = queue.Queue()
+
         def callback(text):
-            data = self.transcript_service.process(text)
-            if data is not None:
+            future = self.transcript_service.submit(text)
+            if future is not None:
+                pending.put(future)
+
+        def emit_in_order():
+            while (future := pending.get()) is not None:
+                try:
+                    data = self.transcript_service.complete(future)
+                except Exception as e:
+                    print(f"❌ 段落翻譯失敗: {e}")
+                    continue
                 self.transcript_text += data["text"][Language.TW]["value"]
                 socketio.emit("transcript", data, namespace="/audio_stream")
 
-        self.recognizer.transcribe(filepath, callback)
+        emitter = threading.Thread(target=emit_in_order, name="audio-transcript-emitter")
+        emitter.start()
+        try:
+            self.recognizer.transcribe(filepath, callback)
+        finally:
+            pending.put(None)
+            emitter.join()
+
         title, keywords = self.meeting_processor.gen_title_keywords(
             self.transcript_text
         )
@@ -0,0 +1,218 @@
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from typing import Iterator
+
+import numpy as np
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services import json_repair
+
+
+class FakeLLMError(ConnectionError):
+    """FakeLLMService 依 error_rate 注入的錯誤，模擬 Vertex AI 的暫時性失敗"""
+
+
+# 注入的 JSON 格式錯誤，對應 json_repair.REPAIR_CLASSES；"refusal" 無法在本地修復
+MALFORMATIONS = (
+    "fence",
+    "stray_text",
+    "unquoted_keys",
+    "trailing_commas",
+    "smart_quotes",
+    "truncated",
+    "refusal",
+)
+
+_LANGUAGE_TAGS = {Language.TW: "zh", Language.EN: "en", Language.DE: "de", Language.JP: "ja"}
+_WORD = re.compile(r"[A-Za-z][A-Za-z0-9\-/]+|[一-鿿]{2,4}|[゠-ヿ]{2,}")
+
+
+class FakeLLMService:
+    """
+    離線的 `LLMService` 替代品：依提示的種類返回由輸入推導出的合法 JSON
+    （翻譯、批次翻譯、會議標題與關鍵字、查詢解析），其他提示返回摘要文字。
+    延遲、錯誤率與 JSON 格式錯誤皆可設定，同一個 seed 的輸出完全相同。
+    """
+
+    def __init__(
+        self,
+        model_name: str = "fake",
+        latency_median: float = 0.8,
+        latency_sigma: float = 0.4,
+        per_char_latency: float = 0.002,
+        error_rate: float = 0.0,
+        malformed_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        """
+        :param latency_median: 延遲的中位數（秒），延遲為對數常態分布
+        :param latency_sigma: 對數常態分布的 sigma，越大長尾越明顯
+        :param per_char_latency: 每個輸出字元額外的延遲（秒），輸出越長越慢
+        :param error_rate: 拋出 FakeLLMError 的機率
+        :param malformed_rate: 返回格式錯誤 JSON 的機率（隨機選一種 MALFORMATIONS）
+        """
+        self.model_name = model_name
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.per_char_latency = per_char_latency
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def query(self, prompt, generation_config=None) -> str:
+        response, latency = self._respond(prompt)
+        time.sleep(latency)
+        return response
+
+    def query_stream(self, prompt, generation_config=None) -> Iterator[str]:
+        """每段約 8 個字元，延遲平均分攤在各段之間"""
+        response, latency = self._respond(prompt)
+        chunks = [response[i : i + 8] for i in range(0, len(response), 8)] or [""]
+        for chunk in chunks:
+            time.sleep(latency / len(chunks))
+            yield chunk
+
+    def parse_json_response(self, response_text, query=None):
+        """與 `LLMService.parse_json_response()` 相同的流程，修正提示預設同樣由本服務回答"""
+        try:
+            return json_repair.loads(response_text)
+        except ValueError:
+            fixed = (query or self.query)(
+                f"### **Incorrect JSON Output:**\n{response_text.strip()}\n"
+            )
+            try:
+                parsed = json.loads(re.sub(r"^```json\s*|\s*```$", "", fixed.strip()))
+                json_repair.repair_stats.record("llm_fixed")
+                return parsed
+            except json.JSONDecodeError:
+                json_repair.repair_stats.record("llm_failed")
+                print("LLM 修正 JSON 仍然失敗，回傳預設值")
+                return {}
+
+    def _respond(self, prompt) -> tuple:
+        """:return: (回應文字, 延遲秒數)"""
+        if isinstance(prompt, (list, tuple)):
+            prompt = "\n".join(prompt)
+
+        with self._lock:
+            failed = self._random.random() < self.error_rate
+            malformation = (
+                self._random.choice(MALFORMATIONS)
+                if self._random.random() < self.malformed_rate
+                else None
+            )
+            latency = self.latency_median * math.exp(self._random.gauss(0, self.latency_sigma))
+
+        if failed:
+            time.sleep(latency / 2)
+            raise FakeLLMError("Fake LLM: injected 503 Service Unavailable")
+
+        response, is_json = self._render(prompt)
+        if is_json and malformation is not None:
+            response = self._malform(response, malformation)
+        return response, latency + len(response) * self.per_char_latency
+
+    def _render(self, prompt: str) -> tuple:
+        """:return: (回應文字, 是否為 JSON)"""
+        if "### **Incorrect JSON Output:**" in prompt:
+            broken = prompt.rsplit("### **Incorrect JSON Output:**", 1)[1]
+            broken = broken.split("### **Corrected JSON Output:**", 1)[0]
+            try:
+                return self._fenced(json_repair.repair_json(broken)[0]), True
+            except ValueError:
+                return "I'm sorry, I can't fix this output.", False
+
+        if "**Input Sentences:**" in prompt:
+            sentences = json.loads(prompt.rsplit("**Input Sentences:**", 1)[1])
+            return self._fenced([{"id": s["id"], **self._translate(s["sentence"])} for s in sentences]), True
+
+        if "**Input Sentence:**" in prompt:
+            content = prompt.rsplit("**Input Sentence:**", 1)[1].strip()
+            return self._fenced(self._translate(content)), True
+
+        if "Meeting Transcript:" in prompt:
+            transcript = prompt.rsplit("Meeting Transcript:", 1)[1].strip()
+            keywords = self._keywords(transcript, 5)
+            title = "、".join(keywords[:2]) + "會議" if keywords else "未命名會議"
+            return self._fenced({"title": title, "keywords": keywords}), True
+
+        if "**User Query:**" in prompt:
+            query = prompt.rsplit("**User Query:**", 1)[1].strip()
+            return json.dumps({"date": None, "keywords": self._keywords(query, 3)}, ensure_ascii=False), True
+
+        if "### **Meeting Records**" in prompt:
+            records = prompt.rsplit("### **Meeting Records**", 1)[1].split("### **Instructions**", 1)[0]
+            titles = re.findall(r"\*\*Meeting Title:\*\* (.+)", records)
+            return "\n\n".join(f"{title}：本次會議討論了相關議題並達成共識。" for title in titles) or "沒有找到相關的會議。", False
+
+        return "OK", False
+
+    @staticmethod
+    def _translate(content: str) -> dict:
+        """以語言標記代替翻譯，長度與原句相近，便於檢查輸出對應到哪一句"""
+        content = content.strip()
+        return {lang: f"[{tag}] {content}" for lang, tag in _LANGUAGE_TAGS.items()}
+
+    @staticmethod
+    def _keywords(text: str, limit: int) -> list:
+        """出現次數最多的詞（英文單字、2~4 個漢字或片假名詞）"""
+        return [word for word, _ in Counter(_WORD.findall(text)).most_common(limit)]
+
+    @staticmethod
+    def _fenced(data) -> str:
+        return "```json\n" + json.dumps(data, ensure_ascii=False, indent=4) + "\n```"
+
+    def _malform(self, response: str, malformation: str) -> str:
+        """以 LLM 實際會犯的方式破壞 JSON"""
+        if malformation == "fence":
+            return response[: -len("\n```")]
+        if malformation == "stray_text":
+            return "Here is the translation you requested:\n" + response + "\nLet me know if you need anything else."
+        if malformation == "unquoted_keys":
+            return re.sub(r'^(\s*)"([^"]+)":', r"\1\2:", response, flags=re.MULTILINE)
+        if malformation == "trailing_commas":
+            return re.sub(r'"\n(\s*)([}\]])', r'",\n\1\2', response)
+        if malformation == "smart_quotes":
+            return re.sub(r'^(\s*)"([^"]+)": "', r"\1“\2”: “", response, count=1, flags=re.MULTILINE)
+        if malformation == "truncated":
+            with self._lock:
+                cut = self._random.randint(len(response) // 2, len(response) - 5)
+            return response[:cut]
+        return "I'm sorry, but I can't help with that request."
+
+
+class FakeEmbeddingService:
+    """
+    離線的 `EmbeddingService` 替代品：以字元 n-gram 的特徵雜湊產生固定維度的單位向量，
+    同一個 seed 下相同文字的向量完全相同，字面相近的文字餘弦相似度也較高。
+    """
+
+    def __init__(self, model_name: str = "fake", dimensions: int = 768, seed: int = 0):
+        self.model_name = model_name
+        self.dimensions = dimensions
+        self.seed = seed
+
+    def get_embedding(self, text: str, output_dim=768):
+        if isinstance(text, str):
+            text = [text]
+        text = text[0] if text else ""  # 與 EmbeddingService 相同，只取第一段文字
+
+        vector = np.zeros(output_dim)
+        grams = [text[i : i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)] or [""]
+        for gram in grams:
+            digest = hashlib.blake2b(
+                gram.encode("utf-8"), digest_size=8, key=str(self.seed).encode()
+            ).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % output_dim] += 1.0 if value >> 63 else -1.0
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+        return vector.tolist()
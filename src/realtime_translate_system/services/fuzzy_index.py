@@ -0,0 +1,84 @@
+import math
+from collections import Counter, defaultdict
+from typing import Iterable, List
+
+import Levenshtein
+
+
+def _char_elements(text: str) -> list:
+    """把字串轉成 (字元, 第幾次出現) 的列表，讓集合交集等同多重集合交集"""
+    seen = Counter()
+    elements = []
+    for char in text:
+        seen[char] += 1
+        elements.append((char, seen[char]))
+    return elements
+
+
+class FuzzyTermIndex:
+    """
+    預先建立的模糊比對索引，依術語長度分桶的字元倒排索引。
+
+    `fuzz.ratio` 為 2 * LCS / (len1 + len2)，要達到閥值時：
+    1. 術語長度必須落在與 token 長度相關的區間內（長度過濾）；
+    2. 兩者共同字元數至少要有 o 個，因此只要查詢 token 中
+       最稀有的 len(token) - o + 1 個字元的倒排列表即可（前綴過濾）。
+    篩出的候選再以 `Levenshtein.ratio` 驗證，最後交由 `fuzz.ratio` 排序，
+    結果與逐一比對所有術語完全相同。
+    """
+
+    def __init__(self, terms: Iterable[str], threshold: int):
+        """
+        :param terms: 術語列表（順序即同分時的優先順序）
+        :param threshold: 相似度閥值 (0-100)，與 `fuzz.ratio` 的分數相同尺度
+        """
+        self.terms = [term for term in terms if isinstance(term, str) and term]
+        self.threshold = threshold
+        # fuzz.ratio 會四捨五入成整數，以 threshold - 0.5 作為下界才不會漏掉候選
+        self._min_ratio = max(threshold - 0.5, 0) / 100
+        self._postings = defaultdict(list)  # {(術語長度, 字元元素): [術語索引]}
+        self._lengths = set()
+
+        for index, term in enumerate(self.terms):
+            self._lengths.add(len(term))
+            for element in _char_elements(term):
+                self._postings[(len(term), element)].append(index)
+
+    def _length_range(self, length: int) -> range:
+        """相似度要達到閥值時，術語長度可能的範圍"""
+        ratio = self._min_ratio
+        low = math.ceil(length * ratio / (2 - ratio))
+        high = math.floor(length * (2 - ratio) / ratio)
+        return range(max(low, 1), high + 1)
+
+    def candidates(self, token: str) -> List[str]:
+        """
+        返回所有可能達到閥值的術語，依原始順序排列。
+        :param token: 待比對的詞彙
+        """
+        if not token:
+            return []
+        if self._min_ratio <= 0:
+            return list(self.terms)
+
+        elements = _char_elements(token)
+        found = set()
+        for length in self._length_range(len(token)):
+            if length not in self._lengths:
+                continue
+            min_overlap = math.ceil(self._min_ratio * (length + len(token)) / 2 - 1e-9)
+            if min_overlap > min(length, len(token)):
+                continue
+            postings = sorted(
+                (self._postings.get((length, element), ()) for element in elements),
+                key=len,
+            )
+            for posting in postings[: len(token) - min_overlap + 1]:
+                found.update(posting)
+
+        min_ratio = self._min_ratio - 1e-9
+        return [
+            self.terms[index]
+            for index in sorted(found)
+            if Levenshtein.ratio(token, self.terms[index]) >= min_ratio
+        ]
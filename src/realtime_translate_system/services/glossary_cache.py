@@ -0,0 +1,155 @@
+import hashlib
+import json
+import marshal
+import os
+import pickle
+import struct
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import jieba
+
+
+GLOSSARY_CACHE_FORMAT = 2
+GLOSSARY_CACHE_FILE = "glossary.bin"  # 術語陣列、說明與預先建立的比對索引
+JIEBA_CACHE_FILE = "jieba.cache"  # 已加入術語的 jieba 前綴詞典（jieba 原生快取格式）
+
+_MAGIC = b"RTGLOSS\0"
+_META_LENGTH = struct.Struct("<I")
+
+
+def _source_digest(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _environment() -> dict:
+    """影響快取內容的執行環境：pickle/marshal 與 jieba 詞典版本不同時快取即失效"""
+    return {
+        "format": GLOSSARY_CACHE_FORMAT,
+        "python": "%d.%d" % sys.version_info[:2],
+        "jieba": jieba.__version__,
+    }
+
+
+@contextmanager
+def _atomic_write(path: Path):
+    """先寫入暫存檔再替換，執行中的行程不會讀到寫到一半的檔案"""
+    temp_path = path.with_name(path.name + ".tmp")
+    with open(temp_path, "wb") as f:
+        yield f
+    os.replace(temp_path, path)
+
+
+def load_compiled_glossary(cache_dir, file_paths: dict) -> Optional[dict]:
+    """
+    讀取預先編譯的術語表（pickle 反序列化，每個行程各有一份），
+    CSV 內容與編譯時不同或檔案不存在時返回 None。
+    :param cache_dir: `compile_glossaries()` 的輸出資料夾
+    :param file_paths: 字典 { "語言名稱": "對應的 CSV 路徑" }，可以只是編譯時的部分語言
+    :return: {"terms", "descriptions", "indexes", "jieba_cache"}，皆只包含 file_paths 中的語言
+    """
+    cache_path = Path(cache_dir) / GLOSSARY_CACHE_FILE
+    try:
+        with open(cache_path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            (meta_length,) = _META_LENGTH.unpack(f.read(_META_LENGTH.size))
+            meta = json.loads(f.read(meta_length))
+
+            # 先只比對檔頭的 CSV 摘要，過期時不必讀取與反序列化整個檔案
+            sources = meta["sources"]
+            if meta["environment"] != _environment() or any(
+                sources.get(lang) != _source_digest(path)
+                for lang, path in file_paths.items()
+            ):
+                return None
+
+            compiled = pickle.load(f)
+    except (OSError, ValueError, KeyError, EOFError, struct.error, pickle.UnpicklingError):
+        return None
+
+    jieba_cache = Path(cache_dir) / JIEBA_CACHE_FILE
+    return {
+        "terms": {lang: compiled["terms"][lang] for lang in file_paths},
+        "descriptions": {lang: compiled["descriptions"][lang] for lang in file_paths},
+        "indexes": {lang: compiled["indexes"][lang] for lang in file_paths},
+        "jieba_cache": str(jieba_cache) if jieba_cache.is_file() else None,
+    }
+
+
+def load_jieba_dictionary(path, tokenizer: jieba.Tokenizer) -> bool:
+    """
+    載入編譯好的 jieba 前綴詞典，取代 `tokenizer.initialize()`。
+    jieba 內建的 `marshal.load(file)` 會分段讀檔，比一次讀入後 `marshal.loads` 慢數倍。
+    :return: 是否載入成功
+    """
+    try:
+        with open(path, "rb") as f:
+            freq, total = marshal.loads(f.read())
+    except (OSError, ValueError, EOFError, TypeError):
+        return False
+
+    with tokenizer.lock:
+        tokenizer.FREQ, tokenizer.total = freq, total
+        tokenizer.initialized = True
+    return True
+
+
+def compile_glossaries(file_paths: dict, cache_dir, threshold: int) -> Path:
+    """
+    將術語表 CSV 編譯成啟動時可直接載入的檔案（不必再解析 CSV 與建立索引），建置映像檔時執行一次。
+    :param file_paths: 字典 { "語言名稱": "對應的 CSV 路徑" }
+    :param cache_dir: 輸出資料夾
+    :param threshold: TermMatcher 的相似度閥值，模糊比對索引依此建立
+    :return: 編譯後的術語表路徑
+    """
+    # 避免與 term_matcher / glossary_registry 互相 import
+    from realtime_translate_system.services.glossary_registry import GlossaryRegistry
+    from realtime_translate_system.services.term_matcher import TermMatcher, _LanguageIndex
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    snapshot = GlossaryRegistry(file_paths).snapshot
+    compiled = {
+        "terms": {lang: snapshot.terms(lang) for lang in snapshot.languages},
+        "descriptions": {lang: snapshot.descriptions(lang) for lang in snapshot.languages},
+        "indexes": {
+            lang: _LanguageIndex(snapshot.term_dict(lang), threshold, snapshot.version)
+            for lang in snapshot.languages
+        },
+    }
+    meta = {
+        "environment": _environment(),
+        "sources": {lang: _source_digest(path) for lang, path in file_paths.items()},
+    }
+
+    # 以全新的分詞器依 TermMatcher 相同的順序加入術語，直接存成 jieba 的快取格式
+    tokenizer = jieba.Tokenizer()
+    if "Traditional Chinese" in snapshot.languages:
+        for term in TermMatcher._jieba_terms(snapshot.term_dict("Traditional Chinese")):
+            tokenizer.add_word(term)
+    else:
+        tokenizer.initialize()
+    with _atomic_write(cache_dir / JIEBA_CACHE_FILE) as f:
+        marshal.dump((tokenizer.FREQ, tokenizer.total), f)
+
+    meta_bytes = json.dumps(meta).encode("utf-8")
+    with _atomic_write(cache_dir / GLOSSARY_CACHE_FILE) as f:
+        f.write(_MAGIC)
+        f.write(_META_LENGTH.pack(len(meta_bytes)))
+        f.write(meta_bytes)
+        pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return cache_dir / GLOSSARY_CACHE_FILE
+
+
+if __name__ == "__main__":
+    from realtime_translate_system.config import Config
+
+    path = compile_glossaries(
+        Config.FILE_PATHS, Config.GLOSSARY_CACHE_DIR, Config.TERM_MATCHER_THRESHOLD
+    )
+    print(f"✅ 術語表已編譯至 {path}")
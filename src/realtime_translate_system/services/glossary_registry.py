@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import threading
+from functools import cached_property
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Tuple
+
+from realtime_translate_system.services.glossary_cache import load_compiled_glossary
+
+
+class GlossarySnapshot:
+    """
+    某一版本術語表的唯讀檢視。
+    各語言的術語與說明以 tuple 儲存，且同一列在不同語言間互相對應。
+    """
+
+    def __init__(
+        self,
+        version: int,
+        terms: Dict[str, Tuple[str, ...]],
+        descriptions: Dict[str, Tuple[str, ...]],
+        compiled_indexes: dict = None,
+        jieba_cache: str = None,
+    ):
+        """
+        :param compiled_indexes: 從預先編譯的術語表載入的比對索引 { "語言名稱": 索引 }
+        :param jieba_cache: 預先加入術語的 jieba 詞典快取路徑
+        """
+        self.version = version
+        self._terms = terms
+        self._descriptions = descriptions
+        self.compiled_indexes = compiled_indexes or {}
+        self.jieba_cache = jieba_cache
+        self._term_rows = {
+            lang: MappingProxyType(self._build_term_rows(terms[lang])) for lang in terms
+        }
+        self._term_dicts = {
+            lang: MappingProxyType(
+                {term: descriptions[lang][row] for term, row in self._term_rows[lang].items()}
+            )
+            for lang in terms
+        }
+
+    @staticmethod
+    def _build_term_rows(terms: tuple) -> dict:
+        term_rows = {}
+        for row, term in enumerate(terms):
+            if term:
+                term_rows.setdefault(term, row)
+        return term_rows
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """術語表內容的雜湊。版本號每次啟動都從 1 開始，跨行程的快取要以內容判斷是否相同"""
+        content = json.dumps([self._terms, self._descriptions], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    @property
+    def languages(self) -> tuple:
+        return tuple(self._terms)
+
+    def __len__(self) -> int:
+        """術語表列數（以第一個語言為準）"""
+        return len(next(iter(self._terms.values()), ()))
+
+    def terms(self, lang: str) -> Tuple[str, ...]:
+        """該語言的術語，順序與 CSV 相同，缺漏的欄位為空字串"""
+        return self._terms[lang]
+
+    def descriptions(self, lang: str) -> Tuple[str, ...]:
+        """該語言的術語說明，與 `terms(lang)` 逐列對應"""
+        return self._descriptions[lang]
+
+    def term_rows(self, lang: str) -> Mapping[str, int]:
+        """唯讀的 { 術語: 列號 }，可用列號取得同一術語在其他語言的寫法"""
+        return self._term_rows[lang]
+
+    def term_dict(self, lang: str) -> Mapping[str, str]:
+        """唯讀的 { 術語: 說明 } 字典，重複的術語以第一次出現為準"""
+        return self._term_dicts[lang]
+
+
+class GlossaryRegistry:
+    """
+    全行程共用的企業術語表，只在啟動時讀取一次 CSV。
+    CSV 更新時可重新載入，新版本會整個替換掉舊版本，讀取端不會看到載入到一半的狀態。
+    """
+
+    def __init__(self, file_paths: dict, watch_interval: float = None, cache_dir=None):
+        """
+        :param file_paths: 字典 { "語言名稱": "對應的 CSV 路徑" }
+        :param watch_interval: 檢查 CSV 是否變更的間隔（秒），None 表示不自動檢查
+        :param cache_dir: 預先編譯的術語表資料夾，與 CSV 內容一致時直接載入而不解析 CSV
+        """
+        self.file_paths = dict(file_paths)
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._mtimes = {}
+        self._snapshot = None
+        self._stop_watching = threading.Event()
+
+        self.reload()
+
+        if watch_interval:
+            self._start_watching(watch_interval)
+
+    @property
+    def snapshot(self) -> GlossarySnapshot:
+        """目前版本的術語表"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def subscribe(self, callback: Callable[[GlossarySnapshot], None]) -> None:
+        """註冊術語表更新時要呼叫的函式，參數為新版本的術語表"""
+        self._subscribers.append(callback)
+
+    def _read_csv(self, path) -> Tuple[tuple, tuple]:
+        """讀取 CSV，統一去除欄位名稱與術語前後的空白（例如 `"Proper Noun "`）"""
+        import pandas as pd  # 載入預先編譯的術語表時不需要 pandas
+
+        glossaries = pd.read_csv(path)
+        glossaries.columns = glossaries.columns.str.strip()
+        terms = glossaries["Proper Noun"].fillna("").astype(str).str.strip()
+        descriptions = glossaries["Description"].fillna("").astype(str)
+        return tuple(terms), tuple(descriptions)
+
+    def _current_mtimes(self) -> dict:
+        return {lang: os.stat(path).st_mtime_ns for lang, path in self.file_paths.items()}
+
+    def reload(self) -> GlossarySnapshot:
+        """重新讀取所有 CSV 並替換成新版本，完成後通知訂閱者"""
+        with self._lock:
+            mtimes = self._current_mtimes()
+            version = self._snapshot.version + 1 if self._snapshot else 1
+
+            compiled = None
+            if self.cache_dir:
+                compiled = load_compiled_glossary(self.cache_dir, self.file_paths)
+                if compiled is None:
+                    print("⚠️ 預先編譯的術語表不存在或已過期，改為讀取 CSV")
+
+            if compiled:
+                snapshot = GlossarySnapshot(
+                    version,
+                    compiled["terms"],
+                    compiled["descriptions"],
+                    compiled_indexes=compiled["indexes"],
+                    jieba_cache=compiled["jieba_cache"],
+                )
+            else:
+                terms, descriptions = {}, {}
+                for lang, path in self.file_paths.items():
+                    terms[lang], descriptions[lang] = self._read_csv(path)
+                snapshot = GlossarySnapshot(version, terms, descriptions)
+            self._mtimes = mtimes
+            self._snapshot = snapshot
+
+        for callback in list(self._subscribers):
+            callback(snapshot)
+        return snapshot
+
+    def reload_if_changed(self) -> bool:
+        """任一 CSV 的修改時間改變時重新載入，返回是否有重新載入"""
+        try:
+            changed = self._current_mtimes() != self._mtimes
+        except FileNotFoundError:
+            return False  # 檔案正在被替換，下次再檢查
+        if changed:
+            self.reload()
+        return changed
+
+    def _start_watching(self, interval: float) -> None:
+        def watch():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as e:
+                    print(f"❌ 重新載入術語表失敗: {e}")
+
+        threading.Thread(target=watch, name="glossary-watcher", daemon=True).start()
+
+    def close(self) -> None:
+        """停止自動檢查 CSV 變更"""
+        self._stop_watching.set()
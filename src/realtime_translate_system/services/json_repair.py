@@ -0,0 +1,239 @@
+import itertools
+import json
+import re
+import threading
+from typing import Any, List, Tuple
+
+
+# 修復類別，回報時依此順序排列
+REPAIR_CLASSES = (
+    "fence",  # ```json 標記沒有成對或前後還有其他 ``` 區塊
+    "stray_text",  # JSON 前後夾雜說明文字
+    "control_characters",  # 字串中直接換行或 tab
+    "smart_quotes",  # 以 “ ” 當作 JSON 的引號
+    "unquoted_keys",  # 提示範例中的 {Language.TW}: 沒有引號
+    "trailing_commas",
+    "truncated",  # 輸出被截斷，缺少結尾的引號或括號
+)
+
+_DECODER = json.JSONDecoder(strict=False)
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|$)", re.DOTALL | re.IGNORECASE)
+_STRING = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+_SMART_QUOTE = re.compile(r"(?<=[{\[,:])(\s*)[“”„‟]|[“”„‟](\s*)(?=[:,}\]])")
+_UNQUOTED_KEY = re.compile(r"([{,]\s*)([^\s\"{}\[\],:][^\"{}\[\],:]*?)\s*:")
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+
+
+def _replace_smart_quote(match: re.Match) -> str:
+    if match.group(1) is not None:
+        return f'{match.group(1)}"'
+    return f'"{match.group(2)}'
+
+
+# 依序嘗試的修復。smart_quotes 先只替換既有 "..." 字串以外、位於 JSON 分隔符號旁的 „ “ ”，
+# 德文翻譯中的 „bis morgen“ 不受影響；仍無法解析時（例如 "English”: “Okay” 這種開頭與結尾
+# 引號不同的鍵值）才替換所有位於分隔符號旁的 „ “ ”
+_TRANSFORMS = (
+    ("smart_quotes", lambda s: _outside_strings(s, _SMART_QUOTE, _replace_smart_quote)),
+    ("smart_quotes", lambda s: _SMART_QUOTE.sub(_replace_smart_quote, s)),
+    ("unquoted_keys", lambda s: _outside_strings(s, _UNQUOTED_KEY, r'\1"\2":')),
+    ("trailing_commas", lambda s: _outside_strings(s, _TRAILING_COMMA, r"\1")),
+)
+
+
+class JSONRepairStats:
+    """
+    LLM 回應的 JSON 解析統計：不需修復、各修復類別、本地修復失敗，
+    以及最後送回 LLM 修正的成功與失敗次數。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("ok", *REPAIR_CLASSES, "failed", "llm_fixed", "llm_failed"), 0
+        )
+
+    def record(self, *names: str) -> None:
+        with self._lock:
+            for name in names:
+                self._counters[name] += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+
+# 全行程共用，由 /api/health/metrics 回報
+repair_stats = JSONRepairStats()
+
+
+def _outside_strings(text: str, pattern: re.Pattern, repl) -> str:
+    """只在字串常值以外套用取代，避免改到翻譯內容"""
+    parts = []
+    pos = 0
+    for match in _STRING.finditer(text):
+        parts.append(pattern.sub(repl, text[pos : match.start()]))
+        parts.append(match.group())
+        pos = match.end()
+    parts.append(pattern.sub(repl, text[pos:]))
+    return "".join(parts)
+
+
+def _json_span(text: str) -> Tuple[int, int, bool]:
+    """
+    第一個 `{` 或 `[` 到與其對應的結尾括號，輸出被截斷時到文字結束。
+    :return: (開始位置, 結束位置, 是否找到對應的結尾括號)
+    """
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON object or array in response")
+    start = min(starts)
+
+    depth = 0
+    in_string = escape = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return start, i + 1, True
+    return start, len(text), False
+
+
+def _close_truncated(text: str) -> List[str]:
+    """
+    被截斷的 JSON 的候選修復：直接補上結尾括號，
+    或退回最後一個完整的欄位（最後一個逗號之前）再補括號，不保留寫到一半的翻譯。
+    """
+    stack = []
+    in_string = escape = False
+    last_comma = None  # (位置, 當時尚未關閉的括號)
+    for i, char in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if stack:
+                stack.pop()
+        elif char == ",":
+            last_comma = (i, list(stack))
+
+    candidates = []
+    if not in_string and stack:
+        candidates.append(text + "".join(reversed(stack)))
+    if last_comma is not None:
+        i, open_brackets = last_comma
+        candidates.append(text[:i] + "".join(reversed(open_brackets)))
+    return candidates
+
+
+def _parse(candidate: str) -> Tuple[Any, List[str]]:
+    """:return: (解析結果, 額外用到的修復類別)"""
+    try:
+        return json.loads(candidate), []
+    except json.JSONDecodeError:
+        return _DECODER.decode(candidate), ["control_characters"]
+
+
+def _ordered(repairs: List[str]) -> List[str]:
+    """去除重複並依 REPAIR_CLASSES 的順序排列"""
+    return sorted(set(repairs), key=REPAIR_CLASSES.index)
+
+
+def _transform_combinations(candidate: str):
+    """
+    依序產生 (套用修復後的文字, 用到的修復類別)：不修復、單一修復、再到多種修復的組合。
+    沒有改變文字的修復不列入組合。
+    """
+    for size in range(len(_TRANSFORMS) + 1):
+        for combination in itertools.combinations(_TRANSFORMS, size):
+            transformed = candidate
+            for _, transform in combination:
+                repaired = transform(transformed)
+                if repaired == transformed:
+                    break
+                transformed = repaired
+            else:
+                yield transformed, [name for name, _ in combination]
+
+
+def repair_json(text: str) -> Tuple[Any, List[str]]:
+    """
+    在本地修復常見的 JSON 格式錯誤，一能解析就返回。
+    先嘗試單一修復再嘗試組合；只有輸出確實被截斷（括號或字串沒有關閉）時才捨棄寫到一半的欄位。
+    :return: (解析結果, 用到的修復類別)
+    :raises ValueError: 本地無法修復
+    """
+    repairs = []
+    candidate = text.strip()
+
+    fenced = _FENCE.search(candidate)
+    if fenced and re.search(r"[{\[]", fenced.group(1)):
+        if candidate[: fenced.start()].strip() or candidate[fenced.end() :].strip():
+            repairs.append("stray_text")
+        if fenced.group(0).count("```") < 2:
+            repairs.append("fence")
+        candidate = fenced.group(1)
+    elif "```" in candidate:
+        repairs.append("fence")
+        candidate = re.sub(r"```(?:json)?", "", candidate, flags=re.IGNORECASE)
+
+    start, end, closed = _json_span(candidate)
+    if candidate[:start].strip() or candidate[end:].strip():
+        repairs.append("stray_text")
+    candidate = candidate[start:end]
+
+    # 先逐一嘗試單一修復，仍無法解析才組合多種修復，避免用不到的修復改動內容
+    for transformed, applied in _transform_combinations(candidate):
+        try:
+            parsed, extra = _parse(transformed)
+        except ValueError:
+            continue
+        return parsed, _ordered(repairs + applied + extra)
+
+    # 括號都已關閉的輸出不是被截斷，不能用捨棄欄位的方式「修復」
+    if closed:
+        raise ValueError("Unable to repair JSON response")
+
+    for transformed, applied in _transform_combinations(candidate):
+        for truncated in _close_truncated(transformed):
+            try:
+                parsed, extra = _parse(_outside_strings(truncated, _TRAILING_COMMA, r"\1"))
+            except ValueError:
+                continue
+            return parsed, _ordered(repairs + applied + extra + ["truncated"])
+
+    raise ValueError("Unable to repair JSON response")
+
+
+def loads(text: str) -> Any:
+    """
+    解析 LLM 回應中的 JSON，格式錯誤時先在本地修復，並記錄到 `repair_stats`。
+    :raises ValueError: 本地無法修復（呼叫端可再請 LLM 修正）
+    """
+    try:
+        parsed, repairs = repair_json(text)
+    except ValueError:
+        repair_stats.record("failed")
+        raise
+    repair_stats.record(*(repairs or ["ok"]))
+    return parsed
@@ -0,0 +1,141 @@
+import json
+from typing import List, Optional, Tuple
+
+
+_DECODER = json.JSONDecoder(strict=False)  # LLM 偶爾會在字串中直接換行
+_SKIPPED = object()
+
+
+def _string_end(buffer: str, start: int) -> int:
+    """`buffer[start]` 為開頭的引號，返回結尾引號的位置，字串還沒結束時返回 -1"""
+    i = start + 1
+    while i < len(buffer):
+        char = buffer[i]
+        if char == "\\":
+            i += 2
+            continue
+        if char == '"':
+            return i
+        i += 1
+    return -1
+
+
+def _container_end(buffer: str, start: int) -> int:
+    """`buffer[start]` 為 `{` 或 `[`，返回對應的結尾位置，還沒結束時返回 -1"""
+    depth = 0
+    i = start
+    while i < len(buffer):
+        char = buffer[i]
+        if char == '"':
+            i = _string_end(buffer, i)
+            if i < 0:
+                return -1
+        elif char in "{[":
+            depth += 1
+        elif char in "}]":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return -1
+
+
+def _decode_string(raw: str) -> str:
+    try:
+        return _DECODER.decode(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+class IncrementalJSONObjectParser:
+    """
+    逐段餵入 LLM 的串流輸出，最外層物件的每個字串欄位一結束就返回 (鍵, 值)，
+    不必等整個 JSON 產生完畢。容許 ```json 標記與沒有引號的鍵（提示範例即為此格式），
+    非字串的值會略過；格式無法辨識時停止解析，由呼叫端以完整回應重新解析。
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0  # 下一個欄位開始掃描的位置
+        self._started = False
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        :param chunk: 新產生的一段文字
+        :return: 這段文字中完成的 (鍵, 字串值)
+        """
+        self._buffer += chunk
+        pairs = []
+        while not self.done:
+            pair = self._next_pair()
+            if pair is None:
+                break
+            if pair is not _SKIPPED:
+                pairs.append(pair)
+        return pairs
+
+    def _skip(self, i: int, chars: str) -> int:
+        while i < len(self._buffer) and self._buffer[i] in chars:
+            i += 1
+        return i
+
+    def _next_pair(self) -> Optional[object]:
+        """解析下一個欄位，資料還不完整時返回 None 並於下次從同一位置重新掃描"""
+        buffer = self._buffer
+        if not self._started:
+            start = buffer.find("{", self._pos)
+            if start < 0:
+                return None
+            self._started = True
+            self._pos = start + 1
+
+        i = self._skip(self._pos, " \t\r\n,")
+        if i >= len(buffer):
+            return None
+        if buffer[i] == "}":
+            self.done = True
+            return None
+
+        # 鍵
+        if buffer[i] == '"':
+            end = _string_end(buffer, i)
+            if end < 0:
+                return None
+            key = _decode_string(buffer[i + 1 : end])
+            i = self._skip(end + 1, " \t\r\n")
+        else:
+            end = buffer.find(":", i)
+            if end < 0:
+                return None
+            key = buffer[i:end].strip()
+            i = end
+        if i >= len(buffer):
+            return None
+        if buffer[i] != ":":
+            self.done = True
+            return None
+
+        # 值
+        i = self._skip(i + 1, " \t\r\n")
+        if i >= len(buffer):
+            return None
+        if buffer[i] == '"':
+            end = _string_end(buffer, i)
+            if end < 0:
+                return None
+            self._pos = end + 1
+            return key, _decode_string(buffer[i + 1 : end])
+        if buffer[i] in "{[":
+            end = _container_end(buffer, i)
+            if end < 0:
+                return None
+            self._pos = end + 1
+            return _SKIPPED
+
+        # 數字、true/false/null：到下一個逗號或物件結尾為止
+        ends = [position for position in (buffer.find(",", i), buffer.find("}", i)) if position >= 0]
+        if not ends:
+            return None
+        self._pos = min(ends)
+        return _SKIPPED
@@ -0,0 +1,324 @@
+import contextvars
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from realtime_translate_system.services.ai_service import LLMService
+
+
+_session = contextvars.ContextVar("llm_session", default=None)
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def llm_session(session_id):
+    """
+    標記這段程式碼中的 LLM 呼叫屬於哪個連線，
+    `LLMClient` 依此限制單一連線同時進行的呼叫數，避免一個講者占滿所有名額。
+    """
+    token = _session.set(session_id)
+    try:
+        yield
+    finally:
+        _session.reset(token)
+
+
+class llm_deadline:
+    """
+    在 `with` 中經由 `LLMClient` 的呼叫共用一個期限，後面的呼叫只能使用剩下的時間，
+    例如翻譯請求與之後請 LLM 修正 JSON 格式的請求。同一個物件可以多次進入，
+    產生器在 `yield` 之間進入即可，不必讓標記跨過 `yield` 留在呼叫端。
+    """
+
+    def __init__(self, seconds: float = None):
+        """:param seconds: 期限（秒），None 表示從第一次呼叫開始計算，長度為該 `LLMClient` 的預設期限"""
+        self.deadline_at = None if seconds is None else time.monotonic() + seconds
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_deadline.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        _deadline.reset(self._tokens.pop())
+
+
+class LLMClient:
+    """
+    包裝 `LLMService`，提供相同的 `query()` / `query_stream()` / `parse_json_response()`：
+    - 全域與單一連線的並行數上限
+    - 每次呼叫的期限（deadline），逾時拋出 TimeoutError
+    - 失敗時以隨機抖動的指數退避重試
+    - 對沖請求（hedging）：超過近期 p95 延遲仍未回應時再送一次，取先回來的結果
+    - `parse_json_response()` 請 LLM 修正格式時同樣經過上述限制
+    `submit()` 返回 Future，呼叫端不必等待。
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        max_concurrency: int = 8,
+        session_concurrency: int = 2,
+        deadline: float = 15.0,
+        max_retries: int = 2,
+        retry_base_delay: float = 0.2,
+        retry_max_delay: float = 2.0,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+    ):
+        """
+        :param max_concurrency: 全域同時進行的 LLM 請求數上限（含對沖請求）
+        :param session_concurrency: 單一連線同時進行的呼叫數上限
+        :param deadline: 預設的呼叫期限（秒），包含等待名額、重試與對沖
+        :param max_retries: 失敗後最多重試幾次
+        :param retry_base_delay: 第一次重試前的最長等待（秒），之後每次加倍
+        :param retry_max_delay: 重試等待的上限（秒）
+        :param hedge: 是否啟用對沖請求
+        :param hedge_quantile: 等待超過近期延遲的這個分位數就送出對沖請求
+        :param hedge_min_samples: 累積這麼多筆延遲後才開始對沖
+        """
+        self.llm_service = llm_service
+        self.session_concurrency = session_concurrency
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._session_slots = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=500)  # 近期成功請求的延遲（秒），決定對沖門檻
+        self._stream_latencies = deque(maxlen=500)  # 串流從送出到輸出結束的時間，不影響對沖
+        self._counters = dict.fromkeys(
+            ("calls", "retries", "timeouts", "failures", "hedges", "hedges_won"), 0
+        )
+        self._in_flight = 0
+
+        # 請求在 worker 中執行，呼叫端才能依期限放棄等待；對沖請求需要額外的 worker
+        self._workers = ThreadPoolExecutor(
+            max_workers=max_concurrency * 2, thread_name_prefix="llm-request"
+        )
+        self._callers = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="llm-call"
+        )
+
+    def submit(self, prompt, generation_config=None, deadline: float = None) -> Future:
+        """非同步版本的 `query()`"""
+        context = contextvars.copy_context()  # 保留呼叫端的連線標記
+        return self._callers.submit(context.run, self.query, prompt, generation_config, deadline)
+
+    def query(self, prompt, generation_config=None, deadline: float = None) -> str:
+        """
+        與 `LLMService.query()` 相同，但有並行數上限、期限、重試與對沖。
+        :param deadline: 這次呼叫的期限（秒），None 時使用預設值
+        :raises TimeoutError: 超過期限
+        """
+        deadline_at = self._deadline_at(deadline)
+        self._count("calls")
+        with self._session_slot(deadline_at):
+            attempt = 0
+            while True:
+                try:
+                    return self._hedged_request(prompt, generation_config, deadline_at)
+                except TimeoutError:
+                    self._count("timeouts")
+                    raise
+                except ValueError:
+                    self._count("failures")
+                    raise  # 模型拒絕回答等，重試也不會成功
+                except Exception as e:
+                    attempt += 1
+                    delay = self._retry_delay(attempt)
+                    if attempt > self.max_retries or time.monotonic() + delay >= deadline_at:
+                        self._count("failures")
+                        raise
+                    print(f"⚠️ LLM 請求失敗，{delay:.2f} 秒後重試（第 {attempt} 次）: {e}")
+                    self._count("retries")
+                    time.sleep(delay)
+
+    def query_stream(self, prompt, generation_config=None, deadline: float = None) -> Iterator[str]:
+        """
+        與 `LLMService.query_stream()` 相同。期限與重試只適用於收到第一段文字之前，
+        開始輸出後就不能再換成另一個請求；串流不做對沖。
+        """
+        deadline_at = self._deadline_at(deadline)
+        self._count("calls")
+        with self._session_slot(deadline_at), self._request_slot(deadline_at):
+            attempt = 0
+            while True:
+                stream = iter(self.llm_service.query_stream(prompt, generation_config))
+                start = time.perf_counter()
+                first_chunk = self._workers.submit(next, stream, None)
+                try:
+                    chunk = first_chunk.result(timeout=max(deadline_at - time.monotonic(), 0))
+                    break
+                except FutureTimeoutError:
+                    self._count("timeouts")
+                    raise TimeoutError("LLM 串流逾時，尚未收到任何輸出")
+                except ValueError:
+                    self._count("failures")
+                    raise
+                except Exception as e:
+                    attempt += 1
+                    delay = self._retry_delay(attempt)
+                    if attempt > self.max_retries or time.monotonic() + delay >= deadline_at:
+                        self._count("failures")
+                        raise
+                    print(f"⚠️ LLM 串流請求失敗，{delay:.2f} 秒後重試（第 {attempt} 次）: {e}")
+                    self._count("retries")
+                    time.sleep(delay)
+
+            if chunk is not None:
+                yield chunk
+                yield from stream
+            with self._lock:
+                self._stream_latencies.append(time.perf_counter() - start)
+
+    def parse_json_response(self, response_text):
+        """與 `LLMService.parse_json_response()` 相同，請 LLM 修正格式時經由 `query()` 呼叫"""
+        return self.llm_service.parse_json_response(response_text, query=self.query)
+
+    def _hedged_request(self, prompt, generation_config, deadline_at: float) -> str:
+        """送出請求，超過對沖門檻仍未回應時再送一次，返回先成功的結果"""
+        primary = self._workers.submit(self._request, prompt, generation_config, deadline_at)
+        pending = {primary}
+        hedge = None
+
+        hedge_delay = self._hedge_delay()
+        if hedge_delay is not None:
+            done, _ = wait(pending, timeout=min(hedge_delay, max(deadline_at - time.monotonic(), 0)))
+            # 只在有空閒名額時對沖，不為了對沖而排隊，避免尖峰時放大負載
+            if not done and time.monotonic() < deadline_at and self._slots.acquire(blocking=False):
+                self._count("hedges")
+                hedge = self._workers.submit(
+                    self._request, prompt, generation_config, deadline_at, True
+                )
+                pending.add(hedge)
+
+        error = None
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=max(deadline_at - time.monotonic(), 0),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                raise TimeoutError("LLM 請求逾時")
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        self._count("hedges_won")
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def _request(self, prompt, generation_config, deadline_at: float, acquired: bool = False) -> str:
+        """在 worker 中執行一次請求，占用一個全域名額直到請求真正結束"""
+        if not acquired and not self._slots.acquire(timeout=max(deadline_at - time.monotonic(), 0)):
+            raise TimeoutError("等待 LLM 並行名額逾時")
+        with self._lock:
+            self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            response = self.llm_service.query(prompt, generation_config)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+        self._record_latency(time.perf_counter() - start)
+        return response
+
+    @contextmanager
+    def _request_slot(self, deadline_at: float):
+        """在呼叫端占用一個全域名額（串流請求用）"""
+        if not self._slots.acquire(timeout=max(deadline_at - time.monotonic(), 0)):
+            self._count("timeouts")
+            raise TimeoutError("等待 LLM 並行名額逾時")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+    @contextmanager
+    def _session_slot(self, deadline_at: float):
+        """占用目前連線的名額，沒有標記連線時不限制"""
+        session_id = _session.get()
+        if session_id is None:
+            yield
+            return
+
+        with self._lock:
+            slots = self._session_slots.get(session_id)
+            if slots is None:
+                slots = threading.BoundedSemaphore(self.session_concurrency)
+                self._session_slots[session_id] = slots
+        if not slots.acquire(timeout=max(deadline_at - time.monotonic(), 0)):
+            self._count("timeouts")
+            raise TimeoutError("等待連線的 LLM 名額逾時")
+        try:
+            yield
+        finally:
+            slots.release()
+
+    def _deadline_at(self, deadline: Optional[float]) -> float:
+        """這次呼叫的期限（monotonic 時間），在 `llm_deadline()` 中不超過共用的期限"""
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        shared = _deadline.get()
+        if shared is None:
+            return deadline_at
+        if shared.deadline_at is None:
+            shared.deadline_at = deadline_at
+        return min(deadline_at, shared.deadline_at)
+
+    def _retry_delay(self, attempt: int) -> float:
+        """full jitter：在 0 到指數退避上限之間隨機等待，避免多個請求同時重試"""
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+
+    def _hedge_delay(self) -> Optional[float]:
+        """近期延遲的 hedge_quantile 分位數，樣本不足或未啟用時返回 None"""
+        if not self.hedge:
+            return None
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if len(latencies) < self.hedge_min_samples:
+            return None
+        return latencies[min(int(len(latencies) * self.hedge_quantile), len(latencies) - 1)]
+
+    def _record_latency(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> dict:
+        """
+        進行中的請求數、重試、對沖等統計資料，延遲以毫秒表示：
+        p50_ms 等為一般請求，stream_p50_ms 等為串流請求到輸出結束的時間
+        """
+        with self._lock:
+            stats = dict(self._counters, in_flight=self._in_flight)
+            windows = {"": sorted(self._latencies), "stream_": sorted(self._stream_latencies)}
+        for prefix, latencies in windows.items():
+            for name, quantile in (("p50_ms", 0.5), ("p95_ms", 0.95), ("p99_ms", 0.99)):
+                stats[prefix + name] = (
+                    round(latencies[min(int(len(latencies) * quantile), len(latencies) - 1)] * 1000, 1)
+                    if latencies
+                    else None
+                )
+        return stats
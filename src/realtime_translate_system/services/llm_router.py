@@ -0,0 +1,119 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from realtime_translate_system.services.ai_service import LLMService
+
+
+_task = contextvars.ContextVar("llm_task", default=None)
+
+
+@contextmanager
+def llm_task(name: str):
+    """標記這段程式碼中的 LLM 呼叫屬於哪種工作，`LLMRouter` 依工作的預算選擇模型"""
+    token = _task.set(name)
+    try:
+        yield
+    finally:
+        _task.reset(token)
+
+
+class LLMRouter:
+    """
+    在 flash 與 pro 兩個模型之間依每次呼叫選擇，介面與 `LLMService` 相同：
+    - 依工作種類的預算：提示長度達到該工作的門檻才使用 pro（例如長的會議摘要）
+    - 依觀察到的延遲：pro 近期的 p95 超過 SLO 時自動降級為 flash，
+      舊的延遲紀錄超過觀察時間後失效，降級也就自動解除
+    """
+
+    def __init__(
+        self,
+        flash: LLMService,
+        pro: LLMService,
+        task_budgets: dict = None,
+        latency_slo: float = 10.0,
+        latency_window: float = 300.0,
+        min_samples: int = 10,
+    ):
+        """
+        :param task_budgets: { 工作名稱: 使用 pro 的最短提示字元數 }，None 表示一律使用 flash，
+            0 表示一律使用 pro；沒有標記工作的呼叫使用 "default" 的設定
+        :param latency_slo: pro 的 p95 延遲上限（秒）
+        :param latency_window: 計算 p95 時只看這段時間（秒）內的請求
+        :param min_samples: 時間內至少要有這麼多筆請求才判斷是否超過 SLO
+        """
+        self.models = {"flash": flash, "pro": pro}
+        self.task_budgets = {"default": 0, **(task_budgets or {})}
+        self.latency_slo = latency_slo
+        self.latency_window = latency_window
+        self.min_samples = min_samples
+
+        self._lock = threading.Lock()
+        self._latencies = {name: deque(maxlen=1000) for name in self.models}  # (時間, 秒數)
+        self._routed = defaultdict(int)  # (工作, 模型) -> 次數
+        self._downgrades = 0
+
+    def route(self, prompt) -> str:
+        """:return: 這次呼叫要使用的模型名稱 "flash" 或 "pro" """
+        task = _task.get() or "default"
+        budget = self.task_budgets.get(task, self.task_budgets["default"])
+        length = sum(map(len, prompt)) if isinstance(prompt, (list, tuple)) else len(prompt)
+
+        model = "pro" if budget is not None and length >= budget else "flash"
+        if model == "pro" and self._breaches_slo("pro"):
+            model = "flash"
+            with self._lock:
+                self._downgrades += 1
+
+        with self._lock:
+            self._routed[task, model] += 1
+        return model
+
+    def query(self, prompt, generation_config=None) -> str:
+        model = self.route(prompt)
+        start = time.perf_counter()
+        response = self.models[model].query(prompt, generation_config)
+        self._record_latency(model, time.perf_counter() - start)
+        return response
+
+    def query_stream(self, prompt, generation_config=None) -> Iterator[str]:
+        model = self.route(prompt)
+        start = time.perf_counter()
+        yield from self.models[model].query_stream(prompt, generation_config)
+        self._record_latency(model, time.perf_counter() - start)
+
+    def parse_json_response(self, response_text, query=None):
+        """格式修正交給較快的 flash"""
+        return self.models["flash"].parse_json_response(response_text, query=query)
+
+    def _record_latency(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies[model].append((time.monotonic(), seconds))
+
+    def _p95(self, model: str) -> Optional[float]:
+        """觀察時間內的 p95 延遲（秒），樣本不足時返回 None"""
+        since = time.monotonic() - self.latency_window
+        with self._lock:
+            latencies = sorted(seconds for at, seconds in self._latencies[model] if at >= since)
+        if len(latencies) < self.min_samples:
+            return None
+        return latencies[min(int(len(latencies) * 0.95), len(latencies) - 1)]
+
+    def _breaches_slo(self, model: str) -> bool:
+        p95 = self._p95(model)
+        return p95 is not None and p95 > self.latency_slo
+
+    def stats(self) -> dict:
+        """各工作分配到的模型次數、降級次數與各模型近期的 p95（毫秒）"""
+        with self._lock:
+            routed = {f"{task}/{model}": count for (task, model), count in self._routed.items()}
+            downgrades = self._downgrades
+        stats = {"routed": routed, "downgrades": downgrades}
+        for model in self.models:
+            p95 = self._p95(model)
+            stats[f"{model}_p95_ms"] = None if p95 is None else round(p95 * 1000, 1)
+        stats["pro_degraded"] = self._breaches_slo("pro")
+        return stats
@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 from fuzzywuzzy import fuzz
 from realtime_translate_system.services.database_service import DatabaseService
 from realtime_translate_system.services.ai_service import LLMService, EmbeddingService
+from realtime_translate_system.services.llm_router import llm_task
 from numpy.linalg import norm
 
 class RetrievalAugmentedGeneration:
@@ -41,8 +42,9 @@ class RetrievalAugmentedGeneration:
         **User Query:** {user_query}
         """
         
-        response = self.llm_service.query(prompt)
-        parsed_response = self.llm_service.parse_json_response(response)
+        with llm_task("query"):
+            response = self.llm_service.query(prompt)
+            parsed_response = self.llm_service.parse_json_response(response)
         
         date = parsed_response.get("date", None)
         keywords = parsed_response.get("keywords", [])
@@ -143,8 +145,9 @@ class MeetingProcessor:
             "top_k": 30,
         }
 
-        response = self.llm_service.query(prompt, generation_config)
-        parsed_response = self.llm_service.parse_json_response(response)
+        with llm_task("title"):
+            response = self.llm_service.query(prompt, generation_config)
+            parsed_response = self.llm_service.parse_json_response(response)
         
         title = parsed_response.get("title", "未命名會議")
         keywords = parsed_response.get("keywords", [])
@@ -214,6 +217,7 @@ class MeetingProcessor:
             "top_k": 40,
         }
         
-        response = self.llm_service.query(prompt, generation_config)
+        with llm_task("summary"):
+            response = self.llm_service.query(prompt, generation_config)
         
         return response
\ No newline at end of file
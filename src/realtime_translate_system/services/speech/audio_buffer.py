@@ -0,0 +1,87 @@
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    預先配置的 16-bit PCM 環形緩衝區，每個語音串流一個，存放尚未辨識的音訊。
+    每個樣本寫入兩次（位置 i 與 i + capacity），任何不超過容量的區段在記憶體中都是連續的，
+    VAD 與 Whisper 可以直接取得 view，不必像 `bytes +=` 與切片那樣每次複製整段音訊。
+    """
+
+    def __init__(self, capacity: int):
+        """
+        :param capacity: 可存放的樣本數，寫入超過容量時會擴充（並印出警告）
+        """
+        self.capacity = capacity
+        self._samples = np.zeros(capacity * 2, dtype=np.int16)
+        self._float = np.zeros(capacity, dtype=np.float32)  # `to_float32()` 的輸出
+        self._head = 0  # 第一個樣本的位置，永遠小於 capacity
+        self._size = 0
+        self._odd_byte = b""  # 上一段資料多出的半個樣本
+
+    def __len__(self) -> int:
+        return self._size
+
+    def write(self, data: bytes) -> None:
+        """加入一段 16-bit little-endian PCM 資料（例如瀏覽器送來的音訊）"""
+        if self._odd_byte:
+            data = self._odd_byte + data
+            self._odd_byte = b""
+        if len(data) % 2:
+            data, self._odd_byte = data[:-1], data[-1:]
+        samples = np.frombuffer(data, dtype=np.int16)
+        count = len(samples)
+        if self._size + count > self.capacity:
+            self._grow(self._size + count)
+
+        tail = (self._head + self._size) % self.capacity
+        first = min(count, self.capacity - tail)
+        for start in (tail, tail + self.capacity):
+            self._samples[start : start + first] = samples[:first]
+        rest = count - first
+        if rest:
+            for start in (0, self.capacity):
+                self._samples[start : start + rest] = samples[first:]
+        self._size += count
+
+    def peek(self, count: int, offset: int = 0) -> np.ndarray:
+        """
+        從第 offset 個樣本開始、count 個樣本的唯讀 view（不複製）。
+        view 在下一次 `write()` 之前有效，`consume()` 不會覆寫其內容。
+        """
+        start = self._head + min(offset, self._size)
+        view = self._samples[start : self._head + min(offset + count, self._size)]
+        view.flags.writeable = False
+        return view
+
+    def consume(self, count: int) -> None:
+        """移除最前面的 count 個樣本"""
+        count = min(count, self._size)
+        self._head = (self._head + count) % self.capacity
+        self._size -= count
+
+    def to_float32(self, count: int = None) -> np.ndarray:
+        """
+        最前面 count 個（預設為全部）樣本轉為 [-1, 1) 的 float32（Whisper 的輸入格式），
+        結果寫入預先配置的陣列並返回其 view，在下一次呼叫之前有效。
+        """
+        samples = self.peek(self._size if count is None else count)
+        out = self._float[: len(samples)]
+        np.divide(samples, np.float32(32768.0), out=out, dtype=np.float32)
+        return out
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+        self._odd_byte = b""
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(self.capacity * 2, needed)
+        print(f"⚠️ 音訊緩衝區容量不足，由 {self.capacity} 擴充為 {capacity} 個樣本")
+        samples = np.zeros(capacity * 2, dtype=np.int16)
+        samples[: self._size] = self.peek(self._size)
+        samples[capacity : capacity + self._size] = samples[: self._size]
+        self._samples = samples
+        self._float = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
+        self._head = 0
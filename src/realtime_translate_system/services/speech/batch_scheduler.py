@@ -0,0 +1,194 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import List, NamedTuple
+
+import numpy as np
+import torch
+import whisper
+from whisper.audio import HOP_LENGTH, N_SAMPLES, SAMPLE_RATE
+from whisper.timing import find_alignment, merge_punctuations
+from whisper.tokenizer import get_tokenizer
+
+from realtime_translate_system.services.speech.local_agreement import Word
+
+# 與 `whisper.transcribe()` 的預設值相同
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOGPROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+
+
+class BatchResult(NamedTuple):
+    text: str
+    words: List[Word]  # 只有 word_timestamps=True 時才有
+
+
+class WhisperBatchScheduler:
+    """
+    多個連線共用一個 Whisper 模型時，把同時等待辨識的語句合併成一批推論：
+    第一段語句進來後最多等待 max_wait_ms 或湊滿 max_batch_size 段，各段補齊到 30 秒後以
+    `model.decode()` 一次解碼（Whisper 本來就把每段音訊補到 30 秒，合併不會增加運算）。
+    模型一次只執行一批，取代各連線各自呼叫 `model.transcribe()` 而在模型上排隊。
+    批次解碼沒有溫度退回，品質檢查不通過的語句再單獨以 `model.transcribe()` 辨識；
+    initial_prompt 在同一批中必須相同，因此不使用。
+    """
+
+    def __init__(self, model, max_batch_size: int = 8, max_wait_ms: int = 50, window: int = 1000):
+        """
+        :param model: `whisper.load_model()` 載入的模型
+        :param max_batch_size: 一批最多的語句數
+        :param max_wait_ms: 第一段語句最多等待更多語句的時間
+        :param window: 統計資料計算最近幾批
+        """
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.fp16 = torch.cuda.is_available()
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._counters = {"batches": 0, "requests": 0, "fallbacks": 0, "errors": 0}
+        self._batch_sizes = deque(maxlen=window)
+        self._waits = deque(maxlen=window * max_batch_size)
+        self._compute = deque(maxlen=window)  # (推論秒數, 音訊秒數)
+        self._thread = threading.Thread(target=self._collect, name="whisper-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, audio: np.ndarray, word_timestamps: bool = False) -> Future:
+        """送出一段 16 kHz float32 語句，Future 的結果為 `BatchResult`"""
+        future = Future()
+        self._queue.put((np.array(audio, dtype=np.float32), word_timestamps, time.monotonic(), future))
+        return future
+
+    def transcribe(self, audio: np.ndarray, word_timestamps: bool = False) -> BatchResult:
+        """`submit()` 並等待結果"""
+        return self.submit(audio, word_timestamps).result()
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            # 上一批推論期間排隊的語句已經等超過 max_wait，直接取出不再等待
+            deadline = batch[0][2] + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._run(batch)
+
+    def _run(self, batch: list) -> None:
+        start = time.monotonic()
+        waits = [start - submitted for _, _, submitted, _ in batch]
+        try:
+            results = self._decode([audio for audio, *_ in batch], [words for _, words, *_ in batch])
+        except Exception as e:
+            print(f"❌ Whisper 批次辨識失敗: {e}")
+            self._count("errors")
+            for *_, future in batch:
+                future.set_exception(e)
+            return
+
+        elapsed = time.monotonic() - start
+        audio_seconds = sum(len(audio) for audio, *_ in batch) / SAMPLE_RATE
+        with self._lock:
+            self._counters["batches"] += 1
+            self._counters["requests"] += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._waits.extend(waits)
+            self._compute.append((elapsed, audio_seconds))
+        for (*_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _decode(self, audios: List[np.ndarray], word_timestamps: List[bool]) -> List[BatchResult]:
+        results = [None] * len(audios)
+        # 超過 30 秒的語句無法放進同一批
+        batched = [i for i, audio in enumerate(audios) if len(audio) <= N_SAMPLES]
+        if batched:
+            mel = torch.stack(
+                [
+                    whisper.log_mel_spectrogram(whisper.pad_or_trim(audios[i]), self.model.dims.n_mels)
+                    for i in batched
+                ]
+            ).to(self.model.device)
+            options = whisper.DecodingOptions(task="transcribe", fp16=self.fp16, without_timestamps=True)
+            for index, decoded, item_mel in zip(batched, self.model.decode(mel, options), mel):
+                if decoded.no_speech_prob > NO_SPEECH_THRESHOLD and decoded.avg_logprob < LOGPROB_THRESHOLD:
+                    results[index] = BatchResult("", [])
+                elif (
+                    decoded.compression_ratio > COMPRESSION_RATIO_THRESHOLD
+                    or decoded.avg_logprob < LOGPROB_THRESHOLD
+                ):
+                    continue  # 交給下面的單獨辨識
+                elif word_timestamps[index]:
+                    words = self._align(decoded, item_mel, len(audios[index]))
+                    results[index] = BatchResult(decoded.text.strip(), words)
+                else:
+                    results[index] = BatchResult(decoded.text.strip(), [])
+
+        for index, result in enumerate(results):
+            if result is None:
+                self._count("fallbacks")
+                results[index] = self._transcribe_single(audios[index], word_timestamps[index])
+        return results
+
+    def _align(self, decoded, mel: torch.Tensor, samples: int) -> List[Word]:
+        """以 cross-attention 對齊解碼結果，取得每個詞的時間（與 word_timestamps=True 相同的做法）"""
+        tokenizer = get_tokenizer(
+            self.model.is_multilingual,
+            num_languages=self.model.num_languages,
+            language=decoded.language,
+            task="transcribe",
+        )
+        text_tokens = [token for token in decoded.tokens if token < tokenizer.eot]
+        if not text_tokens:
+            return []
+        timings = find_alignment(self.model, tokenizer, text_tokens, mel, samples // HOP_LENGTH)
+        merge_punctuations(timings, PREPEND_PUNCTUATIONS, APPEND_PUNCTUATIONS)
+        return [Word(timing.start, timing.end, timing.word) for timing in timings if timing.word]
+
+    def _transcribe_single(self, audio: np.ndarray, word_timestamps: bool) -> BatchResult:
+        result = self.model.transcribe(
+            audio,
+            fp16=self.fp16,
+            word_timestamps=word_timestamps,
+            condition_on_previous_text=False,
+        )
+        words = [
+            Word(word["start"], word["end"], word["word"])
+            for segment in result["segments"]
+            for word in segment.get("words", [])
+        ]
+        return BatchResult(result["text"].strip(), words)
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> dict:
+        """批次大小、排隊等待（毫秒）與 real-time factor（推論時間 / 音訊長度，越小越好）"""
+        with self._lock:
+            stats = dict(self._counters, queued=self._queue.qsize())
+            sizes = list(self._batch_sizes)
+            waits = sorted(self._waits)
+            compute = list(self._compute)
+        stats["batch_size_avg"] = round(sum(sizes) / len(sizes), 2) if sizes else None
+        stats["batch_size_max"] = max(sizes, default=None)
+        for name, quantile in (("queue_wait_p50_ms", 0.5), ("queue_wait_p95_ms", 0.95)):
+            stats[name] = (
+                round(waits[min(int(len(waits) * quantile), len(waits) - 1)] * 1000, 1)
+                if waits
+                else None
+            )
+        audio_seconds = sum(seconds for _, seconds in compute)
+        stats["rtf"] = (
+            round(sum(elapsed for elapsed, _ in compute) / audio_seconds, 3) if audio_seconds else None
+        )
+        return stats
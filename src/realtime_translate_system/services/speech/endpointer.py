@@ -0,0 +1,135 @@
+from collections import deque
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+
+from realtime_translate_system.services.speech.audio_buffer import AudioRingBuffer
+
+
+class VADEndpointer:
+    """
+    以固定長度的 frame（預設 30 ms）逐一做 VAD，切出一段段語句，語句一結束就交給 Whisper：
+    - onset：最近 onset_ms 內有 onset_ratio 以上的 frame 是語音時，語句開始（含前置的 padding_ms）
+    - hangover：語句中連續 hangover_ms 都不是語音時，語句結束（保留 padding_ms 的尾音）
+    - 短於 min_utterance_ms 的語句（咳嗽、雜音）直接捨棄
+    - 長於 max_utterance_ms 時強制切開，優先切在後半段最後一個停頓處，避免切斷單字
+    音訊存放在 AudioRingBuffer 中，交給 Whisper 的是預先配置陣列的 view。
+    """
+
+    def __init__(
+        self,
+        is_speech: Callable[[np.ndarray], bool],
+        sample_rate: int = 16000,
+        frame_duration: int = 30,
+        onset_ms: int = 150,
+        onset_ratio: float = 0.8,
+        hangover_ms: int = 600,
+        padding_ms: int = 150,
+        min_utterance_ms: int = 300,
+        max_utterance_ms: int = 15000,
+    ):
+        """
+        :param is_speech: 判斷一個 int16 frame 是否為語音（例如 webrtcvad）
+        :param frame_duration: frame 長度（毫秒），webrtcvad 只接受 10、20 或 30
+        """
+        self.is_speech = is_speech
+        self.sample_rate = sample_rate
+        self.frame_samples = sample_rate * frame_duration // 1000
+
+        def frames(ms: int) -> int:
+            return max(ms // frame_duration, 1)
+
+        self.onset_frames = frames(onset_ms)
+        self.onset_voiced = max(int(self.onset_frames * onset_ratio), 1)
+        self.hangover_frames = frames(hangover_ms)
+        self.padding_frames = frames(padding_ms) if padding_ms else 0
+        self.min_samples = sample_rate * min_utterance_ms // 1000
+        self.max_samples = sample_rate * max_utterance_ms // 1000
+
+        self.buffer = AudioRingBuffer(capacity=self.max_samples + sample_rate * 2)
+        self._cursor = 0  # 緩衝區中已經判斷過的樣本數
+        self._recent = deque(maxlen=self.onset_frames)  # 語句開始前最近幾個 frame 是否為語音
+        self._triggered = False  # 是否在語句中
+        self._silence = 0  # 語句中連續的非語音 frame 數
+        self._last_pause = 0  # 語句中最後一次停頓的中間位置
+
+    def write(self, data: bytes) -> None:
+        """加入一段 16-bit PCM 音訊"""
+        self.buffer.write(data)
+
+    def utterances(self) -> Iterator[np.ndarray]:
+        """
+        判斷新加入的音訊，依序返回已結束的語句（float32 的 view）。
+        每段 view 只在取得下一段之前有效，呼叫端必須先處理完（例如交給 Whisper）再繼續。
+        """
+        frame = self.frame_samples
+        while len(self.buffer) - self._cursor >= frame:
+            voiced = self.is_speech(self.buffer.peek(frame, self._cursor))
+            self._cursor += frame
+
+            if not self._triggered:
+                self._recent.append(voiced)
+                if sum(self._recent) >= self.onset_voiced:
+                    self._triggered = True
+                    self._silence = 0
+                    self._last_pause = 0
+                    self._recent.clear()
+                # 語句開始前只保留 onset 判斷中的 frame 與前置的 padding
+                self._drop(self._cursor - (self.onset_frames + self.padding_frames) * frame)
+                continue
+
+            if voiced:
+                self._silence = 0
+            else:
+                self._silence += 1
+                self._last_pause = self._cursor - self._silence * frame // 2  # 停頓的中間
+
+            if self._silence >= self.hangover_frames:
+                end = self._cursor - max(self._silence - self.padding_frames, 0) * frame
+                if end - self._padding() >= self.min_samples:
+                    yield self.buffer.to_float32(end)
+                self._drop(self._cursor)
+                self._triggered = False
+            elif self._cursor >= self.max_samples:
+                # 強制切開：後半段有停頓就切在停頓處，剩下的音訊留給下一段語句
+                end = self._last_pause if self._last_pause >= self.max_samples // 2 else self._cursor
+                yield self.buffer.to_float32(end)
+                self._drop(end)
+                self._silence = 0
+                self._last_pause = 0
+
+    def pending(self) -> Optional[np.ndarray]:
+        """
+        尚未結束的語句目前收到的全部音訊（float32 的 view），不在語句中時返回 None。
+        用於語句結束前的部分辨識，view 的有效期間與 `utterances()` 相同。
+        """
+        if not self._triggered:
+            return None
+        return self.buffer.to_float32()
+
+    def trim(self, count: int) -> None:
+        """尚未結束的語句中，最前面 count 個樣本已經辨識並輸出，從緩衝區移除"""
+        if self._triggered:
+            self._drop(min(count, self._cursor))
+
+    def flush(self) -> Optional[np.ndarray]:
+        """串流結束時返回尚未結束的語句（夠長的話），並清空緩衝區"""
+        utterance = None
+        if self._triggered and len(self.buffer) - self._padding() >= self.min_samples:
+            utterance = self.buffer.to_float32()
+        self.buffer.clear()
+        self._cursor = 0
+        self._recent.clear()
+        self._triggered = False
+        return utterance
+
+    def _padding(self) -> int:
+        """語句前後的 padding 樣本數，判斷語句長度時不計入"""
+        return 2 * self.padding_frames * self.frame_samples
+
+    def _drop(self, count: int) -> None:
+        """移除緩衝區最前面的 count 個樣本"""
+        if count > 0:
+            self.buffer.consume(count)
+            self._cursor -= count
+            self._last_pause = max(self._last_pause - count, 0)
@@ -0,0 +1,79 @@
+import numpy as np
+from faster_whisper import WhisperModel
+from typing import Callable, List
+from realtime_translate_system.services.speech.local_agreement import Word
+from realtime_translate_system.services.speech.streaming import (
+    TRANSCRIBE_PROMPT,
+    StreamingSpeechRecognizer,
+)
+
+
+class FasterWhisperSpeechRecognizer(StreamingSpeechRecognizer):
+    """
+    以 CTranslate2（faster-whisper）執行 Whisper，CPU 上使用 int8 量化的權重。
+    串流辨識（VAD 切分、partial）的程式與 WhisperSpeechRecognizer 共用，只換掉推論引擎；
+    CTranslate2 的 num_workers 讓多個連線同時推論，不使用 WhisperBatchScheduler。
+    量化可能影響辨識正確率，速度與記憶體的差異也依機器而定，
+    尚未量測，不能視為 WhisperSpeechRecognizer 的直接替代，請先以 benchmarks/asr_backends.py 比較。
+    """
+
+    def __init__(
+        self,
+        model_size="large-v3-turbo",
+        device: str = "cpu",
+        compute_type: str = "int8",
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        beam_size: int = 1,
+        endpointing: dict = None,
+        partial_interval_ms: int = 0,
+        prompt_chars: int = 200,
+    ):
+        """
+        :param model_size: faster-whisper 的模型名稱或轉換好的 CTranslate2 模型目錄
+        :param compute_type: 權重與運算的精度，"int8"、"int8_float32"、"float32" 等
+        :param cpu_threads: 每個 worker 的執行緒數，0 表示由 CTranslate2 決定
+        :param num_workers: 可以同時推論的連線數
+        :param beam_size: 1 為 greedy decoding（與 openai-whisper 預設相同）
+        :param endpointing, partial_interval_ms, prompt_chars: 見 `StreamingSpeechRecognizer`
+        """
+        super().__init__(endpointing, partial_interval_ms, prompt_chars)
+        self.model = WhisperModel(
+            model_size,
+            device=device,
+            compute_type=compute_type,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
+        )
+        self.beam_size = beam_size
+        print(f"🔊 faster-whisper 模型已載入：{model_size}（{device}, {compute_type}）")
+
+    def transcribe(self, audio_path: str, callback: Callable[[str], None]):
+        """Transcribe a single audio file"""
+        segments, _ = self.model.transcribe(
+            str(audio_path), beam_size=self.beam_size, initial_prompt=TRANSCRIBE_PROMPT
+        )
+        for segment in segments:
+            callback(segment.text)
+
+    def _transcribe_text(self, audio) -> str:
+        """辨識一段語句"""
+        denoised_audio = self._denoise(audio).astype(np.float32, copy=False)
+        segments, _ = self.model.transcribe(denoised_audio, beam_size=self.beam_size)
+        return "".join(segment.text for segment in segments).strip()
+
+    def _transcribe_words(self, audio, prompt: str = "") -> List[Word]:
+        """辨識一段音訊，返回含時間戳記（相對於音訊開頭）的詞"""
+        denoised_audio = self._denoise(audio).astype(np.float32, copy=False)
+        segments, _ = self.model.transcribe(
+            denoised_audio,
+            beam_size=self.beam_size,
+            word_timestamps=True,
+            initial_prompt=prompt or None,
+            condition_on_previous_text=False,
+        )
+        return [
+            Word(word.start, word.end, word.word)
+            for segment in segments
+            for word in segment.words or []
+        ]
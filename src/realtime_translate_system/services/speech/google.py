@@ -1,22 +1,28 @@
-import pandas as pd
 import queue
 from google.api_core.client_options import ClientOptions
 from google.cloud.speech_v2 import SpeechClient
 from google.cloud.speech_v2.types import cloud_speech
-from typing import Generator, List, Callable
+from typing import Generator, List, Callable, Optional
 from pydub import AudioSegment
 from realtime_translate_system.config import Config
 from realtime_translate_system.services import SpeechRecognizer
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry
 
 
 class GoogleSpeechRecognizer(SpeechRecognizer):
     def __init__(
-        self, location: str = "us-central1", project_id: str = None, *args, **kwargs
+        self,
+        location: str = "us-central1",
+        project_id: str = None,
+        glossary_registry: GlossaryRegistry = None,
+        *args,
+        **kwargs,
     ):
         """初始化 Google Speech Client"""
         super().__init__(*args, **kwargs)
         self.location = location
         self.project_id = project_id
+        self.glossary_registry = glossary_registry
 
         if not self.project_id:
             raise ValueError("Project ID is required for Google Speech API")
@@ -32,11 +38,12 @@ class GoogleSpeechRecognizer(SpeechRecognizer):
     def _load_glossaries(self) -> List[dict]:
         """載入術語表"""
         try:
-            glossaries_paths = Config.FILE_PATHS
+            if self.glossary_registry is None:
+                self.glossary_registry = GlossaryRegistry(Config.FILE_PATHS)
+            glossary = self.glossary_registry.snapshot
             proper_nounses = []
-            for path in glossaries_paths.values():
-                glossaries = pd.read_csv(path, header=0)
-                proper_nounses.extend(glossaries["Proper Noun "].dropna().tolist())
+            for lang in glossary.languages:
+                proper_nounses.extend(term for term in glossary.terms(lang) if term)
             special_phrase = ["BigQuery"]
             return [
                 {"value": phrase, "boost": 10 if phrase not in special_phrase else 20}
@@ -76,6 +83,10 @@ class GoogleSpeechRecognizer(SpeechRecognizer):
                 explicit_decoding_config=audio_config,
                 adaptation=adaptation,
             ),
+            # 說話中的暫定結果（is_final 為 False），用於即時字幕
+            streaming_features=cloud_speech.StreamingRecognitionFeatures(
+                interim_results=True
+            ),
         )
 
     def _prepare_audio_chunks(
@@ -145,6 +156,7 @@ class GoogleSpeechRecognizer(SpeechRecognizer):
         audio_queue: queue.Queue,
         callback: Callable[[str], None],
         done: Callable[[], None],
+        partial_callback: Optional[Callable[[str], None]] = None,
     ):
         """處理麥克風錄音 Blob"""
         response = self.client.streaming_recognize(
@@ -153,7 +165,12 @@ class GoogleSpeechRecognizer(SpeechRecognizer):
 
         for result in response:
             for alt in result.results:
-                callback(alt.alternatives[0].transcript)
+                if not alt.alternatives:
+                    continue
+                if alt.is_final:
+                    callback(alt.alternatives[0].transcript)
+                elif partial_callback:
+                    partial_callback(alt.alternatives[0].transcript)
 
         done()
 
@@ -0,0 +1,89 @@
+import re
+from typing import List, NamedTuple
+
+
+class Word(NamedTuple):
+    start: float  # 秒，相對於目前音訊視窗的開頭
+    end: float
+    text: str  # Whisper 的 word 文字（英文等語言包含前置空白）
+
+
+def join_words(words: List[Word]) -> str:
+    return "".join(word.text for word in words).strip()
+
+
+def _normalize(text: str) -> str:
+    """比較兩次辨識結果時忽略大小寫、空白與標點"""
+    return re.sub(r"[\W_]+", "", text.casefold())
+
+
+class LocalAgreement:
+    """
+    LocalAgreement-2：同一段持續變長的音訊，相鄰兩次辨識結果的最長共同前綴視為穩定並提交，
+    之後不再改變；其餘的詞是不穩定的假設，只用來顯示即時字幕。
+    """
+
+    def __init__(self, overlap: float = 0.1, max_ngram: int = 5):
+        """
+        :param overlap: 提交點之前這麼多秒內開始的詞仍視為新的詞（時間戳記的誤差）
+        :param max_ngram: 新結果開頭與已提交結尾重複的詞，最多檢查幾個詞
+        """
+        self.overlap = overlap
+        self.max_ngram = max_ngram
+        self.committed_end = 0.0  # 已提交的最後一個詞的結束時間
+        self._previous = []  # 上一次辨識中尚未提交的詞
+        self._recent = []  # 最近提交的詞，用來去除新結果開頭的重複
+
+    @property
+    def unstable(self) -> List[Word]:
+        """尚未提交的詞（上一次的辨識結果）"""
+        return list(self._previous)
+
+    def update(self, words: List[Word]) -> List[Word]:
+        """
+        加入對目前音訊視窗的最新辨識結果。
+        :return: 這次新提交的詞
+        """
+        words = self._new_words(words)
+        count = 0
+        for previous, word in zip(self._previous, words):
+            if _normalize(previous.text) != _normalize(word.text):
+                break
+            count += 1
+
+        committed, self._previous = words[:count], words[count:]
+        if committed:
+            self.committed_end = committed[-1].end
+            self._recent = (self._recent + committed)[-self.max_ngram :]
+        return committed
+
+    def complete(self, words: List[Word]) -> List[Word]:
+        """語句結束：最後一次的辨識結果不必再等待確認，已提交之後的詞全部返回，並重新開始"""
+        words = self._new_words(words)
+        self.reset()
+        return words
+
+    def shift(self, seconds: float) -> None:
+        """音訊視窗前面的 seconds 秒被移除時，調整保存的時間"""
+        self.committed_end = max(self.committed_end - seconds, 0.0)
+        self._previous = [
+            Word(word.start - seconds, word.end - seconds, word.text) for word in self._previous
+        ]
+
+    def reset(self) -> None:
+        self.committed_end = 0.0
+        self._previous = []
+        self._recent = []
+
+    def _new_words(self, words: List[Word]) -> List[Word]:
+        """去除已提交的部分：開始時間在提交點之前的詞，以及開頭與最近提交的詞重複的 n-gram"""
+        words = [word for word in words if word.start >= self.committed_end - self.overlap]
+        if not words or not self._recent:
+            return words
+
+        recent = [_normalize(word.text) for word in self._recent]
+        head = [_normalize(word.text) for word in words[: self.max_ngram]]
+        for n in range(min(len(recent), len(head)), 0, -1):
+            if recent[-n:] == head[:n]:
+                return words[n:]
+        return words
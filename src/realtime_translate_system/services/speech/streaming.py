@@ -0,0 +1,156 @@
+import queue
+from typing import Callable, List, Optional
+
+import noisereduce as nr
+import numpy as np
+import webrtcvad
+
+from realtime_translate_system.services import SpeechRecognizer
+from realtime_translate_system.services.speech.endpointer import VADEndpointer
+from realtime_translate_system.services.speech.local_agreement import (
+    LocalAgreement,
+    Word,
+    join_words,
+)
+
+SENTENCE_ENDINGS = ("。", "！", "？", ".", "!", "?")
+# 辨識整個音檔（`transcribe()`）時的 initial_prompt
+TRANSCRIBE_PROMPT = """
+        這是一段包含繁體中文、英語、日本語、德語的語音內容。請正確辨識所有語言並將其轉錄成文字，翻譯成中文。          
+"""
+
+
+class StreamingSpeechRecognizer(SpeechRecognizer):
+    """
+    本地 Whisper 類模型共用的串流辨識：VAD 切分語句、降噪、partial 與 LocalAgreement 提交。
+    子類別只需實作 `_transcribe_text()` 與 `_transcribe_words()`。
+    """
+
+    def __init__(
+        self,
+        endpointing: dict = None,
+        partial_interval_ms: int = 0,
+        prompt_chars: int = 200,
+    ):
+        """
+        :param endpointing: 串流辨識切分語句的參數（onset_ms、hangover_ms、padding_ms、
+            min_utterance_ms、max_utterance_ms 等），見 `VADEndpointer`
+        :param partial_interval_ms: 語句說完之前，每收到這麼長的新音訊就重新辨識並輸出 partial，0 表示停用
+        :param prompt_chars: 部分辨識時，以最近輸出的 final 中這麼多字作為 initial_prompt
+        """
+        self.vad = webrtcvad.Vad()
+        self.vad.set_mode(3)
+        self.frame_rate = 16000
+        self.sample_width = 2
+        self.frame_duration = 30  # ms
+        self.endpointing = endpointing or {}
+        self.partial_samples = self.frame_rate * partial_interval_ms // 1000
+        self.prompt_chars = prompt_chars
+
+    def _is_speech(self, audio) -> bool:
+        """Check if the audio (bytes or an int16 array) contains speech"""
+        return self.vad.is_speech(audio, self.frame_rate)
+
+    def _denoise(self, audio: np.ndarray) -> np.ndarray:
+        return nr.reduce_noise(y=audio, sr=self.frame_rate, prop_decrease=0.8)
+
+    def _transcribe_text(self, audio: np.ndarray) -> str:
+        """辨識一段語句（16 kHz float32）"""
+        raise NotImplementedError()
+
+    def _transcribe_words(self, audio: np.ndarray, prompt: str = "") -> List[Word]:
+        """辨識一段音訊，返回含時間戳記（相對於音訊開頭）的詞"""
+        raise NotImplementedError()
+
+    def transcribe_streaming(
+        self,
+        audio_queue: queue.Queue,
+        callback: Callable[[str], None],
+        done: Callable[[], None],
+        partial_callback: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        Streaming transcription from an audio queue:
+        每段語句在 VAD 判斷結束時立即辨識，不再等待固定長度的音訊。
+        有 partial_callback 時，語句說完之前每隔 partial_interval_ms 重新辨識目前的語句：
+        前後兩次一致的詞提交（LocalAgreement），提交到句尾標點就先輸出 final 並移除這段音訊，
+        其餘尚未穩定的詞只以 partial 輸出給即時字幕。
+        """
+        endpointer = VADEndpointer(
+            self._is_speech,
+            sample_rate=self.frame_rate,
+            frame_duration=self.frame_duration,
+            **self.endpointing,
+        )
+        incremental = partial_callback is not None and self.partial_samples > 0
+        agreement = LocalAgreement()
+        committed = []  # 已提交、尚未輸出為 final 的詞
+        context = ""  # 已輸出的 final，結尾作為辨識的 initial_prompt
+        last_pass = 0  # 上一次部分辨識時語句的樣本數
+        last_partial = ""
+
+        def emit(words: List[Word]):
+            nonlocal context
+            text = join_words(words)
+            if text:
+                callback(text)
+                context = (context + text)[-self.prompt_chars :]
+
+        def transcribe(audio):
+            """語句結束：辨識整段語句（已輸出為 final 的部分已從緩衝區移除）"""
+            nonlocal committed, last_pass, last_partial
+            if not incremental:
+                text = self._transcribe_text(audio)
+                if text:
+                    callback(text)
+                return
+            words = committed + agreement.complete(self._transcribe_words(audio, context))
+            committed, last_pass, last_partial = [], 0, ""
+            emit(words)
+
+        def update(audio):
+            """語句中：重新辨識目前的語句，完整的句子先輸出 final，其餘輸出 partial"""
+            nonlocal committed, last_pass, last_partial
+            last_pass = len(audio)
+            committed += agreement.update(self._transcribe_words(audio, context))
+
+            ends = [i for i, word in enumerate(committed) if word.text.strip().endswith(SENTENCE_ENDINGS)]
+            if ends:
+                sentence, committed = committed[: ends[-1] + 1], committed[ends[-1] + 1 :]
+                emit(sentence)
+                # 已輸出的音訊不必再辨識，之後的時間都往前移
+                before = len(endpointer.buffer)
+                endpointer.trim(int(sentence[-1].end * self.frame_rate))
+                trimmed = before - len(endpointer.buffer)
+                seconds = trimmed / self.frame_rate
+                agreement.shift(seconds)
+                committed = [Word(w.start - seconds, w.end - seconds, w.text) for w in committed]
+                last_pass -= trimmed
+
+            text = join_words(committed + agreement.unstable)
+            if text != last_partial:
+                partial_callback(text)
+                last_partial = text
+
+        while True:
+            try:
+                audio = audio_queue.get(timeout=3)
+            except queue.Empty:
+                break
+            if not audio:
+                break
+            endpointer.write(audio)
+            for utterance in endpointer.utterances():
+                transcribe(utterance)
+            if incremental:
+                pending = endpointer.pending()
+                if pending is not None and len(pending) - last_pass >= self.partial_samples:
+                    update(pending)
+
+        # 串流結束時還沒說完的語句
+        utterance = endpointer.flush()
+        if utterance is not None:
+            transcribe(utterance)
+        elif committed:
+            emit(committed)
+        done()  # Notify processing is done
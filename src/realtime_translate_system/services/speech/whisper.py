@@ -1,84 +1,71 @@
-import numpy as np
-import queue
 import torch
-import webrtcvad
 import whisper
-from typing import Callable
-from realtime_translate_system.services import SpeechRecognizer
-import noisereduce as nr
+from typing import Callable, List
+from realtime_translate_system.services.speech.batch_scheduler import WhisperBatchScheduler
+from realtime_translate_system.services.speech.local_agreement import Word
+from realtime_translate_system.services.speech.streaming import (
+    TRANSCRIBE_PROMPT,
+    StreamingSpeechRecognizer,
+)
 
 
-class WhisperSpeechRecognizer(SpeechRecognizer):
+class WhisperSpeechRecognizer(StreamingSpeechRecognizer):
     """Whisper Speech Recognizer class"""
 
-    def __init__(self, model_size="large"):
+    def __init__(
+        self,
+        model_size="large",
+        endpointing: dict = None,
+        partial_interval_ms: int = 0,
+        prompt_chars: int = 200,
+        batching: dict = None,
+    ):
+        """
+        :param endpointing, partial_interval_ms, prompt_chars: 見 `StreamingSpeechRecognizer`
+        :param batching: 合併各連線語句的批次推論參數（max_batch_size、max_wait_ms），
+            見 `WhisperBatchScheduler`；None 表示各連線直接呼叫模型
+        """
+        super().__init__(endpointing, partial_interval_ms, prompt_chars)
         self.model = whisper.load_model(model_size)
-        self.vad = webrtcvad.Vad()
-        self.vad.set_mode(3)
-        self.frame_rate = 16000
-        self.sample_width = 2
-        self.frame_duration = 30  # ms
+        self.scheduler = WhisperBatchScheduler(self.model, **batching) if batching is not None else None
         print(f"🔊 Whisper 模型已載入：{model_size}")
 
-    def _is_speech(self, audio: bytes) -> bool:
-        """Check if the audio contains speech"""
-        return self.vad.is_speech(audio, self.frame_rate)
+    def stats(self) -> dict:
+        return self.scheduler.stats() if self.scheduler is not None else {}
 
     def transcribe(self, audio_path: str, callback: Callable[[str], None]):
         """Transcribe a single audio file"""
         audio = whisper.load_audio(audio_path)
         # audio = whisper.pad_or_trim(audio)
-        result = self.model.transcribe(audio, fp16=torch.cuda.is_available(), initial_prompt="""
-        這是一段包含繁體中文、英語、日本語、德語的語音內容。請正確辨識所有語言並將其轉錄成文字，翻譯成中文。          
-""")
+        result = self.model.transcribe(audio, fp16=torch.cuda.is_available(), initial_prompt=TRANSCRIBE_PROMPT)
         for r in result["segments"]:
             callback(r["text"])
 
-    def transcribe_streaming(
-        self,
-        audio_queue: queue.Queue,
-        callback: Callable[[str], None],
-        done: Callable[[], None],
-    ):
-        """Simulate streaming transcription from an audio queue"""
-        tmp_audio = b""
-        chunk_size = 5  # Transcribe every 5 seconds of audio
-
-        while True:
-            exit_flag = False
-            try:
-                audio = audio_queue.get(timeout=3)
-                if not audio:
-                    break
-                tmp_audio += audio
-            except queue.Empty:
-                exit_flag = True
-                if not tmp_audio:
-                    break
-
-            frame_size = self.frame_rate * self.sample_width * self.frame_duration // 1000
-            while len(tmp_audio) >= frame_size:
-                frame = tmp_audio[:frame_size]
-                tmp_audio = tmp_audio[frame_size:]
-                if self._is_speech(frame):
-                    break
-
-            if len(tmp_audio) < chunk_size * self.frame_rate * self.sample_width:
-                continue            
-
-            audio = (
-                np.frombuffer(tmp_audio, dtype=np.int16).astype(np.float32) / 32768.0
-            )
-            
-            denoised_audio = nr.reduce_noise(y=audio, sr=self.frame_rate, prop_decrease=0.8)
+    def _transcribe_text(self, audio) -> str:
+        """辨識一段語句"""
+        denoised_audio = self._denoise(audio)
+        if self.scheduler is not None:
+            return self.scheduler.transcribe(denoised_audio).text
+        result = self.model.transcribe(denoised_audio, fp16=torch.cuda.is_available())
+        return result["text"].strip()
 
-            result = self.model.transcribe(denoised_audio, fp16=torch.cuda.is_available())
-            text = result["text"].strip()
-            callback(text)
-            tmp_audio = b""
-            if exit_flag:
-                break
-        done()  # Notify processing is done
+    def _transcribe_words(self, audio, prompt: str = "") -> List[Word]:
+        """辨識一段音訊，返回含時間戳記（相對於音訊開頭）的詞；批次推論時不使用 prompt"""
+        denoised_audio = self._denoise(audio)
+        if self.scheduler is not None:
+            return self.scheduler.transcribe(denoised_audio, word_timestamps=True).words
+        result = self.model.transcribe(
+            denoised_audio,
+            fp16=torch.cuda.is_available(),
+            word_timestamps=True,
+            initial_prompt=prompt or None,
+            condition_on_previous_text=False,
+        )
+        return [
+            Word(word["start"], word["end"], word["word"])
+            for segment in result["segments"]
+            for word in segment.get("words", [])
+        ]
 
 if __name__ == "__main__":
     from pathlib import Path
@@ -1,5 +1,5 @@
 import queue
-from typing import Callable
+from typing import Callable, Optional
 
 class SpeechRecognizer:
     def __init__(self, *args, **kwargs):
@@ -8,5 +8,19 @@ class SpeechRecognizer:
     def transcribe(self, audio_path: str, callback: Callable[[str], None]):
         raise NotImplementedError()
     
-    def transcribe_streaming(self, audio_queue: queue.Queue, callback: Callable[[str], None], done: Callable[[], None]):
-        raise NotImplementedError()
\ No newline at end of file
+    def transcribe_streaming(
+        self,
+        audio_queue: queue.Queue,
+        callback: Callable[[str], None],
+        done: Callable[[], None],
+        partial_callback: Optional[Callable[[str], None]] = None,
+    ):
+        """
+        :param callback: 確定的辨識結果（final），交給翻譯
+        :param partial_callback: 語句說完之前、之後還可能改變的辨識結果（partial），只用於即時字幕
+        """
+        raise NotImplementedError()
+
+    def stats(self) -> dict:
+        """辨識的統計資料（例如批次推論），由 /api/health/metrics 回報"""
+        return {}
@@ -0,0 +1,101 @@
+from collections import deque
+from typing import Iterable, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    """英數字元視為單字的一部分，用來判斷術語是否落在單字邊界"""
+    return char.isascii() and char.isalnum()
+
+
+class TermAutomaton:
+    """
+    以 Aho-Corasick 多模式自動機比對企業術語，
+    只需掃描輸入文字一次即可找出所有精確命中的術語。
+    """
+
+    def __init__(self, terms: Iterable[str]):
+        """
+        :param terms: 術語列表，建立後即不可變更（術語表更新時需重新建立）。
+            術語表中的前後空白（例如 "DP "）會被去除，空字串與重複的術語會被略過
+        """
+        stripped = (term.strip() for term in terms if isinstance(term, str))
+        self.terms = list(dict.fromkeys(term for term in stripped if term))
+        self._goto = [{}]  # 每個節點的轉移表
+        self._fail = [0]  # 失敗連結
+        self._output = [[]]  # 在此節點結束的術語索引
+
+        for index, term in enumerate(self.terms):
+            self._insert(term, index)
+        self._build_fail_links()
+
+    def _insert(self, term: str, index: int) -> None:
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append(index)
+
+    def _build_fail_links(self) -> None:
+        """以 BFS 建立失敗連結，並把失敗節點的輸出併入目前節點"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def find_all(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        找出所有（可能重疊的）術語命中位置。
+        :return: [(start, end, term), ...]，依結束位置排序
+        """
+        matches = []
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for index in self._output[node]:
+                term = self.terms[index]
+                matches.append((position + 1 - len(term), position + 1, term))
+        return matches
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        找出不重疊的術語命中位置，採最左最長優先，
+        英數術語需落在單字邊界上（避免 `EC` 命中 `SPEC` 之類的情況）。
+        :return: [(start, end, term), ...]，依起始位置排序
+        """
+        candidates = [
+            (start, end, term)
+            for start, end, term in self.find_all(text)
+            if not (
+                start > 0
+                and _is_word_char(term[0])
+                and _is_word_char(text[start - 1])
+            )
+            and not (
+                end < len(text)
+                and _is_word_char(term[-1])
+                and _is_word_char(text[end])
+            )
+        ]
+        candidates.sort(key=lambda match: (match[0], match[0] - match[1]))
+
+        selected = []
+        cursor = 0
+        for start, end, term in candidates:
+            if start >= cursor:
+                selected.append((start, end, term))
+                cursor = end
+        return selected
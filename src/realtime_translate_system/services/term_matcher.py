@@ -1,45 +1,285 @@
 import jieba
 import MeCab
-import pandas as pd
 import re
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from fuzzywuzzy import fuzz
+from realtime_translate_system.services.fuzzy_index import FuzzyTermIndex
+from realtime_translate_system.services.glossary_cache import load_jieba_dictionary
+from realtime_translate_system.services.glossary_registry import (
+    GlossaryRegistry,
+    GlossarySnapshot,
+)
+from realtime_translate_system.services.term_automaton import TermAutomaton, _is_word_char
+
+
+_worker_matcher = None  # 行程池中每個 worker 各自持有的 TermMatcher
+_worker_seen_version = None  # worker 最後一次看到的主行程術語表版本
+
+
+def _init_worker(file_paths: dict, threshold: int, cache_size: int, cache_dir=None) -> None:
+    """行程池 worker 初始化：各自載入術語表與分詞器"""
+    global _worker_matcher
+    _worker_matcher = TermMatcher(
+        GlossaryRegistry(file_paths, cache_dir=cache_dir), threshold, cache_size
+    )
+    _worker_matcher.wait_until_ready()
+
+
+def _process_text_in_worker(
+    text: str, lang: str, glossary_version: int, carry: str = None
+) -> tuple:
+    """主行程的術語表版本改變時，worker 也檢查自己的 CSV 是否需要重新載入"""
+    global _worker_seen_version
+    if _worker_seen_version != glossary_version:
+        _worker_matcher.glossary_registry.reload_if_changed()
+        _worker_seen_version = glossary_version
+    return _worker_matcher._timed_process_text(text, lang, carry)
+
+
+def _count_term_words(term: str) -> int:
+    """估計術語最多會被分詞器切成幾個詞：英數字串算一詞，其餘每個字元各算一詞"""
+    return max(len(re.findall(r"[A-Za-z0-9]+|\S", term)), 1)
+
+
+class _LanguageIndex:
+    """單一語言、單一版本術語表的所有比對索引，術語表更新時整組替換"""
+
+    def __init__(self, term_dict, threshold: int, version: int):
+        self.version = version
+        self.threshold = threshold
+        self.term_dict = term_dict
+        self.automaton = TermAutomaton(term_dict)  # 精確比對自動機
+        self.fuzzy_index = FuzzyTermIndex(term_dict, threshold)  # 模糊比對索引
+        self.max_ngram = max(map(_count_term_words, term_dict), default=1)
+        self.term_tokens = None  # 術語 -> 以該語言分詞器切出的詞，載入分詞器後才計算
+        self.match_cache = None  # (token, 版本, 視窗的詞) -> 最佳術語 的 LRU 快取
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GlossarySnapshot, lang: str, threshold: int):
+        """優先使用預先編譯的索引（閥值相同時），否則從術語重新建立"""
+        index = snapshot.compiled_indexes.get(lang)
+        if index is None or index.threshold != threshold:
+            return cls(snapshot.term_dict(lang), threshold, snapshot.version)
+        index.version = snapshot.version
+        index.term_dict = snapshot.term_dict(lang)
+        return index
+
+    def __getstate__(self):
+        """編譯術語表時只保存索引本身，術語字典與快取在載入後重新綁定"""
+        return {**self.__dict__, "term_dict": None, "term_tokens": None, "match_cache": None}
+
+    @property
+    def window_sizes(self) -> list:
+        """多詞術語的詞數，由大到小；只有這些長度的視窗需要比對"""
+        return sorted({len(tokens) for tokens in self.term_tokens.values() if len(tokens) > 1}, reverse=True)
 
 
 class TermMatcher:
-    def __init__(self, file_paths: dict, threshold: int = 100):
+    def __init__(
+        self,
+        glossary_registry: GlossaryRegistry,
+        threshold: int = 100,
+        cache_size: int = 4096,
+        executor: str = None,
+        max_workers: int = 4,
+    ):
         """
-        初始化 TermMatcher，支援多語言企業術語比對
-        :param file_paths: 字典 { "語言名稱": "對應的 CSV 路徑" }
+        初始化 TermMatcher，支援多語言企業術語比對。
+        建構時不載入任何東西，比對索引、jieba 詞庫與 MeCab 在 `warm_up()` 或第一次使用時才載入。
+        :param glossary_registry: 共用的企業術語表，更新時會自動重建比對索引
         :param threshold: 相似度閥值 (0-100)
+        :param cache_size: 每個語言快取的 token 比對結果數量上限
+        :param executor: 多語言平行處理方式，"thread"、"process" 或 None（依序處理）。
+            "process" 會為每個語言各開一個 worker 行程，讓該語言的快取持續有效
+        :param max_workers: "thread" 模式的執行緒數量
         """
+        self.glossary_registry = glossary_registry
         self.threshold = threshold
-        self.term_dicts = {}  # 存放不同語言的術語字典
-        self.mecab = MeCab.Tagger("-Owakati")
-
-        # 讀取每個語言的企業術語
-        for lang, path in file_paths.items():
-            self.term_dicts[lang] = self._load_glossaries(path)
+        self.cache_size = cache_size
+        self._language_indexes = None  # 語言 -> _LanguageIndex，預熱完成前為 None
+        self._local = threading.local()  # MeCab Tagger 不可跨執行緒共用
+        self._ready = Future()  # 預熱完成時設定結果（耗時秒數）或例外
+        self._warm_up_lock = threading.Lock()
+        self._warm_up_thread = None
 
         # 預設使用第一個語言（確保 `process_text()` 可單獨運行）
-        self.default_lang = next(iter(file_paths))
+        self.default_lang = glossary_registry.snapshot.languages[0]
+
+        self.executors = {}  # 語言 -> 負責處理的 executor
+        file_paths = glossary_registry.file_paths
+        if executor == "thread":
+            pool = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="term-matcher"
+            )
+            self.executors = {lang: pool for lang in file_paths}
+        elif executor == "process":
+            self.executors = {
+                lang: ProcessPoolExecutor(
+                    max_workers=1,
+                    initializer=_init_worker,
+                    initargs=(
+                        {lang: path},
+                        threshold,
+                        cache_size,
+                        glossary_registry.cache_dir,
+                    ),
+                )
+                for lang, path in file_paths.items()
+            }
+        elif executor is not None:
+            raise ValueError(f"Unsupported executor: {executor}")
+
+    def warm_up(self) -> Future:
+        """
+        在背景執行緒載入比對索引、jieba 詞庫與 MeCab，重複呼叫只會載入一次。
+        :return: 預熱完成（或失敗）時結束的 Future
+        """
+        with self._warm_up_lock:
+            if self._warm_up_thread is None:
+                self._warm_up_thread = threading.Thread(
+                    target=self._warm_up, name="term-matcher-warm-up", daemon=True
+                )
+                self._warm_up_thread.start()
+        return self._ready
+
+    def wait_until_ready(self, timeout: float = None) -> float:
+        """
+        等待預熱完成（尚未開始時會先開始），預熱失敗時拋出相同的例外。
+        :return: 預熱耗時（秒）
+        """
+        return self.warm_up().result(timeout)
+
+    @property
+    def ready(self) -> bool:
+        """是否已預熱完成，可直接作為服務的 readiness"""
+        return self._ready.done() and self._ready.exception() is None
+
+    def _warm_up(self) -> None:
+        start = time.perf_counter()
+        try:
+            self.glossary_registry.subscribe(self._build_indexes)
+            self._build_indexes(self.glossary_registry.snapshot)
+
+            # 先跑一次分詞，載入 jieba 與 MeCab 的詞典
+            for lang in self._language_indexes:
+                self._tokenize_text("warm up 預熱", lang)
+
+            # 行程模式的 worker 在第一次提交工作時才會啟動並載入術語表
+            futures = [
+                executor.submit(_process_text_in_worker, "", lang, self.glossary_version)
+                for lang, executor in self.executors.items()
+                if isinstance(executor, ProcessPoolExecutor)
+            ]
+            for future in futures:
+                future.result()
+        except BaseException as e:
+            print(f"❌ TermMatcher 預熱失敗: {e}")
+            self._ready.set_exception(e)
+            return
+
+        elapsed = time.perf_counter() - start
+        print(f"✅ TermMatcher 預熱完成，耗時 {elapsed:.2f} 秒")
+        self._ready.set_result(elapsed)
+
+    @property
+    def _indexes(self) -> dict:
+        """各語言的比對索引，預熱完成前會等待同一次預熱，而不會重複載入"""
+        indexes = self._language_indexes
+        if indexes is None:
+            self.wait_until_ready()
+            indexes = self._language_indexes
+        return indexes
+
+    @property
+    def mecab(self) -> MeCab.Tagger:
+        """每個執行緒各自建立一個 MeCab Tagger"""
+        tagger = getattr(self._local, "mecab", None)
+        if tagger is None:
+            tagger = self._local.mecab = MeCab.Tagger("-Owakati")
+        return tagger
+
+    @property
+    def term_dicts(self) -> dict:
+        """各語言目前使用中的唯讀術語字典"""
+        return {lang: index.term_dict for lang, index in self._indexes.items()}
+
+    @property
+    def glossary_version(self) -> int:
+        """目前比對索引所使用的術語表版本"""
+        return next(iter(self._indexes.values())).version
+
+    def close(self) -> None:
+        """關閉平行處理用的 executor"""
+        for executor in set(self.executors.values()):
+            executor.shutdown(wait=False, cancel_futures=True)
+        self.executors = {}
+
+    def reload_glossaries(self) -> None:
+        """重新讀取所有語言的企業術語，重建比對索引並清空比對快取"""
+        self.glossary_registry.reload()
+
+    def _build_indexes(self, snapshot: GlossarySnapshot) -> None:
+        """依新版本術語表建立所有語言的索引，完成後一次替換"""
+        current = self._language_indexes
+        if current and next(iter(current.values())).version >= snapshot.version:
+            return  # 預熱與重新載入同時發生時，不要用舊版本覆蓋新版本
+
+        indexes = {}
+        for lang in snapshot.languages:
+            index = _LanguageIndex.from_snapshot(snapshot, lang, self.threshold)
+            index.match_cache = lru_cache(maxsize=self.cache_size)(
+                partial(self._search_best_match, index)
+            )
+            indexes[lang] = index
 
         # 只對中文加入 jieba 詞庫，其他語言不需要
-        if "Traditional Chinese" in self.term_dicts:
-            self._add_terms_to_jieba(self.term_dicts["Traditional Chinese"])
+        if "Traditional Chinese" in indexes:
+            self._add_terms_to_jieba(
+                indexes["Traditional Chinese"].term_dict, snapshot.jieba_cache
+            )
+
+        # 術語以相同的分詞器切開，多詞視窗只與逐詞對得上的術語比對
+        for lang, index in indexes.items():
+            index.term_tokens = {
+                term: tuple(self._tokenize_text(term, lang)) for term in index.term_dict
+            }
+
+        self._language_indexes = indexes
 
-    def _load_glossaries(self, file_path: str) -> dict:
-        """讀取 CSV 並建立企業術語字典"""
-        glossaries = pd.read_csv(file_path)
-        glossaries.columns = glossaries.columns.str.strip()
+    def match_cache_info(self) -> dict:
+        """
+        返回各語言比對快取的統計資料。
+        :return: { "語言名稱": {"hits", "misses", "maxsize", "currsize"} }
+        """
         return {
-            row["Proper Noun"]: row["Description"] for _, row in glossaries.iterrows()
+            lang: index.match_cache.cache_info()._asdict()
+            for lang, index in self._indexes.items()
         }
 
-    def _add_terms_to_jieba(self, term_dict: dict) -> None:
-        """將企業術語加入 jieba 詞庫，確保長詞優先匹配"""
-        sorted_terms = sorted(term_dict.keys(), key=len, reverse=True)
-        for term in sorted_terms:
-            jieba.add_word(term)
+    @staticmethod
+    def _jieba_terms(term_dict) -> list:
+        """加入 jieba 詞庫的順序：長詞優先"""
+        return sorted(term_dict.keys(), key=len, reverse=True)
+
+    def _add_terms_to_jieba(self, term_dict, jieba_cache: str = None) -> None:
+        """
+        將企業術語加入 jieba 詞庫，確保長詞優先匹配。
+        :param jieba_cache: 預先加入術語的 jieba 詞典快取，jieba 尚未初始化時直接載入，
+            省去建立前綴詞典與逐一 `add_word` 的時間
+        """
+        from_cache = (
+            jieba_cache is not None
+            and not jieba.dt.initialized
+            and load_jieba_dictionary(jieba_cache, jieba.dt)
+        )
+
+        # jieba 已初始化或快取讀取失敗時，逐一加入術語
+        for term in self._jieba_terms(term_dict):
+            if not (from_cache and jieba.dt.FREQ.get(term)):
+                jieba.add_word(term)
 
     def _tokenize_text(self, input_text: str, lang: str) -> list:
         """根據語言選擇適當的分詞方式"""
@@ -59,145 +299,348 @@ class TermMatcher:
         """使用 MeCab 進行日語分詞"""
         return self.mecab.parse(input_text).strip().split()
 
-    # 檢查是否為純英文詞
-    def is_english_word(self, word):
-        return bool(re.match(r'^[A-Za-z\s]+$', word))
-
-    def _match_terms(self, tokens: list, term_dict: dict) -> tuple:
-        """模糊比對詞彙，返回匹配的詞與相似度分數"""
-        matched_terms = []
-        similarity_scores = {}
+    def _best_match(self, token: str, index: _LanguageIndex, words: tuple = None) -> tuple:
+        """
+        找出與 token 最相似且達到閥值的術語，結果依 (token, 術語表版本, 視窗的詞) 快取
+        :param words: 多詞視窗中的各個詞，None 表示 token 是單一個詞
+        """
+        return index.match_cache(token, index.version, words)
 
+    def _search_best_match(
+        self, index: _LanguageIndex, token: str, version: int, words: tuple = None
+    ) -> tuple:
+        """
+        找出與 token 最相似且達到閥值的術語，找不到時回傳 None。
+        只對模糊索引篩出的候選術語計算 `fuzz.ratio`。
+        :param version: 術語表版本，只作為快取鍵的一部分
+        :param words: 多詞視窗中的各個詞。有指定時只與詞數相同、且每個詞與術語對應的詞
+            都達到閥值的術語比對（"the shift" 不會對上 "night shift"）；None 表示比對所有術語
+        """
+        term_dict = index.term_dict
+        best_match, best_score, best_desc = None, 0, ""
+        for term in index.fuzzy_index.candidates(token):
+            if words is not None and not self._lines_up(words, index.term_tokens[term]):
+                continue
+            score = fuzz.ratio(token, term)
+            if score >= self.threshold and score > best_score:
+                best_match, best_score, best_desc = term, score, term_dict[term]
+
+        if best_match:
+            return best_match, best_score, best_desc
+        return None
+
+    def _lines_up(self, words: tuple, term_words: tuple) -> bool:
+        """多詞視窗與術語的詞數相同，且逐詞相似度都達到閥值"""
+        return len(words) == len(term_words) and all(
+            fuzz.ratio(word, term_word) >= self.threshold
+            for word, term_word in zip(words, term_words)
+        )
+
+    def _locate_tokens(self, text: str, tokens: list, offset: int = 0) -> list:
+        """依序找出每個 token 在原文中的位置，返回 [(token, start, end), ...]"""
+        token_spans = []
+        cursor = 0
         for token in tokens:
-            best_match, best_score, best_desc = None, 0, ""
-            for term in term_dict:
-                score = fuzz.ratio(token, term)
-                if score >= self.threshold and score > best_score:
-                    best_match, best_score, best_desc = term, score, term_dict[term]
-
-            if best_match:
-                matched_terms.append((token, best_match, best_score, best_desc))
-                similarity_scores[token] = best_score
+            start = text.find(token, cursor)
+            if start == -1:
+                continue
+            token_spans.append((token, offset + start, offset + start + len(token)))
+            cursor = start + len(token)
+        return token_spans
+
+    def _match_ngrams(self, input_text: str, token_spans: list, index: _LanguageIndex) -> tuple:
+        """
+        比對一段分詞後的文字：
+        1. 多詞視窗：只與分詞後詞數相同、且逐詞對得上的多詞術語比對，
+           例如 "alignment mark" 可以對上 "Alignment mark"，"out the" 不會對上任何術語；
+        2. 單詞：與原本的 match / merge / rematch 相同，每個詞與所有術語比對，
+           但相鄰兩個詞都各自命中時，原本會合併後重新比對，合併後沒有命中就兩個都不標記
+           （例如 "print out"），合併後的比對即第 1 步的兩詞視窗。
+        :return: (最終匹配結果, 被採用的匹配的相似度分數)
+        """
+        window_sizes = index.window_sizes
+        singles = [self._best_match(token, index) for token, _, _ in token_spans]
+        final_matched = []
+        similarity_scores = {}
 
-        return matched_terms, similarity_scores
+        def accept(text, match, first, last):
+            term, score, desc = match
+            final_matched.append((text, term, score, desc, token_spans[first][1], token_spans[last][2]))
+            similarity_scores[text] = score
 
-    def _merge_adjacent_tokens(self, tokens: list, similarity_scores: dict) -> list:
-        """合併相鄰高相似度詞彙"""
-        merged_tokens = []
         i = 0
-        while i < len(tokens):
-            if i < len(tokens) - 1:
-                token1, token2 = tokens[i], tokens[i + 1]
-                if token1 in similarity_scores and token2 in similarity_scores:
-                    if (
-                        similarity_scores[token1] >= self.threshold
-                        and similarity_scores[token2] >= self.threshold
-                    ):
-                        if self.is_english_word(token1) and self.is_english_word(token2):
-                            merged_tokens.append(token1 + " " + token2)
-                        else:
-                            merged_tokens.append(token1 + token2)
-                        i += 2
-                        continue
-            merged_tokens.append(tokens[i])
-            i += 1
-        return merged_tokens
-
-    def _final_matching(self, tokens: list, term_dict: dict) -> list:
-        """重新比對合併後的詞彙，返回最終匹配結果"""
-        final_matched = []
-
-        for token in tokens:
-            best_match, best_score, best_desc = None, 0, ""
-            for term in term_dict:
-                score = fuzz.ratio(token, term)
-                if score >= self.threshold and score > best_score:
-                    best_match, best_score, best_desc = term, score, term_dict[term]
+        while i < len(token_spans):
+            window = None
+            for size in window_sizes:
+                last = i + size - 1
+                if last >= len(token_spans):
+                    continue
+                text = re.sub(r"\s+", " ", input_text[token_spans[i][1] : token_spans[last][2]])
+                words = tuple(token for token, _, _ in token_spans[i : last + 1])
+                match = self._best_match(text, index, words)
+                if match and (window is None or match[1] > window[1][1]):
+                    window = (text, match, last)
+
+            if window is not None:
+                text, match, last = window
+                accept(text, match, i, last)
+                i = last + 1
+            elif singles[i] and i + 1 < len(token_spans) and singles[i + 1]:
+                i += 2
+            elif singles[i]:
+                accept(token_spans[i][0], singles[i], i, i)
+                i += 1
+            else:
+                i += 1
 
-            if best_match:
-                final_matched.append((token, best_match, best_score, best_desc))
+        return final_matched, similarity_scores
 
-        return final_matched
+    def _leftover_segments(self, input_text: str, exact_hits: list):
+        """產生精確命中以外的文字片段 (offset, segment)"""
+        cursor = 0
+        for start, end, _ in exact_hits + [(len(input_text), len(input_text), None)]:
+            segment = input_text[cursor:start]
+            if segment.strip():
+                yield cursor, segment
+            cursor = end
 
     def annotate_text(self, input_text: str, final_matched: list) -> str:
         """
         將匹配到的專有名詞在前後標記 `==`，
-        完全依據 final_matched 列表中的專有名詞進行標記，不轉成小寫。
+        依據 final_matched 中記錄的位置 (start, end) 一次掃描完成，保留原文大小寫。
         """
-        # 依據專有名詞長度降冪排序，避免較短字串提前匹配
-        final_matched_sorted = sorted(final_matched, key=lambda x: len(x[0]), reverse=True)
-
         annotated_text = []
-        i = 0
-        n = len(input_text)
-
-        while i < n:
-            matched = False
-            for token, _, _, _ in final_matched_sorted:
-                token_len = len(token)
-                if i + token_len <= n and input_text[i:i+token_len] == token:
-                    annotated_text.append(f"=={token}==")
-                    i += token_len
-                    matched = True
-                    break
-            if not matched:
-                annotated_text.append(input_text[i])
-                i += 1
+        cursor = 0
+        for *_, start, end in sorted(final_matched, key=lambda x: x[4]):
+            if start < cursor:
+                continue
+            annotated_text.append(input_text[cursor:start])
+            annotated_text.append(f"=={input_text[start:end]}==")
+            cursor = end
+        annotated_text.append(input_text[cursor:])
 
         return "".join(annotated_text)
 
-
     def process_text(self, input_text: str, lang: str = None):
         """
         處理單語言文本。
+        先以自動機找出所有精確命中的術語，剩餘片段才進行分詞與模糊比對。
         :param input_text: 需要處理的文本
         :param lang: 指定語言（若為 None，則使用預設語言）
-        :return: (分詞後的 token 列表, 最終匹配的術語, 帶註釋的文本)
+        :return: (術語說明列表, 各詞的相似度分數, 帶註釋的文本)
         """
         if lang is None:
             lang = self.default_lang
-        if lang not in self.term_dicts:
-            raise ValueError(f"Unsupported language: {lang}")
-
-        term_dict = self.term_dicts[lang]
-        tokens = self._tokenize_text(input_text, lang)
-        _, similarity_scores = self._match_terms(tokens, term_dict)
-        merged_tokens = self._merge_adjacent_tokens(tokens, similarity_scores)
-        final_matched = self._final_matching(merged_tokens, term_dict)
+        index = self._get_index(lang)
+        final_matched, similarity_scores, _ = self._match_text(input_text, lang, index)
         annotated_text = self.annotate_text(input_text, final_matched)
         explains = [term[3] for term in final_matched]
 
         return explains, similarity_scores, annotated_text
 
-    def process_multilingual_text(self, text_dict: dict):
+    def find_terms(self, input_text: str, lang: str = None) -> list:
+        """
+        只找出文本中命中的術語（含模糊比對），不產生註釋。
+        :return: 依出現位置排序的術語列表
+        """
+        if lang is None:
+            lang = self.default_lang
+        final_matched, _, _ = self._match_text(input_text, lang, self._get_index(lang))
+        return [term for _, term, *_ in final_matched]
+
+    def process_chunk(self, input_text: str, lang: str = None, carry: str = ""):
+        """
+        處理串流中的一段文本，術語可以橫跨上一段與這一段。
+        `carry` 與 input_text 接在一起比對，但只回報延伸到 input_text 的術語，
+        且只註釋 input_text（橫跨兩段的術語只標記落在這一段的部分）。
+        :param input_text: 新的一段文本
+        :param lang: 指定語言（若為 None，則使用預設語言）
+        :param carry: 上一次呼叫返回的 carry，第一段為空字串
+        :return: (術語說明列表, 各詞的相似度分數, 帶註釋的 input_text, 交給下一段的 carry)
+        """
+        if lang is None:
+            lang = self.default_lang
+        index = self._get_index(lang)
+
+        # ASR 的每一段通常已去除前後空白，交界有英數字元時補上空白，
+        # 避免 "Cloud" + "SQL" 黏成一個詞；中日文字元之間則直接相接
+        separator = ""
+        if (
+            carry
+            and input_text
+            and not (carry[-1].isspace() or input_text[0].isspace())
+            and (_is_word_char(carry[-1]) or _is_word_char(input_text[0]))
+        ):
+            separator = " "
+        combined = carry + separator + input_text
+        offset = len(combined) - len(input_text)
+
+        final_matched, similarity_scores, token_bounds = self._match_text(combined, lang, index)
+
+        # 完全落在 carry 內的術語已在上一段回報過
+        matched = [
+            (token, term, score, desc, max(start, offset) - offset, end - offset)
+            for token, term, score, desc, start, end in final_matched
+            if end > offset
+        ]
+        annotated_text = self.annotate_text(input_text, matched)
+        explains = [term[3] for term in matched]
+
+        # 保留最後 (最長術語詞數 - 1) 個詞，足以和下一段組成任何術語
+        keep = index.max_ngram - 1
+        next_carry = combined[token_bounds[-keep:][0][0]:] if keep and token_bounds else ""
+
+        return explains, similarity_scores, annotated_text, next_carry
+
+    def stream(self) -> "StreamingTermMatcher":
+        """建立一個新的串流比對器，每個語音串流各用一個"""
+        return StreamingTermMatcher(self)
+
+    def _get_index(self, lang: str) -> _LanguageIndex:
+        index = self._indexes.get(lang)
+        if index is None:
+            raise ValueError(f"Unsupported language: {lang}")
+        return index
+
+    def _match_text(self, input_text: str, lang: str, index: _LanguageIndex) -> tuple:
+        """
+        先以自動機找出所有精確命中的術語，剩餘片段才進行分詞與模糊比對。
+        :return: (依位置排序的匹配結果, 各詞的相似度分數, 所有詞的位置 [(start, end), ...])
+        """
+        term_dict = index.term_dict
+        exact_hits = index.automaton.find(input_text)
+        if lang == "Traditional Chinese" and exact_hits:
+            # 術語已加入 jieba 詞典，精確命中若切在 jieba 的詞中間（"大夜班" 裡的 "大夜"），
+            # 交給模糊比對處理整個詞，避免剩下的 "班" 被單獨比對
+            tokens = self._tokenize_text(input_text, lang)
+            bounds = {
+                bound
+                for _, start, end in self._locate_tokens(input_text, tokens)
+                for bound in (start, end)
+            }
+            exact_hits = [hit for hit in exact_hits if hit[0] in bounds and hit[1] in bounds]
+        final_matched = [
+            (term, term, 100, term_dict[term], start, end)
+            for start, end, term in exact_hits
+        ]
+        similarity_scores = {term: 100 for _, _, term in exact_hits}
+        token_bounds = [(start, end) for start, end, _ in exact_hits]
+
+        for offset, segment in self._leftover_segments(input_text, exact_hits):
+            tokens = self._tokenize_text(segment, lang)
+            token_spans = self._locate_tokens(segment, tokens, offset)
+            matched, scores = self._match_ngrams(input_text, token_spans, index)
+            final_matched.extend(matched)
+            similarity_scores.update(scores)
+            token_bounds.extend((start, end) for _, start, end in token_spans)
+
+        final_matched.sort(key=lambda x: x[4])
+        token_bounds.sort()
+        return final_matched, similarity_scores, token_bounds
+
+    def _timed_process_text(self, input_text: str, lang: str, carry: str = None) -> tuple:
+        """
+        執行 `process_text`（有 carry 時為 `process_chunk`）並附上耗時（毫秒）
+        :return: (術語說明列表, 各詞的相似度分數, 帶註釋的文本, 耗時, 新的 carry 或 None)
+        """
+        start = time.perf_counter()
+        if carry is None:
+            explains, similarity_scores, annotated_text = self.process_text(input_text, lang)
+            next_carry = None
+        else:
+            explains, similarity_scores, annotated_text, next_carry = self.process_chunk(
+                input_text, lang, carry
+            )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        return explains, similarity_scores, annotated_text, elapsed_ms, next_carry
+
+    def process_multilingual_text(self, text_dict: dict, carries: dict = None):
         """
         處理多語言文本，依照不同語言使用對應的企業術語。
+        若有設定 executor，各語言會平行處理，結果仍依原本的順序排列。
 
         :param text_dict: {"語言": "對應的文本"}
-        :return: 相同結構的字典，但內容已加入企業術語註釋
+        :param carries: 串流模式下各語言的 carry { "語言": carry }，處理完會原地更新，
+            通常由 `StreamingTermMatcher` 持有
+        :return: 相同結構的字典，但內容已加入企業術語註釋與該語言的處理耗時 `elapsed_ms`
         """
+        results = {}
+        languages = self._indexes
+        for lang, text in text_dict.items():
+            if lang not in languages:
+                continue
+            carry = None if carries is None else carries.get(lang, "")
+            executor = self.executors.get(lang)
+            if executor is None:
+                results[lang] = self._timed_process_text(text, lang, carry)
+            elif isinstance(executor, ProcessPoolExecutor):
+                results[lang] = executor.submit(
+                    _process_text_in_worker, text, lang, self.glossary_version, carry
+                )
+            else:
+                results[lang] = executor.submit(self._timed_process_text, text, lang, carry)
+
         output_dict = {}
         for lang, text in text_dict.items():
-            if lang in self.term_dicts:
-                explains, similarity_scores, annotated_text = self.process_text(text, lang)
+            if lang in results:
+                result = results[lang]
+                if isinstance(result, Future):
+                    result = result.result()
+                explains, similarity_scores, annotated_text, elapsed_ms, next_carry = result
+                if carries is not None:
+                    carries[lang] = next_carry
                 output_dict[lang] = {
                     "value": annotated_text,
                     "explains": explains,
                     "similarity_scores": similarity_scores,
+                    "elapsed_ms": elapsed_ms,
                 }
             else:
                 output_dict[lang] = {
                     "value": text,
                     "explains": [],
                     "similarity_scores": {},
+                    "elapsed_ms": 0.0,
                 }
         return output_dict
 
 
+class StreamingTermMatcher:
+    """
+    單一語音串流的增量術語比對。
+    ASR 每隔幾秒切一段，術語（例如 "Cloud SQL"）可能被切在兩段之間；
+    這裡為每個語言保留上一段結尾的幾個詞（carry），與下一段接起來比對，
+    但只註釋新的一段。
+    """
+
+    def __init__(self, term_matcher: TermMatcher):
+        self.term_matcher = term_matcher
+        self.carries = {}  # 語言 -> 上一段結尾的文字
+
+    def reset(self) -> None:
+        """串流結束或換講者時清除 carry"""
+        self.carries.clear()
+
+    def process_text(self, input_text: str, lang: str = None):
+        """
+        處理單語言的一段文本。
+        :return: (術語說明列表, 各詞的相似度分數, 帶註釋的文本)
+        """
+        lang = lang or self.term_matcher.default_lang
+        explains, similarity_scores, annotated_text, self.carries[lang] = (
+            self.term_matcher.process_chunk(input_text, lang, self.carries.get(lang, ""))
+        )
+        return explains, similarity_scores, annotated_text
+
+    def process_multilingual_text(self, text_dict: dict):
+        """與 `TermMatcher.process_multilingual_text` 相同，但各語言的術語可以跨段比對"""
+        return self.term_matcher.process_multilingual_text(text_dict, self.carries)
+
+
 if __name__ == "__main__":
     from realtime_translate_system.config import Config
 
-    matcher = TermMatcher(Config.FILE_PATHS)
+    matcher = TermMatcher(GlossaryRegistry(Config.FILE_PATHS))
 
     input_text = '''
 
@@ -1,32 +1,123 @@
-from typing import List
+from concurrent.futures import Future
+from typing import Iterator, Optional
+
+from .translation_batcher import TranslationBatcher
+from .translation_context import TranslationContextStore
 from .translation_service import TranslationService
-from .term_matcher import TermMatcher
+from .term_matcher import StreamingTermMatcher, TermMatcher
 
 
 class TranscriptService:
     def __init__(
         self,
-        glossary_folder: List,
         translation_service: TranslationService,
         term_matcher: TermMatcher,
+        translation_batcher: TranslationBatcher = None,
+        context_store: TranslationContextStore = None,
     ):
+        """
+        :param translation_batcher: 合併同時送來的句子一起翻譯，None 表示每句各自呼叫 LLM
+        :param context_store: 各連線的翻譯上下文（最近幾句的翻譯與會議摘要），
+            None 時使用預設大小的 TranslationContextStore
+        """
         self.translation_service = translation_service
         self.term_matcher = term_matcher
-
-        self.previous_translation = None
-        self.term_dict = self.translation_service.load_term_dict(
-            glossaries_paths=glossary_folder
+        self.translation_batcher = translation_batcher
+        # 本服務為所有連線共用，上下文必須依連線分開保存，不能放在實例屬性上
+        self.context_store = (
+            context_store if context_store is not None else TranslationContextStore()
         )
 
-    def process(self, text):
+    def open_stream(self) -> StreamingTermMatcher:
+        """每個語音串流開始時建立，讓被 ASR 切成兩段的術語也能比對到"""
+        return self.term_matcher.stream()
+
+    def close_session(self, session_id) -> None:
+        """連線結束時呼叫，釋放該連線的翻譯上下文"""
+        self.context_store.close(session_id)
+
+    def _previous_translation(self, session_id):
+        """該連線目前的翻譯上下文，沒有指定連線時不使用上下文"""
+        if session_id is None:
+            return None
+        return self.context_store.get(session_id).window()
+
+    def _remember(self, session_id, translation: dict) -> None:
+        if session_id is not None:
+            self.context_store.get(session_id).add(translation)
+
+    def process(self, text, stream: StreamingTermMatcher = None, session_id=None):
+        """
+        :param stream: `open_stream()` 返回的串流比對器，None 表示每段獨立比對
+        :param session_id: 連線 ID，同一個連線的句子共用翻譯上下文；None 表示不使用上下文
+        """
         if text.strip() == "":
             return None
 
-        text = self.translation_service.translate(
-            text,
-            previous_translation=self.previous_translation,
-            term_dict=self.term_dict,
-        )
-        multilingual_text = self.term_matcher.process_multilingual_text(text)
-        data = {"status": "continue", "text": multilingual_text}
-        return data
+        previous_translation = self._previous_translation(session_id)
+        if self.translation_batcher is not None:
+            text = self.translation_batcher.translate(text, previous_translation)
+        else:
+            text = self.translation_service.translate(
+                text,
+                previous_translation=previous_translation,
+            )
+        self._remember(session_id, text)
+        return {"status": "continue", "text": self._annotate(text, stream)}
+
+    def process_stream(
+        self, text, stream: StreamingTermMatcher = None, session_id=None
+    ) -> Iterator[dict]:
+        """
+        與 `process()` 相同，但每個語言的翻譯一完成就先返回
+        `{"status": "partial", "language": 語言, "text": {語言: ...}}`，
+        全部完成後再返回與 `process()` 相同格式的完整結果。
+        """
+        if text.strip() == "":
+            return
+
+        translation = {"previous_sentence": text.strip()}
+        multilingual_text = self._annotate(dict(translation), stream)
+        for lang, value in self.translation_service.translate_stream(
+            text, previous_translation=self._previous_translation(session_id)
+        ):
+            translation[lang] = value
+            multilingual_text.update(self._annotate({lang: value}, stream))
+            yield {"status": "partial", "language": lang, "text": {lang: multilingual_text[lang]}}
+
+        self._remember(session_id, translation)
+        yield {"status": "continue", "text": multilingual_text}
+
+    def submit(self, text, session_id=None) -> Optional[Future]:
+        """
+        送出一段文字翻譯但不等待結果（例如上傳音檔時 ASR 每切出一段就送出），
+        有 TranslationBatcher 時同時送出的段落會合併成一次 LLM 呼叫。
+        段落以送出當下的翻譯上下文翻譯。
+        :return: 翻譯結果的 Future，交給 `complete()`；空白文字返回 None
+        """
+        if text.strip() == "":
+            return None
+
+        previous_translation = self._previous_translation(session_id)
+        if self.translation_batcher is not None:
+            return self.translation_batcher.submit(text, previous_translation)
+
+        future = Future()
+        try:
+            future.set_result(self.translation_service.translate(text, previous_translation))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def complete(
+        self, future: Future, stream: StreamingTermMatcher = None, session_id=None
+    ) -> dict:
+        """等待 `submit()` 的翻譯結果並標註術語，返回與 `process()` 相同格式的結果"""
+        translation = future.result()
+        self._remember(session_id, translation)
+        return {"status": "continue", "text": self._annotate(translation, stream)}
+
+    def _annotate(self, translation: dict, stream: StreamingTermMatcher = None) -> dict:
+        """標註各語言翻譯中的術語"""
+        matcher = stream or self.term_matcher
+        return matcher.process_multilingual_text(translation)
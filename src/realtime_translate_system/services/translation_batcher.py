@@ -0,0 +1,107 @@
+import contextvars
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from realtime_translate_system.services.translation_service import TranslationService
+
+
+class TranslationBatcher:
+    """
+    將短時間內送來的句子合併成一次 LLM 呼叫（`TranslationService.translate_batch()`）。
+    第一句進來後最多等待 window 秒或湊滿 max_batch_size 句就送出，
+    多批可以同時進行，一批的 LLM 呼叫較慢時不會擋住下一批。
+    每批在送出句子的呼叫端的 contextvars 中執行（例如 `llm_session`、`llm_deadline`），
+    只有上下文變數相同的句子才會合併在同一批。
+    """
+
+    def __init__(
+        self,
+        translation_service: TranslationService,
+        window: float = 0.15,
+        max_batch_size: int = 8,
+        max_concurrency: int = 4,
+    ):
+        """
+        :param window: 等待更多句子的時間（秒）
+        :param max_batch_size: 一次 LLM 呼叫最多翻譯的句子數
+        :param max_concurrency: 同時進行的 LLM 呼叫數量上限
+        """
+        self.translation_service = translation_service
+        self.window = window
+        self.max_batch_size = max_batch_size
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0  # 已送出、尚未組成批次的句子數
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="translation-batch"
+        )
+        self._thread = threading.Thread(
+            target=self._collect, name="translation-batcher", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, content: str, previous_translation: dict = None) -> Future:
+        """送出一句待翻譯的句子，Future 的結果與 `TranslationService.translate()` 相同"""
+        future = Future()
+        with self._lock:
+            self._pending += 1
+        self._queue.put((content, previous_translation, future, contextvars.copy_context()))
+        return future
+
+    def translate(self, content: str, previous_translation: dict = None) -> dict:
+        """
+        `submit()` 並等待結果。沒有其他句子等待合併時直接翻譯，
+        不必為了單獨一句等待 window 秒。
+        """
+        with self._lock:
+            idle = self._pending == 0
+        if idle:
+            return self.translation_service.translate(content, previous_translation)
+        return self.submit(content, previous_translation).result()
+
+    def _collect(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            with self._lock:
+                self._pending -= len(batch)
+            for context, items in self._group_by_context(batch):
+                self._executor.submit(context.run, self._translate_batch, items)
+
+    @staticmethod
+    def _group_by_context(batch: list) -> list:
+        """依呼叫端的上下文變數分組，返回 [(context, [(content, previous, future), ...]), ...]"""
+        groups = []
+        for content, previous, future, context in batch:
+            values = dict(context)
+            for group_values, group_context, items in groups:
+                if group_values == values:
+                    items.append((content, previous, future))
+                    break
+            else:
+                groups.append((values, context, [(content, previous, future)]))
+        return [(context, items) for _, context, items in groups]
+
+    def _translate_batch(self, batch: list) -> None:
+        contents = [content for content, _, _ in batch]
+        previous_translations = [previous for _, previous, _ in batch]
+        try:
+            results = self.translation_service.translate_batch(contents, previous_translations)
+        except Exception as e:
+            print(f"❌ 批次翻譯失敗: {e}")
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+_WHITESPACE = re.compile(r"\s+")
+# 句尾標點不影響翻譯結果（"謝謝" 與 "謝謝。" 共用快取），問號會改變語氣所以保留
+_TRAILING_PUNCTUATION = re.compile(r"[\s。．.!！,，、~～…]+$")
+
+
+def normalize_sentence(sentence: str) -> str:
+    """快取鍵用的正規化：全半形統一、合併空白、去除句尾標點"""
+    sentence = unicodedata.normalize("NFKC", sentence)
+    sentence = _WHITESPACE.sub(" ", sentence).strip()
+    return _TRAILING_PUNCTUATION.sub("", sentence)
+
+
+class TranslationCache:
+    """
+    兩層翻譯快取：記憶體 LRU 在前，SQLite 在後（重啟後仍有效）。
+    鍵由正規化後的句子、術語表指紋與（可選的）上下文雜湊組成，
+    兩層都依 TTL 過期，SQLite 超過上限時淘汰最久未使用的項目。
+    """
+
+    def __init__(
+        self,
+        db_path=None,
+        memory_size: int = 1024,
+        ttl: float = 7 * 24 * 3600,
+        max_entries: int = 100_000,
+        context_free_length: int = 12,
+    ):
+        """
+        :param db_path: SQLite 檔案路徑，None 表示只使用記憶體
+        :param memory_size: 記憶體 LRU 的項目數量上限
+        :param ttl: 快取有效時間（秒）
+        :param max_entries: SQLite 的項目數量上限
+        :param context_free_length: 正規化後不超過此長度的短句（"謝謝"、"好的"）不考慮上下文
+        """
+        self.memory_size = memory_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.context_free_length = context_free_length
+
+        self._memory = OrderedDict()  # 鍵 -> (翻譯結果, 寫入時間)
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(
+            ("memory_hits", "disk_hits", "misses", "writes", "expired", "evicted"), 0
+        )
+
+        self._db = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translations (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS translations_accessed_at ON translations (accessed_at)"
+            )
+            self._db.commit()
+            self.purge_expired()
+
+    def make_key(
+        self, sentence: str, glossary_fingerprint: str, context=None, namespace: str = ""
+    ) -> str:
+        """
+        :param sentence: 原句
+        :param glossary_fingerprint: 術語表內容的指紋，術語表一更新舊的翻譯就不再使用
+        :param context: 影響翻譯的上下文（例如上一句的翻譯），短句會忽略
+        :param namespace: 其他影響提示的設定（例如術語注入模式）
+        """
+        normalized = normalize_sentence(sentence)
+        parts = [namespace, glossary_fingerprint, normalized]
+        if context and len(normalized) > self.context_free_length:
+            parts.append(json.dumps(context, ensure_ascii=False, sort_keys=True))
+        return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if now - created_at < self.ttl:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._memory[key]
+                self._counters["expired"] += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] < self.ttl:
+                    self._db.execute(
+                        "UPDATE translations SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    self._db.commit()
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self._counters["disk_hits"] += 1
+                    return value
+                if row is not None:
+                    self._db.execute("DELETE FROM translations WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._counters["expired"] += 1
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: dict) -> None:
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._counters["writes"] += 1
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), now, now),
+                )
+                self._evict_disk()
+                self._db.commit()
+
+    def _remember(self, key: str, value: dict, created_at: float) -> None:
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        """超過上限時刪除最久未使用的項目，一次刪到上限的 90%，避免每次寫入都要淘汰"""
+        (count,) = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()
+        if count <= self.max_entries:
+            return
+        excess = count - int(self.max_entries * 0.9)
+        self._db.execute(
+            "DELETE FROM translations WHERE key IN "
+            "(SELECT key FROM translations ORDER BY accessed_at LIMIT ?)",
+            (excess,),
+        )
+        self._counters["evicted"] += excess
+
+    def purge_expired(self) -> int:
+        """刪除 SQLite 中已過期的項目，返回刪除數量"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            cursor = self._db.execute(
+                "DELETE FROM translations WHERE created_at < ?", (time.time() - self.ttl,)
+            )
+            self._db.commit()
+            self._counters["expired"] += cursor.rowcount
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        """快取命中率等統計資料"""
+        with self._lock:
+            stats = dict(self._counters)
+            stats["memory_entries"] = len(self._memory)
+            if self._db is not None:
+                stats["disk_entries"] = self._db.execute(
+                    "SELECT COUNT(*) FROM translations"
+                ).fetchone()[0]
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self) -> None:
+        if self._db is not None:
+            with self._lock:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,240 @@
+import threading
+import time
+import unicodedata
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.ai_service import LLMService
+from realtime_translate_system.services.llm_router import llm_task
+
+
+LANGUAGES = (Language.TW, Language.EN, Language.DE, Language.JP)
+_FIELDS = ("previous_sentence", *LANGUAGES)
+
+
+def estimate_tokens(text: str) -> int:
+    """粗估 token 數：中日文等全形字每字約一個 token，其他文字約四個字元一個 token"""
+    wide = sum(1 for ch in text if unicodedata.east_asian_width(ch) in "WF")
+    return wide + (len(text) - wide + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """保留開頭不超過 max_tokens 的部分，截斷時結尾加上 "…" """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) + 1 <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + "…"
+
+
+class TranslationContext:
+    """
+    單一連線（會議）的翻譯上下文：最近 max_sentences 句的原句與翻譯，
+    以及（有 summarizer 時）更早的句子的滾動摘要。
+    `window()` 返回的上下文估計不超過 max_tokens 個 token，提示長度不會隨會議變長。
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 3,
+        max_tokens: int = 600,
+        summarizer: "ContextSummarizer" = None,
+    ):
+        """
+        :param max_sentences: 保留最近幾句的原句與翻譯
+        :param max_tokens: 上下文（摘要與各句）的 token 上限
+        :param summarizer: 把移出視窗的句子併入摘要，None 表示不做摘要
+        """
+        self.max_tokens = max_tokens
+        self.summarizer = summarizer
+        self.summary = ""
+        self.last_active = time.monotonic()
+
+        self._lock = threading.Lock()
+        self._sentences = deque(maxlen=max_sentences)
+        self._evicted = []  # 已移出視窗、尚未併入摘要的句子
+        self._summarizing = False
+
+    def add(self, translation: dict) -> None:
+        """
+        加入一句翻譯完成的結果（`TranslationService.translate()` 的返回值）。
+        缺少任一語言的結果不加入，避免把 "None" 當成上下文。
+        """
+        pair = {field: str(translation.get(field) or "") for field in _FIELDS}
+        if not all(pair.values()) or "None" in pair.values():
+            return
+
+        with self._lock:
+            self.last_active = time.monotonic()
+            if len(self._sentences) == self._sentences.maxlen:
+                self._evicted.append(self._sentences[0])
+            self._sentences.append(pair)
+
+            if (
+                self.summarizer is None
+                or self._summarizing
+                or len(self._evicted) < self.summarizer.every
+            ):
+                return
+            pending, self._evicted = self._evicted, []
+            self._summarizing = True
+            summary = self.summary
+        self.summarizer.submit(self, summary, pending)
+
+    def update_summary(self, summary: Optional[str]) -> None:
+        """由 summarizer 在摘要完成（或失敗，summary 為 None）時呼叫"""
+        with self._lock:
+            if summary:
+                self.summary = summary
+            self._summarizing = False
+
+    def window(self) -> Optional[dict]:
+        """
+        :return: 最近一句的原句與翻譯（與 `previous_translation` 相同的格式），
+            加上 "history"（更早的句子，由舊到新）與 "summary"；還沒有任何句子時返回 None。
+            超過 token 上限時先捨棄較早的句子，最近一句則截短各欄位。
+        """
+        with self._lock:
+            sentences = list(self._sentences)
+            summary = self.summary
+        if not sentences:
+            return None
+
+        budget = self.max_tokens
+        summary = truncate_to_tokens(summary, budget // 4) if summary else ""
+        budget -= estimate_tokens(summary)
+
+        latest = sentences[-1]
+        if self._pair_tokens(latest) > budget:
+            per_field = max(budget // len(_FIELDS), 1)
+            latest = {field: truncate_to_tokens(value, per_field) for field, value in latest.items()}
+        budget -= self._pair_tokens(latest)
+
+        history = []
+        for pair in reversed(sentences[:-1]):
+            tokens = self._pair_tokens(pair)
+            if tokens > budget:
+                break
+            history.insert(0, pair)
+            budget -= tokens
+
+        return {**latest, "history": history, "summary": summary}
+
+    @staticmethod
+    def _pair_tokens(pair: dict) -> int:
+        return sum(estimate_tokens(value) for value in pair.values())
+
+
+class ContextSummarizer:
+    """
+    在背景以 LLM 把移出視窗的句子併入會議的滾動摘要，翻譯不必等待摘要完成。
+    同一個連線同時只進行一次摘要，期間移出的句子留到下一次。
+    """
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        max_tokens: int = 150,
+        every: int = 3,
+        max_workers: int = 2,
+    ):
+        """
+        :param max_tokens: 摘要的 token 上限
+        :param every: 累積幾句移出視窗的句子才更新一次摘要
+        :param max_workers: 同時進行摘要的 LLM 呼叫數
+        """
+        self.llm_service = llm_service
+        self.max_tokens = max_tokens
+        self.every = every
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="context-summary"
+        )
+
+    def submit(self, context: TranslationContext, summary: str, sentences: list) -> None:
+        self._executor.submit(self._summarize, context, summary, sentences)
+
+    def _summarize(self, context: TranslationContext, summary: str, sentences: list) -> None:
+        transcript = "\n".join(f"- {pair[Language.EN]}" for pair in sentences)
+        prompt = f"""
+        You maintain a running summary of a meeting that is being translated live.
+        Update the summary with the new sentences below. Keep people's names, product names and technical terms exactly as written, and keep only what helps translate later sentences consistently.
+        Return only the updated summary in English, in at most {self.max_tokens * 3 // 4} words.
+
+        **Current Summary:**
+        {summary or "(empty)"}
+
+        **New Sentences:**
+        {transcript}
+        """
+        try:
+            with llm_task("context_summary"):
+                response = self.llm_service.query(
+                    [prompt], {"max_output_tokens": self.max_tokens * 2, "temperature": 0.2}
+                )
+            context.update_summary(truncate_to_tokens(response.strip(), self.max_tokens))
+        except Exception as e:
+            print(f"⚠️ 翻譯上下文摘要失敗，保留原本的摘要: {e}")
+            context.update_summary(None)
+
+
+class TranslationContextStore:
+    """
+    依連線保存 TranslationContext，同時進行的會議各自獨立。
+    連線數與閒置時間皆有上限，斷線沒有通知時也不會無限累積。
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = 3,
+        max_tokens: int = 600,
+        max_sessions: int = 256,
+        idle_ttl: float = 3600,
+        summarizer: ContextSummarizer = None,
+    ):
+        """
+        :param max_sessions: 最多保存幾個連線的上下文，超過時移除最久沒有使用的
+        :param idle_ttl: 閒置超過此秒數的上下文會被移除
+        """
+        self.max_sentences = max_sentences
+        self.max_tokens = max_tokens
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.summarizer = summarizer
+
+        self._lock = threading.Lock()
+        self._contexts = OrderedDict()  # 連線 -> TranslationContext，最近使用的在最後
+
+    def get(self, session_id) -> TranslationContext:
+        """取得連線的上下文，不存在時建立"""
+        with self._lock:
+            context = self._contexts.get(session_id)
+            if context is None:
+                context = TranslationContext(self.max_sentences, self.max_tokens, self.summarizer)
+                self._contexts[session_id] = context
+            context.last_active = time.monotonic()
+            self._contexts.move_to_end(session_id)
+            self._evict()
+        return context
+
+    def close(self, session_id) -> None:
+        """連線結束時移除它的上下文"""
+        with self._lock:
+            self._contexts.pop(session_id, None)
+
+    def _evict(self) -> None:
+        expires_at = time.monotonic() - self.idle_ttl
+        while self._contexts:
+            session_id, context = next(iter(self._contexts.items()))
+            if len(self._contexts) <= self.max_sessions and context.last_active >= expires_at:
+                break
+            del self._contexts[session_id]
+
+    def __len__(self) -> int:
+        return len(self._contexts)
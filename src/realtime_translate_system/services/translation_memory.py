@@ -0,0 +1,238 @@
+import html
+import re
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from difflib import SequenceMatcher
+from typing import Iterable, NamedTuple, Optional
+
+import Levenshtein
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.translation_cache import normalize_sentence
+
+
+LANGUAGES = (Language.TW, Language.EN, Language.DE, Language.JP)
+
+_TAG = re.compile(r"<[^>]+>")
+_LINE_BREAK_TAG = re.compile(r"</p>|<br\s*/?>", re.IGNORECASE)
+
+# 比較兩句差異用的詞：中日文每個字一個詞，其他語言以連續的字母（含 can't 的撇號）或數字為一個詞
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff"
+_WORD = rf"(?:(?![{_CJK}])[^\W\d_])+"
+_TOKEN = re.compile(rf"[{_CJK}]|\d+|{_WORD}(?:['’]{_WORD})*")
+# 兩句不同的部分出現這些內容時，意思可能完全不同，不能直接沿用過去的翻譯
+_NUMBER = re.compile(r"\d|[〇零一二兩三四五六七八九十百千萬億]")
+_NEGATION = re.compile(
+    r"\b(?:not|no|never|cannot|nicht|kein\w*|nie|niemals)\b|n['’]t\b"
+    r"|[不沒没未別無无非勿]|ない|なかっ|せん|ず",
+    re.IGNORECASE,
+)
+
+
+class MemoryMatch(NamedTuple):
+    translations: dict  # { 語言: 翻譯 }
+    language: str  # 與查詢句相符的是哪個語言的句子
+    similarity: float  # 0-100，與 `fuzz.ratio` 相同尺度
+    identical: bool  # 正規化後與查詢句完全相同
+    safe: bool  # 與查詢句不同的部分沒有數字、人名或否定詞，見 `_safe_difference()`
+
+
+def _clean(text: str) -> str:
+    """去除術語註釋 `==術語==` 與編輯器的 HTML 標籤"""
+    return html.unescape(_TAG.sub("", text)).replace("==", "").strip()
+
+
+def _safe_difference(sentence: str, other: str) -> bool:
+    """
+    兩句不同的部分是否只有不影響意思的詞（語助詞、單複數、"之"）。
+    不同的部分含有數字（包括中文數字）、否定詞，或大寫開頭的詞（人名、星期、月份，
+    德文名詞也一律視為不安全）時返回 False。中文人名無法辨識，只能靠相似度門檻。
+    """
+    spans = [[match.span() for match in _TOKEN.finditer(text)] for text in (sentence, other)]
+    words = [
+        [text[start:end].casefold() for start, end in text_spans]
+        for text, text_spans in zip((sentence, other), spans)
+    ]
+    matcher = SequenceMatcher(None, *words, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        for text, text_spans, first, last in (
+            (sentence, spans[0], i1, i2),
+            (other, spans[1], j1, j2),
+        ):
+            if first == last:
+                continue
+            changed = text[text_spans[first][0] : text_spans[last - 1][1]]
+            if (
+                _NUMBER.search(changed)
+                or _NEGATION.search(changed)
+                or any(text[start].isupper() for start, _ in text_spans[first:last])
+            ):
+                return False
+    return True
+
+
+class TranslationMemory:
+    """
+    過去的四語翻譯（已存的會議紀錄與即時翻譯結果），以字元二元組（bigram）倒排索引做模糊查詢。
+    每筆翻譯的四個語言都會建立索引，原句不論是哪種語言都能找到。
+    """
+
+    def __init__(self, max_entries: int = 50_000, candidates: int = 20, scan_budget: int = 20_000):
+        """
+        :param max_entries: 最多保留的翻譯筆數，超過時淘汰最早加入的
+        :param candidates: 以 bigram 重疊數排序後，只驗證前幾名的相似度
+        :param scan_budget: 每次查詢最多走訪的倒排索引項目數，由最少見的 bigram 開始，
+            常見的 bigram（"的問"、"th"）索引很長，略過它們才能維持查詢時間
+        """
+        self.max_entries = max_entries
+        self.candidates = candidates
+        self.scan_budget = scan_budget
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 編號 -> { 語言: 翻譯 }
+        # 索引中的每個句子以 編號 * 4 + 語言在 LANGUAGES 中的位置 表示
+        self._grams = {}  # 句子 -> (正規化後的句子, bigram 集合)
+        self._postings = defaultdict(set)  # bigram -> {句子}
+        self._keys = {}  # 正規化後的中文與英文 -> 編號，避免重複加入
+        self._next_id = 0
+        self._counters = dict.fromkeys(("lookups", "hits", "misses"), 0)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return normalize_sentence(text).casefold()
+
+    @staticmethod
+    def _bigrams(text: str) -> set:
+        if len(text) < 2:
+            return {text} if text else set()
+        return {text[i : i + 2] for i in range(len(text) - 1)}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, translations: dict) -> bool:
+        """
+        加入一筆四語翻譯。
+        :param translations: { 語言: 翻譯 }，缺少任一語言或與既有的翻譯重複時不加入
+        :return: 是否有加入
+        """
+        texts = {lang: _clean(str(translations.get(lang) or "")) for lang in LANGUAGES}
+        if not all(texts.values()) or "None" in texts.values():
+            return False
+        key = (self._normalize(texts[Language.TW]), self._normalize(texts[Language.EN]))
+
+        with self._lock:
+            if key in self._keys:
+                return False
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = texts
+            self._keys[key] = entry_id
+            for position, lang in enumerate(LANGUAGES):
+                normalized = self._normalize(texts[lang])
+                grams = self._bigrams(normalized)
+                key = entry_id * 4 + position
+                self._grams[key] = (normalized, grams)
+                for gram in grams:
+                    self._postings[gram].add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+        return True
+
+    def _evict_oldest(self) -> None:
+        entry_id, texts = self._entries.popitem(last=False)
+        self._keys.pop(
+            (self._normalize(texts[Language.TW]), self._normalize(texts[Language.EN])), None
+        )
+        for position in range(len(LANGUAGES)):
+            key = entry_id * 4 + position
+            _, grams = self._grams.pop(key)
+            for gram in grams:
+                posting = self._postings[gram]
+                posting.discard(key)
+                if not posting:
+                    del self._postings[gram]
+
+    def load_documents(self, documents: Iterable) -> int:
+        """
+        從已存的會議紀錄（`documents` 資料表）建立翻譯記憶。
+        逐字稿每行一句、四個語言逐行對應；行數不一致（例如在編輯器中改過）的紀錄會略過。
+        :return: 加入的句數
+        """
+        added = skipped = 0
+        for doc in documents:
+            columns = (
+                doc.transcript_chinese,
+                doc.transcript_english,
+                doc.transcript_german,
+                doc.transcript_japanese,
+            )
+            lines = [
+                [line for line in _LINE_BREAK_TAG.sub("\n", column or "").split("\n") if _clean(line)]
+                for column in columns
+            ]
+            if len({len(column) for column in lines}) != 1:
+                skipped += 1
+                continue
+            for row in zip(*lines):
+                added += self.add(dict(zip(LANGUAGES, row)))
+        print(f"✅ 翻譯記憶已載入 {added} 句（略過 {skipped} 份各語言行數不一致的紀錄）")
+        return added
+
+    def lookup(self, sentence: str, min_similarity: float) -> Optional[MemoryMatch]:
+        """
+        找出最相似的過去翻譯。
+        由最少見的 bigram 開始走訪倒排索引（至多 scan_budget 項）找出候選句，
+        依與查詢句共用的 bigram 數排序，前幾名以 `Levenshtein.ratio` 驗證。
+        :param min_similarity: 相似度下限 (0-100)
+        """
+        query = self._normalize(_clean(sentence))
+        grams = self._bigrams(query)
+        if not grams:
+            return None
+
+        with self._lock:
+            self._counters["lookups"] += 1
+            postings = sorted(
+                (self._postings[gram] for gram in grams if gram in self._postings), key=len
+            )
+            partial = Counter()
+            scanned = 0
+            for posting in postings:
+                if scanned and scanned + len(posting) > self.scan_budget:
+                    break
+                partial.update(posting)
+                scanned += len(posting)
+
+            # 只掃描了部分 bigram，先取較多候選句，再以完整的 bigram 重疊數排序
+            overlaps = Counter({
+                key: len(grams & self._grams[key][1])
+                for key, _ in partial.most_common(self.candidates * 10)
+            })
+
+            best = None
+            for key, _ in overlaps.most_common(self.candidates):
+                similarity = Levenshtein.ratio(query, self._grams[key][0]) * 100
+                if similarity >= min_similarity and (best is None or similarity > best[1]):
+                    best = (key, similarity)
+
+            if best is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            (entry_id, position), similarity = divmod(best[0], 4), best[1]
+            translations = dict(self._entries[entry_id])
+            identical = self._grams[best[0]][0] == query
+
+        language = LANGUAGES[position]
+        safe = identical or _safe_difference(
+            normalize_sentence(_clean(sentence)), normalize_sentence(translations[language])
+        )
+        return MemoryMatch(translations, language, similarity, identical, safe)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counters, entries=len(self._entries))
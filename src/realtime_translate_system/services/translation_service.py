@@ -1,12 +1,104 @@
-import pandas as pd
+import itertools
+import json
+import threading
 import time
+from typing import Iterator, Tuple
 from realtime_translate_system.config import Language
 from realtime_translate_system.services.ai_service import LLMService
+from realtime_translate_system.services import json_repair
+from realtime_translate_system.services.json_stream import IncrementalJSONObjectParser
+from realtime_translate_system.services.llm_client import llm_deadline
+from realtime_translate_system.services.glossary_registry import (
+    GlossaryRegistry,
+    GlossarySnapshot,
+)
+from realtime_translate_system.services.term_matcher import TermMatcher
+from realtime_translate_system.services.translation_cache import TranslationCache
+from realtime_translate_system.services.translation_memory import (
+    MemoryMatch,
+    TranslationMemory,
+)
+
+
+# 日文術語的片假名讀音，協助模型在日文翻譯中使用正確的寫法
+KATAKANA_DICT = {
+    "DDR Ratio": "ディーディーアール レシオ",
+    "EC": "イルシ",
+    "ECS": "イルシエス",
+    "ECCP": "イルシシーピー",
+    "ECN": "イルシエヌ",
+    "Emergency stop": "エマージェンシー ストップ",
+    "Alignment mark": "アライメント マーク",
+    "ALP": "エーエルピー",
+    "STB": "エスティービー",
+    "STK": "エスティーケー",
+    "Route": "ルート",
+    "Scrap": "スクラップ",
+    "Sorter": "ソーター",
+    "Split": "スプリット",
+    "夜勤": "ヤキン",
+    "準夜勤": "ジュンヤキン",
+    "日勤": "ニッキン",
+    "マスク": "マスク",
+    "DP": "ディーピー",
+    "SGP": "エスジーピー",
+    "ETP": "イーティーピー",
+    "Cloud Run": "クラウド ラン",
+    "Cloud Function": "クラウド ファンクション",
+    "BigQuery": "ビッグクエリ",
+    "Pub/Sub": "パブサブ",
+    "Cloud SQL": "クラウド エスキューエル",
+    "Artifact Registry": "アーティファクト レジストリ",
+    "Cloud Storage": "クラウド ストレージ",
+    "GKE": "ジーケーイー",
+    "Vertex AI": "バーテックス エーアイ",
+}
 
 
 class TranslationService:
-    def __init__(self, llm_service: LLMService):
+    LANGUAGES = (Language.TW, Language.EN, Language.DE, Language.JP)
+
+    def __init__(
+        self,
+        llm_service: LLMService,
+        glossary_registry: GlossaryRegistry,
+        term_matcher: TermMatcher = None,
+        term_injection: str = "full",
+        translation_cache: TranslationCache = None,
+        translation_memory: TranslationMemory = None,
+        memory_reuse_threshold: float = 95,
+        memory_hint_threshold: float = 75,
+    ):
+        """
+        :param term_matcher: 預先掃描原句用的術語比對器，term_injection 為 "relevant" 時必須提供
+        :param term_injection: 提示中放入哪些術語。"full" 為整份術語表，
+            "relevant" 只放原句中精確或模糊命中的術語
+        :param translation_cache: 重複語句的翻譯快取，None 表示每句都呼叫 LLM
+        :param translation_memory: 過去翻譯的模糊查詢，None 表示不使用
+        :param memory_reuse_threshold: 相似度 (0-100) 達到此值、且不同的部分沒有數字、人名或否定詞時，
+            直接使用過去的翻譯（正規化後完全相同的句子一律直接使用）
+        :param memory_hint_threshold: 相似度達到此值時，把過去的翻譯放進提示作為參考
+        """
+        if term_injection not in ("full", "relevant"):
+            raise ValueError(f"Unsupported term injection mode: {term_injection}")
+        if term_injection == "relevant" and term_matcher is None:
+            raise ValueError("term_matcher is required for relevant term injection")
+
         self.llm_service = llm_service
+        self.glossary_registry = glossary_registry
+        self.term_matcher = term_matcher
+        self.term_injection = term_injection
+        self.translation_cache = translation_cache
+        self.translation_memory = translation_memory
+        self.memory_reuse_threshold = memory_reuse_threshold
+        self.memory_hint_threshold = memory_hint_threshold
+        self._full_term_dict = None  # (術語表版本, 格式化後的整份術語表)
+
+        self._lock = threading.Lock()
+        # 每句翻譯的來源：翻譯快取、翻譯記憶或 LLM；memory_hints 為提示中附上參考翻譯的次數
+        self._served = dict.fromkeys(("cache", "memory", "llm", "memory_hints"), 0)
+        # "relevant" 模式下放進提示的術語筆數與字元數，以及整份術語表的字元數
+        self._term_prompts = dict.fromkeys(("prompts", "rows", "chars", "full_chars"), 0)
 
         self.generation_config = {
             "candidate_count": 1,
@@ -17,12 +109,198 @@ class TranslationService:
         }
 
     def translate(
-        self, content: str, previous_translation: dict = None, term_dict: str = ""
+        self, content: str, previous_translation: dict = None, term_dict: str = None
     ) -> str:
         """
         進行翻譯並回傳結果
+        :param term_dict: 指定的專有名詞對應表，None 時依 term_injection 模式產生
+            （指定時不使用翻譯快取）
+        """
+        cache_key = None
+        if self.translation_cache is not None and term_dict is None:
+            cache_key = self._cache_key(content, previous_translation)
+            cached = self.translation_cache.get(cache_key)
+            if cached is not None:
+                self._record("cache")
+                return {"previous_sentence": content.strip(), **cached}
+
+        reused, hint = self._recall(content)
+        if reused is not None:
+            self._record("memory")
+            return {"previous_sentence": content.strip(), **reused}
+
+        return self._query_single(content, previous_translation, cache_key, hint, term_dict)
+
+    def _query_single(
+        self,
+        content: str,
+        previous_translation: dict,
+        cache_key: str,
+        hint: MemoryMatch = None,
+        term_dict: str = None,
+    ) -> dict:
+        """
+        快取與翻譯記憶都沒有命中（已查詢過）的句子：以單句提示呼叫 LLM，並存入快取與翻譯記憶。
+        :param cache_key: 翻譯快取的鍵，None 表示不快取
+        :param hint: `_recall()` 找到的相似句子
+        """
+        if term_dict is None:
+            term_dict = self.term_dict_for(content)
+
+        prompt = self._build_prompt(content, previous_translation, term_dict, hint)
+        self._record("llm", hint)
+        # 修正 JSON 格式的請求只能使用翻譯請求剩下的時間
+        with llm_deadline():
+            response = self.llm_service.query([prompt], self.generation_config)
+            parsed_response = self.llm_service.parse_json_response(response)
+
+        translations = {
+            Language.TW: parsed_response.get(Language.TW, "None"),
+            Language.EN: parsed_response.get(Language.EN, "None"),
+            Language.DE: parsed_response.get(Language.DE, "None"),
+            Language.JP: parsed_response.get(Language.JP, "None"),
+        }
+        # 解析失敗或缺少語言的結果不快取，下次遇到同一句仍重新翻譯
+        if all(lang in parsed_response for lang in translations):
+            self._remember(cache_key, translations)
+
+        return {"previous_sentence": content.strip(), **translations}
+
+    def translate_stream(
+        self, content: str, previous_translation: dict = None
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        與 `translate()` 相同，但以串流方式呼叫 LLM，每個語言的翻譯一完成就返回 (語言, 翻譯)，
+        只看中文或英文的聽眾不必等日文翻譯完成。
+        串流中沒有解析到的語言，會在輸出結束後以完整的回應重新解析。
+        """
+        cache_key = None
+        if self.translation_cache is not None:
+            cache_key = self._cache_key(content, previous_translation)
+            cached = self.translation_cache.get(cache_key)
+            if cached is not None:
+                self._record("cache")
+                yield from cached.items()
+                return
+
+        reused, hint = self._recall(content)
+        if reused is not None:
+            self._record("memory")
+            yield from reused.items()
+            return
+
+        prompt = self._build_prompt(
+            content, previous_translation, self.term_dict_for(content), hint
+        )
+        self._record("llm", hint)
+
+        parser = IncrementalJSONObjectParser()
+        translations = {}
+        chunks = []
+        # 修正 JSON 格式的請求只能使用串流請求剩下的時間；期限在送出請求時開始，
+        # 只在呼叫 LLM 的期間進入，不跨過 yield
+        deadline = llm_deadline()
+        with deadline:
+            stream = iter(self.llm_service.query_stream([prompt], self.generation_config))
+            first_chunk = next(stream, None)
+        for chunk in itertools.chain([first_chunk] if first_chunk is not None else [], stream):
+            chunks.append(chunk)
+            for lang, value in parser.feed(chunk):
+                if lang in self.LANGUAGES and lang not in translations:
+                    translations[lang] = value
+                    yield lang, value
+
+        missing = [lang for lang in self.LANGUAGES if lang not in translations]
+        if missing:
+            with deadline:
+                parsed_response = self.llm_service.parse_json_response("".join(chunks))
+
+        complete = True
+        for lang in missing:
+            complete = complete and lang in parsed_response
+            translations[lang] = parsed_response.get(lang, "None")
+            yield lang, translations[lang]
+
+        if complete:
+            self._remember(cache_key, {lang: translations[lang] for lang in self.LANGUAGES})
+
+    def _recall(self, content: str) -> tuple:
+        """
+        在翻譯記憶中找相似的過去翻譯。
+        相似度再高也可能只差一個否定詞（can / cannot）、人名或數字，意思完全不同，
+        因此只有完全相同、或相似度達到 memory_reuse_threshold 且不同的部分沒有這些詞的句子
+        （例如只差語助詞或「之」）才直接沿用，其餘達到 memory_hint_threshold 的句子改為提示。
+        :return: (可直接使用的 { 語言: 翻譯 }, 要放進提示的 MemoryMatch)，至多一個不是 None
+        """
+        if self.translation_memory is None:
+            return None, None
+        match = self.translation_memory.lookup(content, self.memory_hint_threshold)
+        if match is None:
+            return None, None
+        if match.identical or (match.safe and match.similarity >= self.memory_reuse_threshold):
+            return match.translations, None
+        return None, match
+
+    def _remember(self, cache_key: str, translations: dict) -> None:
+        """把 LLM 完整的翻譯結果存入翻譯快取與翻譯記憶"""
+        if cache_key is not None:
+            self.translation_cache.put(cache_key, translations)
+        if self.translation_memory is not None:
+            self.translation_memory.add(translations)
+
+    def _record(self, source: str, hint: MemoryMatch = None) -> None:
+        with self._lock:
+            self._served[source] += 1
+            if hint is not None:
+                self._served["memory_hints"] += 1
+
+    def stats(self) -> dict:
+        """各來源的翻譯句數，以及不必呼叫 LLM 的比例"""
+        with self._lock:
+            stats = dict(self._served)
+        sentences = stats["cache"] + stats["memory"] + stats["llm"]
+        stats["sentences"] = sentences
+        stats["served_without_llm"] = (
+            round((stats["cache"] + stats["memory"]) / sentences, 4) if sentences else None
+        )
+        if self.translation_memory is not None:
+            stats["translation_memory"] = self.translation_memory.stats()
+        if self.term_injection != "full":
+            stats["term_prompts"] = self._term_prompt_stats()
+        return stats
+
+    def _term_prompt_stats(self) -> dict:
+        """術語提示的平均筆數、字元數，以及相較於整份術語表減少的字元比例"""
+        with self._lock:
+            counts = dict(self._term_prompts)
+        prompts = counts["prompts"]
+        return {
+            "prompts": prompts,
+            "avg_rows": round(counts["rows"] / prompts, 2) if prompts else None,
+            "avg_chars": round(counts["chars"] / prompts, 1) if prompts else None,
+            "char_reduction": (
+                round(1 - counts["chars"] / counts["full_chars"], 4)
+                if counts["full_chars"]
+                else None
+            ),
+        }
+
+    def _build_prompt(
+        self,
+        content: str,
+        previous_translation: dict,
+        term_dict: str,
+        memory_hint: MemoryMatch = None,
+    ) -> str:
+        """
+        單句翻譯的提示
+        :param previous_translation: 上一句的翻譯，可另有 "history"（更早的句子）與 "summary"（會議摘要），
+            見 `TranslationContext.window()`
+        :param memory_hint: 翻譯記憶中相似句子的翻譯，放在上下文中作為參考
         """
         previous_translation_text = ""
+        history_text = ""
+        memory_hint_text = ""
 
         if previous_translation:
             previous_translation_text = """
@@ -60,6 +338,38 @@ class TranslationService:
                 ),
             )
 
+        if previous_translation and previous_translation.get("history"):
+            history_text = "\n            - Earlier sentences, oldest first:" + "".join(
+                "\n            - {sentence} (zh: {zh} | en: {en} | de: {de} | jp: {jp})".format(
+                    sentence=pair.get("previous_sentence"),
+                    zh=pair.get(Language.TW),
+                    en=pair.get(Language.EN),
+                    de=pair.get(Language.DE),
+                    jp=pair.get(Language.JP),
+                )
+                for pair in previous_translation["history"]
+            ) + "\n            "
+        if previous_translation and previous_translation.get("summary"):
+            history_text += (
+                f"\n            - Summary of the meeting so far: {previous_translation['summary']}\n            "
+            )
+
+        if memory_hint is not None:
+            memory_hint_text = """
+            - A similar sentence was translated before. Reuse its wording and terminology where the meaning is the same, but translate any names, numbers or details that differ.
+            - Similar sentence: {sentence}
+            - Traditional Chinese: {zh}
+            - English: {en}
+            - German: {de}
+            - Japanese: {jp}
+            """.format(
+                sentence=memory_hint.translations[memory_hint.language],
+                zh=memory_hint.translations[Language.TW],
+                en=memory_hint.translations[Language.EN],
+                de=memory_hint.translations[Language.DE],
+                jp=memory_hint.translations[Language.JP],
+            )
+
         prompt = f"""
         You are a professional translator specializing in Traditional Chinese, English, German, and Japanese. Your task is to accurately translate the given sentence into these four languages while ensuring that the translation maintains **semantic meaning, grammar, and tone consistency**.
 
@@ -85,7 +395,7 @@ class TranslationService:
 
 
         3. **To ensure contextual consistency, here is the translation of the previous sentence for reference**
-            {previous_translation_text}
+            {previous_translation_text}{history_text}{memory_hint_text}
 
         4. **Output Format**
             - Your response **must be enclosed within ```json and ```**.
@@ -131,88 +441,252 @@ class TranslationService:
         **Input Sentence:**  
         {content}
         """
+        return prompt
 
-        response = self.llm_service.query([prompt], self.generation_config)
-        parsed_response = self.llm_service.parse_json_response(response)
+    def translate_batch(self, contents: list, previous_translations: list = None) -> list:
+        """
+        以一次 LLM 呼叫翻譯多個句子，結果依輸入順序返回，格式與 `translate()` 相同。
+        模型漏掉或格式錯誤的句子改以單句提示重新翻譯（不再重複查詢快取與翻譯記憶）。
+        :param contents: 原句列表
+        :param previous_translations: 各句的上一句翻譯（上下文），與 contents 逐項對應
+        """
+        previous_translations = previous_translations or [None] * len(contents)
+        results = [None] * len(contents)
 
-        return {
-            "previous_sentence": content.strip(),
-            Language.TW: parsed_response.get(Language.TW, "None"),
-            Language.EN: parsed_response.get(Language.EN, "None"),
-            Language.DE: parsed_response.get(Language.DE, "None"),
-            Language.JP: parsed_response.get(Language.JP, "None"),
-        }
+        pending = []  # 快取與翻譯記憶都沒有命中、需要呼叫 LLM 的句子索引
+        cache_keys = {}
+        hints = {}
+        for i, content in enumerate(contents):
+            if self.translation_cache is not None:
+                cache_keys[i] = self._cache_key(content, previous_translations[i])
+                cached = self.translation_cache.get(cache_keys[i])
+                if cached is not None:
+                    self._record("cache")
+                    results[i] = {"previous_sentence": content.strip(), **cached}
+                    continue
+            reused, hints[i] = self._recall(content)
+            if reused is not None:
+                self._record("memory")
+                results[i] = {"previous_sentence": content.strip(), **reused}
+                continue
+            pending.append(i)
+
+        if len(pending) == 1:
+            i = pending[0]
+            results[i] = self._query_single(
+                contents[i], previous_translations[i], cache_keys.get(i), hints[i]
+            )
+        elif pending:
+            batch_translations = self._query_batch(
+                [contents[i] for i in pending],
+                [previous_translations[i] for i in pending],
+                [hints[i] for i in pending],
+            )
+            for i, translations in zip(pending, batch_translations):
+                if translations is None:
+                    # 改以單句提示重新翻譯並記錄來源
+                    results[i] = self._query_single(
+                        contents[i], previous_translations[i], cache_keys.get(i), hints[i]
+                    )
+                    continue
+                self._record("llm", hints[i])
+                self._remember(cache_keys.get(i), translations)
+                results[i] = {"previous_sentence": contents[i].strip(), **translations}
+
+        return results
+
+    def _query_batch(self, contents: list, previous_translations: list, hints: list = None) -> list:
+        """
+        送出 JSON 陣列格式的批次翻譯提示。
+        :param hints: 各句在翻譯記憶中相似句子的 MemoryMatch（或 None），與 contents 逐項對應
+        :return: 與 contents 逐項對應的 { 語言: 翻譯 }，該句解析失敗時為 None
+        """
+        term_dict = self.term_dict_for(*contents)
+        hints = hints or [None] * len(contents)
+
+        sentences = []
+        for i, (content, previous_translation, hint) in enumerate(
+            zip(contents, previous_translations, hints)
+        ):
+            sentence = {"id": i, "sentence": content.strip()}
+            if previous_translation:
+                sentence["previous_sentence"] = previous_translation.get("previous_sentence")
+                sentence["previous_translation"] = {
+                    lang: previous_translation.get(lang) for lang in self.LANGUAGES
+                }
+            if hint is not None:
+                sentence["similar_translation"] = hint.translations
+            sentences.append(sentence)
+
+        prompt = f"""
+        You are a professional translator specializing in Traditional Chinese, English, German, and Japanese. Your task is to accurately translate EACH of the given sentences into these four languages while ensuring that the translation maintains **semantic meaning, grammar, and tone consistency**.
+
+        ### Rules:
+        1. **Input Language**
+            - Each input sentence will always be in one of the following languages: Traditional Chinese, English, German, or Japanese.
+            - If a sentence is not in one of these four languages, **return the original sentence without translation or modification**.
+            - Translate every sentence independently. Do not merge, split, or reorder sentences.
+
+        2. **Handling of Term Dictionary (STRICTLY FOLLOW THE DICTIONARY)**
+            - If a term from the Term Dictionary appears in a sentence, you **MUST use the exact translation provided in the dictionary**.
+            - **If a sentence contains an incorrect or non-standard form of a term, correct it to match the proper term in the dictionary before translating.**
+
+            **Term Dictionary (STRICTLY FOLLOW THIS LIST):**
+            {term_dict}
+
+        3. **Context**
+            - A sentence may include `previous_sentence` and `previous_translation`. Use them only to keep the translation consistent; do not translate them.
+            - A sentence may include `similar_translation`, the translation of a similar sentence from an earlier meeting. Reuse its wording and terminology where the meaning is the same, but translate any names, numbers or details that differ.
+
+        4. **Output Format**
+            - Your response **must be enclosed within ```json and ```**.
+            - **Do not include any explanations, only return the JSON array**.
+            - Return exactly one object per input sentence, with the same `id`:
+
+        ```json
+        [
+            {{
+                "id": 0,
+                "{Language.TW}": "<translated Traditional Chinese text>",
+                "{Language.EN}": "<translated English text>",
+                "{Language.DE}": "<translated German text>",
+                "{Language.JP}": "<translated Japanese text>"
+            }}
+        ]
+        ```
+
+        **Input Sentences:**
+        {json.dumps(sentences, ensure_ascii=False, indent=2)}
+        """
+
+        generation_config = dict(
+            self.generation_config,
+            max_output_tokens=min(self.generation_config["max_output_tokens"] * len(contents), 8192),
+        )
+        response = self.llm_service.query([prompt], generation_config)
+        return self._parse_batch_response(response, len(contents))
 
-    def load_term_dict(self, glossaries_path="", glossaries_paths=[]) -> str:
+    def _parse_batch_response(self, response_text: str, size: int) -> list:
         """
-        讀取並格式化專有名詞對應表
+        解析批次翻譯的 JSON 陣列（含本地修復）。整段無法解析時全部返回 None（由呼叫端逐句重試），
+        不使用 `parse_json_response()` 請 LLM 修正，避免為了少數句子重送整批。
         """
-        paths = (
-            {
-                Language.TW: glossaries_path + "/cmn-Hant-TW.csv",
-                Language.DE: glossaries_path + "/de-DE.csv",
-                Language.EN: glossaries_path + "/en-US.csv",
-                Language.JP: glossaries_path + "/ja-JP.csv",
+        results = [None] * size
+        try:
+            items = json_repair.loads(response_text)
+        except ValueError:
+            print(f"⚠️ 批次翻譯結果無法解析，{size} 句改為逐句翻譯")
+            return results
+        if not isinstance(items, list):
+            return results
+
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            # 以 id 對應原句；模型省略 id 時，只有數量相符才依位置對應
+            index = item.get("id", position if len(items) == size else None)
+            if not isinstance(index, int) or not 0 <= index < size:
+                continue
+            if all(isinstance(item.get(lang), str) for lang in self.LANGUAGES):
+                results[index] = {lang: item[lang] for lang in self.LANGUAGES}
+
+        failed = results.count(None)
+        if failed:
+            print(f"⚠️ 批次翻譯有 {failed}/{size} 句缺漏或格式錯誤，改為逐句翻譯")
+        return results
+
+    def _cache_key(self, content: str, previous_translation: dict = None) -> str:
+        """
+        翻譯快取的鍵：原句、術語表內容、術語注入模式，以及上一句的翻譯（上下文）。
+        更早的句子與會議摘要只影響用詞的一致性，不列入鍵中，否則長的會議幾乎不會命中。
+        """
+        if previous_translation:
+            previous_translation = {
+                key: value
+                for key, value in previous_translation.items()
+                if key not in ("history", "summary")
             }
-            if glossaries_path
-            else glossaries_paths
+        return self.translation_cache.make_key(
+            content,
+            self.glossary_registry.snapshot.fingerprint,
+            context=previous_translation,
+            namespace=self.term_injection,
         )
 
-        katakana_dict = {
-            "DDR Ratio": "ディーディーアール レシオ",
-            "EC": "イルシ",
-            "ECS": "イルシエス",
-            "ECCP": "イルシシーピー",
-            "ECN": "イルシエヌ",
-            "Emergency stop": "エマージェンシー ストップ",
-            "Alignment mark": "アライメント マーク",
-            "ALP": "エーエルピー",
-            "STB": "エスティービー",
-            "STK": "エスティーケー",
-            "Route": "ルート",
-            "Scrap": "スクラップ",
-            "Sorter": "ソーター",
-            "Split": "スプリット",
-            "夜勤": "ヤキン",
-            "準夜勤": "ジュンヤキン",
-            "日勤": "ニッキン",
-            "マスク": "マスク",
-            "DP": "ディーピー",
-            "SGP": "エスジーピー",
-            "ETP": "イーティーピー",
-            "Cloud Run": "クラウド ラン",
-            "Cloud Function": "クラウド ファンクション",
-            "BigQuery": "ビッグクエリ",
-            "Pub/Sub": "パブサブ",
-            "Cloud SQL": "クラウド エスキューエル",
-            "Artifact Registry": "アーティファクト レジストリ",
-            "Cloud Storage": "クラウド ストレージ",
-            "GKE": "ジーケーイー",
-            "Vertex AI": "バーテックス エーアイ",
-        }
+    def term_dict_for(self, *contents: str) -> str:
+        """
+        產生這些句子要放進提示的專有名詞對應表（批次翻譯時為各句命中術語的聯集）。
+        "relevant" 模式會累計相較於整份術語表縮減了多少，由 `stats()` 回報。
+        """
+        glossary = self.glossary_registry.snapshot
+        full_term_dict = self._get_full_term_dict(glossary)
+        if self.term_injection == "full":
+            return full_term_dict
 
-        dfs = {lang: pd.read_csv(path) for lang, path in paths.items()}
-        
-        
-        formatted_term_dict = "\n".join([
-            f"- **{dfs[Language.EN].iloc[i]['Proper Noun ']}**:"
-            f"\n  - zh: {dfs[Language.TW].iloc[i]['Proper Noun ']}, "
-            f"en: {dfs[Language.EN].iloc[i]['Proper Noun ']}, "
-            f"de: {dfs[Language.DE].iloc[i]['Proper Noun ']}, "
-            f"jp: {dfs[Language.JP].iloc[i]['Proper Noun ']} / {katakana_dict.get(dfs[Language.EN].iloc[i]['Proper Noun '], dfs[Language.JP].iloc[i]['Proper Noun '])}"
-            f"\n  - **Description**: {dfs[Language.EN].iloc[i]['Description']}"
-            for i in range(len(dfs[Language.EN]))
-        ])
+        rows = sorted(
+            {row for content in contents for row in self._relevant_rows(content, glossary)}
+        )
+        if rows:
+            term_dict = self._format_term_rows(glossary, rows)
+        else:
+            term_dict = "(No terms from the dictionary appear in this sentence.)"
+
+        with self._lock:
+            counts = self._term_prompts
+            counts["prompts"] += 1
+            counts["rows"] += len(rows)
+            counts["chars"] += len(term_dict)
+            counts["full_chars"] += len(full_term_dict)
+        return term_dict
 
-        # formatted_term_dict = "\n".join(
-        #     [
-        #         f"- {dfs[Language.EN].iloc[i]['Proper Noun ']}: {dfs[Language.TW].iloc[i]['Proper Noun ']} (繁體中文), "
-        #         f"{dfs[Language.EN].iloc[i]['Proper Noun ']} (英文), {dfs[Language.DE].iloc[i]['Proper Noun ']} (德文), "
-        #         f"{dfs[Language.JP].iloc[i]['Proper Noun ']} / {katakana_dict.get(dfs[Language.JP].iloc[i]['Proper Noun '], dfs[Language.JP].iloc[i]['Proper Noun '])} (日文)"
-        #         for i in range(len(dfs[Language.EN]))
-        #     ]
-        # )
+    def _get_full_term_dict(self, glossary: GlossarySnapshot) -> str:
+        """整份術語表的格式化結果，每個術語表版本只格式化一次"""
+        cached = self._full_term_dict
+        if cached is None or cached[0] != glossary.version:
+            cached = self._full_term_dict = (glossary.version, self.load_term_dict(glossary))
+        return cached[1]
 
+    def _relevant_rows(self, content: str, glossary: GlossarySnapshot) -> list:
+        """
+        以 TermMatcher 的索引掃描原句（原句語言未知，四種語言都掃描），
+        返回命中術語在術語表中的列號。
+        """
+        rows = set()
+        for lang in glossary.languages:
+            term_rows = glossary.term_rows(lang)
+            for term in self.term_matcher.find_terms(content, lang):
+                row = term_rows.get(term)
+                if row is not None:  # 術語表剛更新時，比對器可能還在用舊版本
+                    rows.add(row)
+        return sorted(rows)
+
+    def load_term_dict(self, glossary: GlossarySnapshot = None) -> str:
+        """
+        格式化專有名詞對應表
+        :param glossary: 指定版本的術語表，預設為共用術語表的目前版本
+        """
+        if glossary is None:
+            glossary = self.glossary_registry.snapshot
+
+        return self._format_term_rows(glossary, range(len(glossary)))
+
+    def _format_term_rows(self, glossary: GlossarySnapshot, rows) -> str:
+        """格式化術語表中指定的列"""
+        zh_terms = glossary.terms(Language.TW)
+        en_terms = glossary.terms(Language.EN)
+        de_terms = glossary.terms(Language.DE)
+        jp_terms = glossary.terms(Language.JP)
+        en_descriptions = glossary.descriptions(Language.EN)
+
+        formatted_term_dict = "\n".join([
+            f"- **{en_terms[i]}**:"
+            f"\n  - zh: {zh_terms[i]}, "
+            f"en: {en_terms[i]}, "
+            f"de: {de_terms[i]}, "
+            f"jp: {jp_terms[i]} / {KATAKANA_DICT.get(en_terms[i], jp_terms[i])}"
+            f"\n  - **Description**: {en_descriptions[i]}"
+            for i in rows
+        ])
         return formatted_term_dict
 
 
@@ -224,25 +698,22 @@ Es tut mir leid, ich hatte gestern Nachtschicht und habe die Angelegenheiten an
 
     text_list = transcripts.split("\n")
 
+    from realtime_translate_system.config import Config
+
     llm_service = LLMService("gemini-1.5-flash-002")
-    service = TranslationService(llm_service)
+    glossary_registry = GlossaryRegistry(Config.FILE_PATHS)
+    term_matcher = TermMatcher(glossary_registry, Config.TERM_MATCHER_THRESHOLD)
+    service = TranslationService(
+        llm_service, glossary_registry, term_matcher, term_injection="relevant"
+    )
     total_time = 0
 
-    import pathlib
-
-    term_dict_path = pathlib.Path(__file__).parent.parent / "glossaries"
-    term_dict = service.load_term_dict(str(term_dict_path))
-
-    import json
-
     previous_translation = None
     for text in text_list:
         if not text.strip():
             continue
         start_time = time.time()
-        result = service.translate(
-            text.strip(), previous_translation, term_dict=term_dict
-        )
+        result = service.translate(text.strip(), previous_translation)
         print(json.dumps(result, indent=2, ensure_ascii=False))
         total_time += time.time() - start_time
 
@@ -1,3 +1,4 @@
+from flask import request
 from flask_socketio import SocketIO, Namespace
 import threading
 import queue
@@ -6,9 +7,21 @@ from realtime_translate_system.services import (
     SpeechRecognizer,
     TranscriptService,
     MeetingProcessor,
+    llm_session,
 )
 
 
+class AudioSession:
+    """單一連線的語音串流：音訊佇列、辨識工作、跨段術語比對與累積的逐字稿"""
+
+    def __init__(self):
+        self.audio_queue = queue.Queue()
+        self.audio_task = None
+        self.term_stream = None
+        self.transcript_text = ""
+        self.closed = False
+
+
 class AudioNamespace(Namespace):
     def __init__(
         self,
@@ -23,46 +36,76 @@ class AudioNamespace(Namespace):
         self.recognizer = recognizer
         self.transcript_service = transcript_service
         self.meeting_processor = meeting_processor
-        self.audio_task = None
-        self.audio_queue = queue.Queue()
+        self.sessions = {}  # request.sid -> AudioSession
         self.thread_lock = threading.Lock()
 
-        self.transcript_text = ""
+    def on_disconnect(self):
+        with self.thread_lock:
+            session = self.sessions.pop(request.sid, None)
+        if session is not None:
+            # 結束這個連線的辨識工作，剩下的語句不再翻譯
+            session.closed = True
+            session.audio_queue.put(b"")
+        # 釋放這個連線的翻譯上下文
+        self.transcript_service.close_session(request.sid)
 
     def on_audio_stream(self, data):
         """
-        處理 WebSocket 傳入的音頻流
+        處理 WebSocket 傳入的音頻流，每個連線各自辨識，結果只送回該連線
         """
         try:
+            session_id = request.sid
+            with self.thread_lock:
+                session = self.sessions.get(session_id)
+                if session is None:
+                    session = self.sessions[session_id] = AudioSession()
+
+            def partial_callback(text: str):
+                # 說話中的辨識結果，只顯示為即時字幕，不翻譯
+                self.emit("asr_stream", {"status": "partial", "text": text}, room=session_id)
 
             def callback(text: str):
-                data = self.transcript_service.process(text)
-                if data is not None:
-                    self.transcript_text += data["text"][Language.TW]["value"]
-                    self.emit("transcript_stream", data)
+                # 確定的辨識結果先顯示為字幕，再翻譯：
+                # 各語言翻譯完成就先送出 partial，最後再送出完整的結果
+                if session.closed:
+                    return
+                self.emit("asr_stream", {"status": "final", "text": text}, room=session_id)
+                with llm_session(session_id):
+                    for data in self.transcript_service.process_stream(
+                        text, session.term_stream, session_id
+                    ):
+                        if data["status"] == "continue":
+                            session.transcript_text += data["text"][Language.TW]["value"]
+                        self.emit("transcript_stream", data, room=session_id)
 
             def done():
                 # generator title and keywords
-                self.audio_task = None
+                with self.thread_lock:
+                    session.audio_task = None
+                if session.closed:
+                    return
                 title, keywords = self.meeting_processor.gen_title_keywords(
-                    self.transcript_text
+                    session.transcript_text
                 )
                 data = {"status": "complete", "title": title, "keywords": keywords}
-                self.emit("transcript_stream", data)
+                self.emit("transcript_stream", data, room=session_id)
 
             with self.thread_lock:
-                if self.audio_task is None:
-                    while not self.audio_queue.empty():
-                        self.audio_queue.get_nowait()
+                if session.audio_task is None:
+                    while not session.audio_queue.empty():
+                        session.audio_queue.get_nowait()
 
-                    self.audio_task = self.socketio.start_background_task(
+                    # 每次新的串流重新開始跨段術語比對
+                    session.term_stream = self.transcript_service.open_stream()
+                    session.audio_task = self.socketio.start_background_task(
                         self.recognizer.transcribe_streaming,
-                        self.audio_queue,
+                        session.audio_queue,
                         callback,
                         done,
+                        partial_callback,
                     )
 
-            self.audio_queue.put(data)
+            session.audio_queue.put(data)
         except Exception as e:
             print(f"❌ Error processing audio stream: {e}")
 
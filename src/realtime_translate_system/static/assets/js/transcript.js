@@ -42,13 +42,60 @@ audioSocket.on("transcript", (data) => {
   }
 });
 
+const LANGUAGE_KEYS = {
+  "Traditional Chinese": "chinese",
+  "English": "english",
+  "German": "german",
+  "Japanese": "japanese"
+};
+
+// 這一句已經先以 partial 顯示的語言，完整結果到達時不再重複插入
+let streamedLanguage = null;
+
 /**
- * 串流更新資料：同上
+ * 串流更新資料：
+ * 每個語言翻譯完成時先收到 { status: "partial", language: "English", text: { English: {…} } }，
+ * 目前顯示的語言可以立即插入；最後收到與上面相同格式的 { status: "continue", … }
  */
 audioSocket.on("transcript_stream", (data) => {
+  if (data.status === "partial") {
+    const lang = LANGUAGE_KEYS[data.language];
+    if (lang === currentLanguage && streamedLanguage === null) {
+      const text = data.text[data.language];
+      insertTranscript(text["value"] + "\n", text["explains"]);
+      streamedLanguage = lang;
+    }
+    return;
+  }
+  if (data.status !== "continue") {
+    return;
+  }
+
   data = transformFormat(data);
+  setLiveCaption("", false);
   for (let lang in data.text) {
     transcriptState[lang] += data.text[lang] + "\n";
   }
-  insertTranscript(data.text[currentLanguage] + "\n", data.explains[currentLanguage]);
+  if (streamedLanguage !== currentLanguage) {
+    insertTranscript(data.text[currentLanguage] + "\n", data.explains[currentLanguage]);
+  }
+  streamedLanguage = null;
+});
+
+function setLiveCaption(text, final) {
+  const caption = document.getElementById("live-caption");
+  if (!caption) {
+    return;
+  }
+  caption.textContent = text;
+  caption.classList.toggle("final", final);
+}
+
+/**
+ * 語音辨識的即時字幕：
+ * 說話中持續收到 { status: "partial", text: "…" }（之後還可能改變），
+ * 一句話確定時收到 { status: "final", text: "…" }，翻譯結果（transcript_stream）到達後清除
+ */
+audioSocket.on("asr_stream", (data) => {
+  setLiveCaption(data.text, data.status === "final");
 });
@@ -0,0 +1,39 @@
+"""讓測試以 `python -m pytest tests` 執行時可以匯入 src/ 下的 realtime_translate_system"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from realtime_translate_system.config import Config  # noqa: E402
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def glossary_registry():
+    """專案內附的四語術語表（直接讀取 CSV，不使用預先編譯的快取）"""
+    return GlossaryRegistry(Config.FILE_PATHS)
+
+
+@pytest.fixture
+def glossary_files(tmp_path):
+    """術語表 CSV 的複本，測試可以修改後重新載入：{ 語言: 路徑 }"""
+    file_paths = {}
+    for lang, path in Config.FILE_PATHS.items():
+        file_paths[lang] = tmp_path / Path(path).name
+        shutil.copy(path, file_paths[lang])
+    return file_paths
+
+
+@pytest.fixture
+def add_glossary_row():
+    """在術語表 CSV 最後加入一列：add_glossary_row(路徑, 術語, 說明)"""
+
+    def add(path, term, description):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f'Test,{term},"{description}"\n')
+
+    return add
@@ -0,0 +1,199 @@
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+from flask_socketio import SocketIO
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.speech.batch_scheduler import (
+    BatchResult,
+    WhisperBatchScheduler,
+)
+from realtime_translate_system.sockets.audio_socket import AudioNamespace
+
+NAMESPACE = "/audio_stream"
+
+
+class EchoRecognizer:
+    """把每段音訊當成一句辨識結果，收到空的音訊時結束"""
+
+    def transcribe_streaming(self, audio_queue, callback, done, partial_callback=None):
+        while True:
+            chunk = audio_queue.get()
+            if not chunk:
+                break
+            callback(chunk.decode())
+        done()
+
+
+class BatchedRecognizer:
+    """每段音訊是一句語句，與 WhisperSpeechRecognizer 一樣交給共用的 WhisperBatchScheduler 辨識"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    def transcribe_streaming(self, audio_queue, callback, done, partial_callback=None):
+        while True:
+            chunk = audio_queue.get()
+            if not chunk:
+                break
+            callback(self.scheduler.transcribe(np.frombuffer(chunk, dtype=np.int16)).text)
+        done()
+
+
+class RecordingScheduler(WhisperBatchScheduler):
+    """以語句的樣本值代替 Whisper 解碼（1 → "早安"、2 → "hello"），記錄每一批的內容"""
+
+    TEXTS = {1: "早安", 2: "hello"}
+
+    def __init__(self, **kwargs):
+        super().__init__(model=None, **kwargs)
+        self.batches = []
+
+    def _decode(self, audios, word_timestamps):
+        texts = [self.TEXTS[int(audio[0])] for audio in audios]
+        self.batches.append(texts)
+        return [BatchResult(text, []) for text in texts]
+
+
+def utterance(value):
+    return np.full(1600, value, dtype=np.int16).tobytes()
+
+
+class FakeTranscriptService:
+    def __init__(self):
+        self.closed_sessions = []
+
+    def open_stream(self):
+        return object()
+
+    def close_session(self, session_id):
+        self.closed_sessions.append(session_id)
+
+    def process_stream(self, text, stream=None, session_id=None):
+        yield {"status": "continue", "text": {Language.TW: {"value": text}}}
+
+
+class FakeMeetingProcessor:
+    def gen_title_keywords(self, transcript):
+        return transcript, []
+
+
+@pytest.fixture
+def app():
+    return Flask(__name__)
+
+
+@pytest.fixture
+def socketio(app):
+    return SocketIO(app, async_mode="threading")
+
+
+@pytest.fixture
+def transcript_service():
+    return FakeTranscriptService()
+
+
+@pytest.fixture
+def namespace(socketio, transcript_service):
+    namespace = AudioNamespace(
+        NAMESPACE, socketio, EchoRecognizer(), transcript_service, FakeMeetingProcessor()
+    )
+    socketio.on_namespace(namespace)
+    return namespace
+
+
+def receive_until_complete(client, timeout=5.0):
+    """收集 client 收到的事件，直到收到 complete"""
+    received = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        received += client.get_received(NAMESPACE)
+        if any(event["args"][0].get("status") == "complete" for event in received):
+            return received
+        time.sleep(0.01)
+    raise AssertionError(f"沒有收到 complete：{received}")
+
+
+def wait_for_session(namespace, text, timeout=5.0):
+    """等到逐字稿中有 text 的連線出現，返回 (sid, AudioSession)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        for sid, session in list(namespace.sessions.items()):
+            if text in session.transcript_text:
+                return sid, session
+        time.sleep(0.01)
+    raise AssertionError(f"沒有連線的逐字稿包含 {text}")
+
+
+def transcripts(received):
+    return [
+        event["args"][0]["text"][Language.TW]["value"]
+        for event in received
+        if event["name"] == "transcript_stream" and event["args"][0]["status"] == "continue"
+    ]
+
+
+def test_two_clients_only_receive_their_own_transcripts(app, socketio, namespace):
+    alice = socketio.test_client(app, namespace=NAMESPACE)
+    bob = socketio.test_client(app, namespace=NAMESPACE)
+
+    alice.emit("audio_stream", "早安".encode(), namespace=NAMESPACE)
+    bob.emit("audio_stream", b"hello", namespace=NAMESPACE)
+    alice.emit("audio_stream", "各位".encode(), namespace=NAMESPACE)
+    bob.emit("audio_stream", b" world", namespace=NAMESPACE)
+    alice.emit("audio_stream", b"", namespace=NAMESPACE)
+    bob.emit("audio_stream", b"", namespace=NAMESPACE)
+
+    alice_received = receive_until_complete(alice)
+    bob_received = receive_until_complete(bob)
+
+    assert transcripts(alice_received) == ["早安", "各位"]
+    assert transcripts(bob_received) == ["hello", " world"]
+    assert alice_received[-1]["args"][0]["title"] == "早安各位"
+    assert bob_received[-1]["args"][0]["title"] == "hello world"
+    assert len(namespace.sessions) == 2
+
+
+def test_disconnect_tears_down_the_session(app, socketio, namespace, transcript_service):
+    alice = socketio.test_client(app, namespace=NAMESPACE)
+    bob = socketio.test_client(app, namespace=NAMESPACE)
+    alice.emit("audio_stream", "早安".encode(), namespace=NAMESPACE)
+    bob.emit("audio_stream", b"hello", namespace=NAMESPACE)
+
+    alice_sid, alice_session = wait_for_session(namespace, "早安")
+    task = alice_session.audio_task
+
+    alice.disconnect(namespace=NAMESPACE)
+    task.join(timeout=5.0)
+
+    assert not task.is_alive()
+    assert alice_sid not in namespace.sessions
+    assert alice_sid in transcript_service.closed_sessions
+    assert len(namespace.sessions) == 1
+
+
+def test_two_live_sessions_share_one_whisper_batch(app, socketio, transcript_service):
+    # 第一句最多等 5 秒，兩個連線的語句都到了（湊滿 2 句）就一起解碼
+    scheduler = RecordingScheduler(max_batch_size=2, max_wait_ms=5000)
+    socketio.on_namespace(
+        AudioNamespace(
+            NAMESPACE, socketio, BatchedRecognizer(scheduler), transcript_service, FakeMeetingProcessor()
+        )
+    )
+    alice = socketio.test_client(app, namespace=NAMESPACE)
+    bob = socketio.test_client(app, namespace=NAMESPACE)
+
+    alice.emit("audio_stream", utterance(1), namespace=NAMESPACE)
+    bob.emit("audio_stream", utterance(2), namespace=NAMESPACE)
+    alice.emit("audio_stream", b"", namespace=NAMESPACE)
+    bob.emit("audio_stream", b"", namespace=NAMESPACE)
+
+    alice_received = receive_until_complete(alice)
+    bob_received = receive_until_complete(bob)
+
+    assert [sorted(batch) for batch in scheduler.batches] == [["hello", "早安"]]
+    assert scheduler.stats()["batch_size_max"] == 2
+    assert transcripts(alice_received) == ["早安"]
+    assert transcripts(bob_received) == ["hello"]
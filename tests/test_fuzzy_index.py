@@ -0,0 +1,60 @@
+import random
+
+import pytest
+from fuzzywuzzy import fuzz
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.fuzzy_index import FuzzyTermIndex
+
+
+def brute_force(terms, token, threshold):
+    """改用索引之前的做法：與每個術語計算 `fuzz.ratio`"""
+    return [term for term in terms if fuzz.ratio(token, term) >= threshold]
+
+
+def typos(terms, count, seed=0):
+    """從術語產生辨識錯誤的樣本：刪除、替換、插入字元，或截斷"""
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(count):
+        term = rng.choice(terms)
+        position = rng.randrange(len(term))
+        samples += [
+            term[:position] + term[position + 1 :],
+            term[:position] + rng.choice("aeiou的了") + term[position + 1 :],
+            term[:position] + rng.choice("xz 上") + term[position:],
+            term[: max(1, len(term) // 2)],
+        ]
+    return samples
+
+
+@pytest.mark.parametrize("lang", [Language.EN, Language.TW, Language.JP])
+@pytest.mark.parametrize("threshold", [60, 80, 100])
+def test_candidates_cover_every_term_above_threshold(glossary_registry, lang, threshold):
+    terms = list(glossary_registry.snapshot.term_dict(lang))
+    index = FuzzyTermIndex(terms, threshold)
+
+    for token in typos(terms, 50) + ["the", "it", "data", "今天", "DP上"]:
+        candidates = index.candidates(token)
+        expected = brute_force(terms, token, threshold)
+        # 候選可以多（之後還會以 fuzz.ratio 驗證），但不能漏掉任何一個達到閥值的術語
+        assert set(expected) <= set(candidates), token
+        # 候選維持術語表中的順序，同分時才會選到與逐一比對相同的術語
+        assert candidates == sorted(candidates, key=terms.index)
+
+
+def test_best_match_is_unchanged(glossary_registry):
+    terms = list(glossary_registry.snapshot.term_dict(Language.EN))
+    index = FuzzyTermIndex(terms, 60)
+
+    def best(candidates, token):
+        scored = [(fuzz.ratio(token, term), -i, term) for i, term in enumerate(candidates)]
+        scored = [item for item in scored if item[0] >= 60]
+        return max(scored)[2] if scored else None
+
+    for token in typos(terms, 100, seed=1):
+        assert best(index.candidates(token), token) == best(terms, token)
+
+
+def test_empty_token_has_no_candidates():
+    assert FuzzyTermIndex(["DDR Ratio"], 60).candidates("") == []
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry
+
+
+def test_reload_swaps_in_a_new_snapshot_and_keeps_the_old_one(glossary_files, add_glossary_row):
+    registry = GlossaryRegistry(glossary_files)
+    old = registry.snapshot
+    old_terms = old.terms(Language.EN)
+
+    add_glossary_row(glossary_files[Language.EN], "Stepper", "Lithography exposure tool.")
+    new = registry.reload()
+
+    assert registry.snapshot is new
+    assert (old.version, new.version) == (1, 2)
+    assert "Stepper" in new.term_dict(Language.EN)
+    # 還拿著舊版本的讀取端看到的內容完全不變
+    assert old.terms(Language.EN) == old_terms
+    assert "Stepper" not in old.term_dict(Language.EN)
+
+
+def test_snapshot_is_read_only(glossary_registry):
+    term_dict = glossary_registry.snapshot.term_dict(Language.EN)
+    with pytest.raises(TypeError):
+        term_dict["Stepper"] = "Lithography exposure tool."
+
+
+def test_subscribers_receive_the_new_snapshot(glossary_files, add_glossary_row):
+    registry = GlossaryRegistry(glossary_files)
+    received = []
+    registry.subscribe(lambda snapshot: received.append((snapshot, registry.snapshot)))
+
+    assert registry.reload_if_changed() is False
+    add_glossary_row(glossary_files[Language.TW], "曝光機", "微影製程的曝光設備。")
+    # 部分檔案系統的 mtime 精度較粗，直接呼叫 reload
+    registry.reload()
+
+    (snapshot, current), = received
+    assert snapshot is current
+    assert snapshot.version == 2
+    assert "曝光機" in snapshot.term_dict(Language.TW)
+
+
+def test_readers_never_see_a_half_built_snapshot(glossary_files):
+    registry = GlossaryRegistry(glossary_files)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        last_version = 0
+        while not stop.is_set():
+            snapshot = registry.snapshot
+            try:
+                assert snapshot.version >= last_version
+                for lang in snapshot.languages:
+                    terms = snapshot.terms(lang)
+                    assert len(terms) == len(snapshot) == len(snapshot.descriptions(lang))
+                    assert set(snapshot.term_dict(lang)) == {term for term in terms if term}
+            except AssertionError as e:
+                errors.append(e)
+                return
+            last_version = snapshot.version
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    try:
+        for _ in range(20):
+            registry.reload()
+    finally:
+        stop.set()
+        for reader in readers:
+            reader.join()
+
+    assert errors == []
+    assert registry.version == 21
@@ -0,0 +1,65 @@
+import pytest
+
+from realtime_translate_system.services.json_repair import repair_json
+
+GERMAN = "Er sagte „bis morgen“, und ging."
+TRANSLATION = {
+    "Traditional Chinese": "他說「明天見」，然後就走了。",
+    "English": "He said \"see you tomorrow\", and left.",
+    "German": GERMAN,
+    "Japanese": "彼は「また明日」と言って帰った。",
+}
+
+
+def test_smart_quotes_inside_strings_are_kept_with_unquoted_keys():
+    response = (
+        '{Traditional Chinese: "他說「明天見」，然後就走了。", '
+        'English: "He said \\"see you tomorrow\\", and left.", '
+        f'German: "{GERMAN}", '
+        'Japanese: "彼は「また明日」と言って帰った。"}'
+    )
+    parsed, repairs = repair_json(response)
+
+    assert parsed == TRANSLATION
+    assert repairs == ["unquoted_keys"]
+
+
+def test_smart_quotes_inside_strings_are_kept_with_trailing_commas():
+    parsed, repairs = repair_json(f'{{"German": "{GERMAN}", "Japanese": "はい",}}')
+
+    assert parsed == {"German": GERMAN, "Japanese": "はい"}
+    assert repairs == ["trailing_commas"]
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        '{“German”: “Okay, danke.”, “Japanese”: “はい”}',
+        '{"German”: “Okay, danke.”,\n "Japanese”: “はい”}',
+    ],
+)
+def test_smart_quotes_used_as_json_quotes_are_replaced(response):
+    parsed, repairs = repair_json(response)
+
+    assert parsed == {"German": "Okay, danke.", "Japanese": "はい"}
+    assert repairs == ["smart_quotes"]
+
+
+def test_transforms_are_combined_only_when_needed():
+    parsed, repairs = repair_json('{“German”: “Okay, danke.”, Japanese: "はい",}')
+
+    assert parsed == {"German": "Okay, danke.", "Japanese": "はい"}
+    assert repairs == ["smart_quotes", "unquoted_keys", "trailing_commas"]
+
+
+def test_closed_json_is_never_repaired_by_dropping_fields():
+    # 括號都已關閉但缺少逗號：捨棄後面的欄位就能解析，但不能當作修復成功
+    with pytest.raises(ValueError):
+        repair_json(f'{{"English": "ok", "German": "{GERMAN}" "Japanese": "はい"}}')
+
+
+def test_truncated_output_keeps_only_complete_fields():
+    parsed, repairs = repair_json('```json\n{"English": "ok", "German": "Er sagte „bis')
+
+    assert parsed == {"English": "ok"}
+    assert repairs == ["fence", "truncated"]
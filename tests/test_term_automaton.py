@@ -0,0 +1,32 @@
+from realtime_translate_system.services.term_automaton import TermAutomaton
+
+
+def test_english_terms_only_match_at_word_boundaries():
+    automaton = TermAutomaton(["EC", "Cloud SQL"])
+
+    assert automaton.find("Check the SPEC and ECN before EC") == [(30, 32, "EC")]
+    assert automaton.find("Move it to Cloud SQL.") == [(11, 20, "Cloud SQL")]
+    assert automaton.find("Cloud SQLite") == []
+
+
+def test_cjk_terms_match_inside_text():
+    automaton = TermAutomaton(["良率", "晶圓", "DDR Ratio"])
+
+    assert automaton.find("這批晶圓的良率偏低，DDR Ratio也偏高") == [
+        (2, 4, "晶圓"),
+        (5, 7, "良率"),
+        (10, 19, "DDR Ratio"),
+    ]
+
+
+def test_prefers_leftmost_longest_match():
+    automaton = TermAutomaton(["Cloud", "Cloud Run", "Run"])
+
+    assert automaton.find("Cloud Run") == [(0, 9, "Cloud Run")]
+
+
+def test_terms_are_stripped_and_empty_terms_dropped():
+    automaton = TermAutomaton(["DP ", " ", "", None, "DP"])
+
+    assert automaton.terms == ["DP"]
+    assert automaton.find("DP is ready") == [(0, 2, "DP")]
@@ -0,0 +1,174 @@
+import pytest
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry
+from realtime_translate_system.services.term_matcher import TermMatcher
+
+
+def test_match_cache_is_invalidated_when_the_glossary_changes(glossary_files, add_glossary_row):
+    matcher = TermMatcher(GlossaryRegistry(glossary_files), threshold=80)
+
+    assert matcher.find_terms("the Steper is down", Language.EN) == []
+    assert matcher.find_terms("the Steper is down", Language.EN) == []
+    assert matcher.match_cache_info()[Language.EN]["hits"] > 0
+
+    add_glossary_row(glossary_files[Language.EN], "Stepper", "Lithography exposure tool.")
+    matcher.reload_glossaries()
+
+    # 舊版本快取的「沒有命中」不能沿用到新版本
+    assert matcher.find_terms("the Steper is down", Language.EN) == ["Stepper"]
+    assert matcher.glossary_version == 2
+    assert matcher.match_cache_info()[Language.EN]["hits"] == 0
+
+
+def test_removed_terms_are_no_longer_matched(glossary_files):
+    matcher = TermMatcher(GlossaryRegistry(glossary_files), threshold=80)
+    assert matcher.find_terms("check the DDR Ratio", Language.EN) == ["DDR Ratio"]
+
+    path = glossary_files[Language.EN]
+    lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+    path.write_text("".join(line for line in lines if "DDR Ratio" not in line), encoding="utf-8")
+    matcher.reload_glossaries()
+
+    assert "DDR Ratio" not in matcher.find_terms("check the DDR Ratio", Language.EN)
+
+
+@pytest.fixture(scope="module")
+def loose_matcher(glossary_registry):
+    """與原本 TermMatcher 預設相同的閥值 60"""
+    return TermMatcher(glossary_registry, threshold=60)
+
+
+# 原本的 match / merge / rematch 對這些句子的註釋，單詞的比對結果必須維持不變
+@pytest.mark.parametrize(
+    "lang, text, annotated",
+    [
+        (Language.EN, "it can print out the data", "it can print out the data"),
+        (
+            Language.EN,
+            "It was found that the ratio on DP is quite high this week.",
+            "It was found that the ratio on ==DP== is ==quite== high this week.",
+        ),
+        (
+            Language.TW,
+            "很抱歉我昨天值大夜班，有把事情交接給LISA了，可以請他說明原因。",
+            "很抱歉我昨天值==大夜班==，有把事情交接給LISA了，可以請他說明原因。",
+        ),
+        (
+            Language.TW,
+            "請告知馬丁注意 ALP 的問題，並依序執行。",
+            "請告知馬丁注意 ==ALP== 的問題，並依序執行。",
+        ),
+        (
+            Language.JP,
+            "EC が変更された可能性があります。",
+            "==EC== が変更された可能性があります。",
+        ),
+    ],
+)
+def test_single_token_matches_follow_the_baseline(loose_matcher, lang, text, annotated):
+    assert loose_matcher.process_text(text, lang)[2] == annotated
+
+
+@pytest.mark.parametrize(
+    "lang, text, annotated",
+    [
+        (
+            Language.EN,
+            "We moved the DB to Cloud SQL yesterday and the DDR Ratio is high",
+            "We moved the DB to ==Cloud SQL== yesterday and the ==DDR Ratio== is high",
+        ),
+        (Language.EN, "the alignment mark is off", "the ==alignment mark== is off"),
+        (
+            Language.TW,
+            "關於這周DDR ratio過高的原因可能是EC被動過的原因",
+            "關於這周==DDR ratio==過高的原因可能是==EC==被動過的原因",
+        ),
+    ],
+)
+def test_multi_word_terms_are_matched_as_a_whole(loose_matcher, lang, text, annotated):
+    assert loose_matcher.process_text(text, lang)[2] == annotated
+
+
+def test_scores_are_recorded_only_for_accepted_matches(loose_matcher):
+    _, scores, _ = loose_matcher.process_text("it can print out the data", Language.EN)
+    assert scores == {}
+
+    _, scores, annotated = loose_matcher.process_text("資料會放在DP上", Language.TW)
+    assert annotated == "資料會放在==DP==上"
+    assert "DP上" not in scores
+    assert set(scores) == {"DP"}
+
+
+def _without_timing(output_dict):
+    return {
+        lang: {key: value for key, value in result.items() if key != "elapsed_ms"}
+        for lang, result in output_dict.items()
+    }
+
+
+def test_thread_executor_matches_sequential_processing(glossary_registry):
+    text_dicts = [
+        {
+            Language.EN: "We moved the DB to Cloud SQL and the DDR Ratio is high on DP.",
+            Language.DE: "Ich hatte gestern Nachtschicht und die EC wurde geändert.",
+            Language.TW: "很抱歉我昨天值大夜班，DDR ratio過高可能是EC被動過。",
+            Language.JP: "今週の DDR Ratio が高すぎる原因は、EC が変更された可能性があります。",
+        },
+        {Language.EN: "it can print out the data", Language.TW: "資料會放在DP上"},
+    ]
+    sequential = TermMatcher(glossary_registry, threshold=60)
+    threaded = TermMatcher(glossary_registry, threshold=60, executor="thread", max_workers=4)
+    try:
+        for text_dict in text_dicts:
+            expected = sequential.process_multilingual_text(text_dict)
+            actual = threaded.process_multilingual_text(text_dict)
+            assert list(actual) == list(text_dict)
+            assert _without_timing(actual) == _without_timing(expected)
+    finally:
+        threaded.close()
+
+
+@pytest.fixture
+def stream(glossary_registry):
+    return TermMatcher(glossary_registry, threshold=80).stream()
+
+
+def test_stream_matches_a_term_split_across_chunks(stream, glossary_registry):
+    description = glossary_registry.snapshot.term_dict(Language.EN)["Cloud SQL"]
+
+    explains, _, annotated = stream.process_text("We moved the DB to Cloud", Language.EN)
+    assert (explains, annotated) == ([], "We moved the DB to Cloud")
+
+    explains, scores, annotated = stream.process_text("SQL yesterday", Language.EN)
+    assert explains == [description]
+    assert scores == {"Cloud SQL": 100}
+    # 只註釋新的一段，落在上一段的 "Cloud" 不會再出現
+    assert annotated == "==SQL== yesterday"
+
+
+def test_stream_joins_cjk_chunks_without_a_space(stream):
+    stream.process_text("使用者可以查找Cloud", Language.TW)
+    _, _, annotated = stream.process_text("SQL中的資料。", Language.TW)
+    assert annotated == "==SQL==中的資料。"
+
+
+def test_stream_does_not_report_terms_from_the_carry_again(stream):
+    explains, _, _ = stream.process_text("the DDR Ratio is", Language.EN)
+    assert len(explains) == 1
+
+    explains, _, annotated = stream.process_text("high this week", Language.EN)
+    assert (explains, annotated) == ([], "high this week")
+
+
+def test_stream_keeps_a_carry_per_language_and_reset_clears_it(stream):
+    stream.process_multilingual_text({Language.EN: "moved to Cloud", Language.TW: "部署在Cloud"})
+    assert set(stream.carries) == {Language.EN, Language.TW}
+
+    output = stream.process_multilingual_text({Language.EN: "SQL today", Language.TW: "Run上"})
+    assert output[Language.EN]["value"] == "==SQL== today"
+    assert output[Language.TW]["value"] == "==Run==上"
+
+    stream.reset()
+    _, _, annotated = stream.process_text("SQL today", Language.EN)
+    assert annotated == "SQL today"
@@ -0,0 +1,78 @@
+import threading
+
+import pytest
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.glossary_registry import GlossaryRegistry
+from realtime_translate_system.services.term_matcher import TermMatcher
+
+
+@pytest.fixture
+def glossary_registry(glossary_files):
+    """預熱時會訂閱術語表更新，各測試使用自己的術語表以免影響其他測試"""
+    return GlossaryRegistry(glossary_files)
+
+
+class CountingTermMatcher(TermMatcher):
+    """記錄比對索引被建立幾次，並可讓預熱停在建立索引之前"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.builds = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def _build_indexes(self, snapshot):
+        self.release.wait()
+        self.builds += 1
+        super()._build_indexes(snapshot)
+
+
+def test_nothing_is_loaded_until_warm_up(glossary_registry):
+    matcher = CountingTermMatcher(glossary_registry, threshold=80)
+    assert matcher.ready is False
+    assert matcher.builds == 0
+
+    assert matcher.wait_until_ready(timeout=30) >= 0
+    assert matcher.ready is True
+    assert matcher.builds == 1
+
+
+def test_early_requests_wait_for_the_same_warm_up(glossary_registry):
+    matcher = CountingTermMatcher(glossary_registry, threshold=80)
+    matcher.release.clear()
+    future = matcher.warm_up()
+
+    results = []
+    requests = [
+        threading.Thread(
+            target=lambda: results.append(matcher.find_terms("the DDR Ratio is high", Language.EN))
+        )
+        for _ in range(4)
+    ]
+    for request in requests:
+        request.start()
+    assert matcher.ready is False
+
+    matcher.release.set()
+    for request in requests:
+        request.join(timeout=30)
+
+    assert future.done()
+    assert matcher.warm_up() is future
+    assert matcher.builds == 1
+    assert results == [["DDR Ratio"]] * 4
+
+
+def test_failed_warm_up_is_reported_to_waiters(glossary_registry):
+    matcher = TermMatcher(glossary_registry, threshold=80)
+
+    def fail(snapshot):
+        raise RuntimeError("MeCab 詞典不存在")
+
+    matcher._build_indexes = fail
+    with pytest.raises(RuntimeError, match="MeCab"):
+        matcher.wait_until_ready(timeout=30)
+    assert matcher.ready is False
+    with pytest.raises(RuntimeError):
+        matcher.find_terms("the DDR Ratio is high", Language.EN)
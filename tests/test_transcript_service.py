@@ -0,0 +1,42 @@
+from concurrent.futures import Future
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.term_matcher import TermMatcher
+from realtime_translate_system.services.transcript_service import TranscriptService
+
+
+class ManualBatcher:
+    """保留送出的 Future，由測試決定完成的順序"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, content, previous_translation=None):
+        future = Future()
+        self.futures.append((content, future))
+        return future
+
+
+def translation(content):
+    return {"previous_sentence": content, Language.EN: content}
+
+
+def test_segments_are_submitted_before_earlier_ones_complete(glossary_registry):
+    batcher = ManualBatcher()
+    service = TranscriptService(
+        None, TermMatcher(glossary_registry, threshold=80), translation_batcher=batcher
+    )
+
+    futures = [service.submit(text) for text in ("the DDR Ratio is high", " ", "see you")]
+    assert futures[1] is None
+    assert [content for content, _ in batcher.futures] == ["the DDR Ratio is high", "see you"]
+
+    # 後送出的段落先完成，仍依送出順序取得結果
+    for content, future in reversed(batcher.futures):
+        future.set_result(translation(content))
+    data = [service.complete(future) for future in futures if future is not None]
+
+    assert [item["text"][Language.EN]["value"] for item in data] == [
+        "the ==DDR Ratio== is high",
+        "see you",
+    ]
@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from realtime_translate_system.services.llm_client import _session, llm_session
+from realtime_translate_system.services.translation_batcher import TranslationBatcher
+
+
+class RecordingTranslationService:
+    """記錄每次呼叫的句子與當時的 llm_session，翻譯結果為原句加上語言標記"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _result(self, content):
+        return {"previous_sentence": content, "English": f"en:{content}"}
+
+    def translate(self, content, previous_translation=None):
+        with self.lock:
+            self.calls.append(("single", [content], _session.get()))
+        return self._result(content)
+
+    def translate_batch(self, contents, previous_translations=None):
+        with self.lock:
+            self.calls.append(("batch", list(contents), _session.get()))
+        return [self._result(content) for content in contents]
+
+
+@pytest.fixture
+def service():
+    return RecordingTranslationService()
+
+
+@pytest.fixture
+def batcher(service):
+    return TranslationBatcher(service, window=0.2, max_batch_size=8)
+
+
+def test_sentences_from_one_caller_share_a_batch_and_its_context(batcher, service):
+    with llm_session("sid-1"):
+        futures = [batcher.submit(text) for text in ("早安", "hello", "danke")]
+
+    results = [future.result(timeout=5) for future in futures]
+    assert [result["English"] for result in results] == ["en:早安", "en:hello", "en:danke"]
+    assert service.calls == [("batch", ["早安", "hello", "danke"], "sid-1")]
+
+
+def test_batches_run_in_the_submitting_sessions_context(batcher, service):
+    futures = []
+    for session_id, text in (("sid-1", "早安"), ("sid-2", "hello"), ("sid-1", "danke")):
+        with llm_session(session_id):
+            futures.append(batcher.submit(text))
+    for future in futures:
+        future.result(timeout=5)
+
+    assert sorted(service.calls) == [
+        ("batch", ["hello"], "sid-2"),
+        ("batch", ["早安", "danke"], "sid-1"),
+    ]
+
+
+def test_single_sentence_bypasses_the_batch_window(batcher, service):
+    batcher.window = 60  # 若走批次會等到逾時
+
+    with llm_session("sid-1"):
+        result = batcher.translate("早安")
+
+    assert result["English"] == "en:早安"
+    assert service.calls == [("single", ["早安"], "sid-1")]
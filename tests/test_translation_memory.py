@@ -0,0 +1,101 @@
+import pytest
+
+from realtime_translate_system.config import Language
+from realtime_translate_system.services.translation_memory import TranslationMemory
+from realtime_translate_system.services.translation_service import TranslationService
+
+
+def translations(tw, en, de, ja):
+    return {Language.TW: tw, Language.EN: en, Language.DE: de, Language.JP: ja}
+
+
+@pytest.fixture
+def memory():
+    memory = TranslationMemory()
+    memory.add(translations(
+        "我們可以在週五前完成晶圓的出貨。",
+        "We can finish shipping the wafers before Friday.",
+        "Wir können den Versand der Wafer vor Freitag abschließen.",
+        "金曜日までにウェハーの出荷を完了できます。",
+    ))
+    memory.add(translations(
+        "請 Martin 確認這批貨的良率。",
+        "Please ask Martin to check the yield of this lot.",
+        "Bitte Martin, die Ausbeute dieses Loses zu prüfen.",
+        "マーティンにこのロットの歩留まりを確認してもらってください。",
+    ))
+    return memory
+
+
+@pytest.fixture
+def service(memory):
+    return TranslationService(
+        None,
+        None,
+        translation_memory=memory,
+        memory_reuse_threshold=95,
+        memory_hint_threshold=75,
+    )
+
+
+def test_identical_sentence_is_reused(service):
+    reused, hint = service._recall("we can finish shipping the wafers before Friday")
+
+    assert hint is None
+    assert reused[Language.DE] == "Wir können den Versand der Wafer vor Freitag abschließen."
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "We can finish shipping the wafer before Friday.",  # 單複數
+        "我們可以在週五之前完成晶圓的出貨。",
+        "我們可以在週五前完成晶圓出貨。",
+        "我們可以在週五前完成晶圓的出貨喔。",  # 語助詞
+    ],
+)
+def test_near_duplicate_without_risky_words_is_reused(service, sentence):
+    reused, hint = service._recall(sentence)
+
+    assert hint is None
+    assert reused[Language.EN] == "We can finish shipping the wafers before Friday."
+
+
+@pytest.mark.parametrize(
+    "sentence",
+    [
+        "We cannot finish shipping the wafers before Friday.",  # 否定
+        "我們不可以在週五前完成晶圓的出貨。",
+        "Please ask Ivan to check the yield of this lot.",  # 換了人名
+        "請 Ivan 確認這批貨的良率。",
+        "We can finish shipping the wafers before Monday.",  # 換了日期
+        "我們可以在週三前完成晶圓的出貨。",
+        "We can't finish shipping the wafers before Friday.",
+        "金曜日までにウェハーの出荷を完了できません。",
+    ],
+)
+def test_similar_sentence_is_only_a_hint(service, sentence):
+    reused, hint = service._recall(sentence)
+
+    assert reused is None
+    assert hint is not None and not hint.safe
+    assert hint.similarity >= 75
+
+
+def test_dissimilar_sentence_is_only_a_hint_even_without_risky_words(service):
+    reused, hint = service._recall("We can finish shipping all these wafers before Friday.")
+
+    assert reused is None
+    assert hint.safe and hint.similarity < 95
+
+
+def test_negation_scores_above_reuse_threshold(memory):
+    """只差一個否定詞的句子相似度很高，不能只以相似度門檻決定是否直接沿用"""
+    match = memory.lookup("We cannot finish shipping the wafers before Friday.", 75)
+
+    assert match.similarity > 95
+    assert not match.identical and not match.safe
+
+
+def test_unrelated_sentence_is_not_found(service):
+    assert service._recall("今天的會議改到下午三點。") == (None, None)
@@ -0,0 +1,31 @@
+from realtime_translate_system.services.term_matcher import TermMatcher
+from realtime_translate_system.services.translation_service import TranslationService
+
+
+def test_term_prompt_sizes_are_reported_in_stats(glossary_registry, capsys):
+    service = TranslationService(
+        None,
+        glossary_registry,
+        term_matcher=TermMatcher(glossary_registry, threshold=80),
+        term_injection="relevant",
+    )
+    full_term_dict = service._get_full_term_dict(glossary_registry.snapshot)
+
+    with_terms = service.term_dict_for("the DDR Ratio on DP is high")
+    without_terms = service.term_dict_for("see you tomorrow")
+
+    # 每句都會呼叫，不能每句都印一行
+    assert "術語提示" not in capsys.readouterr().out
+    stats = service.stats()["term_prompts"]
+    assert stats["prompts"] == 2
+    assert stats["avg_chars"] == round((len(with_terms) + len(without_terms)) / 2, 1)
+    assert stats["char_reduction"] == round(
+        1 - (len(with_terms) + len(without_terms)) / (2 * len(full_term_dict)), 4
+    )
+    assert stats["avg_rows"] >= 1
+
+
+def test_full_term_injection_has_no_prompt_stats(glossary_registry):
+    service = TranslationService(None, glossary_registry)
+    service.term_dict_for("the DDR Ratio on DP is high")
+    assert "term_prompts" not in service.stats()